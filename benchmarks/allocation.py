@@ -0,0 +1,49 @@
+# coding=utf-8
+"""
+Allocation between many ratios (payroll splits, marketplace payouts).
+
+``legacy_allocate`` is the previous Decimal based Money.allocate, which
+divided per ratio and left the remainder on the last share.
+"""
+from __future__ import absolute_import, print_function, unicode_literals
+
+from decimal import Decimal
+
+from .utils import bench, compare, setup
+
+setup()
+
+from txmoney.money.models import Money, allocate_many  # noqa: E402 isort:skip
+
+RATIOS = [Decimal(i % 7 + 1) for i in range(10000)]
+
+
+def legacy_allocate(money, ratios):
+    total = sum(ratios)
+    remainder = money.amount
+    results = []
+    for i in range(0, len(ratios)):
+        results.append(Money._make(money.amount * ratios[i] / total, money.currency))
+        remainder -= results[i].amount
+    results[-1] = Money._make(results[-1].amount + remainder, money.currency)
+    return results
+
+
+def main():
+    money = Money('987654.32', 'EUR')
+    int_ratios = [int(ratio) for ratio in RATIOS]
+
+    baseline = bench('legacy allocate 10000 ratios', lambda: legacy_allocate(money, RATIOS), number=10)
+    candidate = bench('allocate 10000 Decimal ratios', lambda: money.allocate(RATIOS), number=10)
+    compare('speedup', baseline, candidate)
+    candidate = bench('allocate 10000 int ratios', lambda: money.allocate(int_ratios), number=10)
+    compare('speedup', baseline, candidate)
+
+    moneys = [Money(Decimal(i) / 3, 'EUR').round() for i in range(100)]
+    baseline = bench('allocate x100', lambda: [m.allocate(RATIOS[:100]) for m in moneys], number=10)
+    candidate = bench('allocate_many x100', lambda: allocate_many(moneys, RATIOS[:100]), number=10)
+    compare('speedup', baseline, candidate)
+
+
+if __name__ == '__main__':
+    main()
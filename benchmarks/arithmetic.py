@@ -0,0 +1,65 @@
+# coding=utf-8
+"""
+Arithmetic-heavy loops over Money.
+
+``ConstructorMoney`` reproduces the operators as they were before using
+``Money._make``: every result goes through the full public constructor.
+"""
+from __future__ import absolute_import, print_function, unicode_literals
+
+from decimal import ROUND_HALF_UP, Decimal
+
+from .utils import bench, compare, setup
+
+setup()
+
+from txmoney.money.models.money import Money  # noqa: E402 isort:skip
+
+
+class ConstructorMoney(Money):
+    __slots__ = ()
+
+    def __neg__(self):
+        return self.__class__(-self._amount, self._currency)
+
+    def __add__(self, other):
+        self._currency_check(other)
+        return self.__class__(amount=self._amount + other.amount, currency=self._currency)
+
+    def __mul__(self, other):
+        return self.__class__(amount=self._amount * Decimal(str(other)), currency=self._currency)
+
+    def round(self, n=None):
+        n = n or self._currency.decimals
+        decimals = Decimal(10) ** -n
+        return self.__class__(self._amount.quantize(decimals, rounding=ROUND_HALF_UP), self._currency)
+
+
+def loops(cls):
+    items = [cls(Decimal(i) / 7, 'EUR') for i in range(1000)]
+    rate = Decimal('1.21')
+
+    def add():
+        total = cls(0, 'EUR')
+        for item in items:
+            total = total + item
+        return total
+
+    def mul_neg():
+        return [-(item * rate) for item in items]
+
+    def round_():
+        return [item.round() for item in items]
+
+    return [('add', add), ('mul + neg', mul_neg), ('round', round_)]
+
+
+def main():
+    for (name, before), (_, after) in zip(loops(ConstructorMoney), loops(Money)):
+        baseline = bench('{} x1000 (constructor)'.format(name), before, number=20)
+        candidate = bench('{} x1000 (_make)'.format(name), after, number=20)
+        compare('{} speedup'.format(name), baseline, candidate)
+
+
+if __name__ == '__main__':
+    main()
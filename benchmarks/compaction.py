@@ -0,0 +1,64 @@
+# coding=utf-8
+"""
+Rate table size and lookup latency with a full row per currency and day,
+against the same history after compact removed the unchanged rates.
+
+Three years of 30 currencies where 10 change every day and 20 are pegged
+and change once a month. Runs against the test settings in-memory SQLite
+database.
+"""
+from __future__ import absolute_import, print_function, unicode_literals
+
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+
+from .utils import bench, compare, setup
+
+setup()
+
+from django.core.management import call_command  # noqa: E402 isort:skip
+from django.db import connection  # noqa: E402 isort:skip
+from txmoney.rates.models import Rate, RateSource  # noqa: E402 isort:skip
+
+START = date(2014, 1, 1)
+DAYS = 3 * 365
+FLOATING = ['F{:02d}'.format(i) for i in range(10)]
+PEGGED = ['P{:02d}'.format(i) for i in range(20)]
+
+
+def table_size():
+    with connection.cursor() as cursor:
+        cursor.execute('VACUUM')
+        cursor.execute('PRAGMA page_count')
+        pages = cursor.fetchone()[0]
+        cursor.execute('PRAGMA page_size')
+        return pages * cursor.fetchone()[0]
+
+
+def report(label):
+    print('{:<48} {:>10} rows {:>8} KB'.format(label, Rate.objects.count(), table_size() // 1024))
+    lookups = [(random.choice(FLOATING + PEGGED), START + timedelta(random.randrange(DAYS))) for _ in range(100)]
+    return bench(
+        '{} get_for_date x100'.format(label),
+        lambda: [Rate.objects.get_for_date(currency, day) for currency, day in lookups], number=5, repeat=3
+    )
+
+
+def main():
+    random.seed(0)
+    call_command('migrate', verbosity=0)
+    source = RateSource.objects.create(name='Benchmark', base_currency='EUR')
+    for day in range(DAYS):
+        rates = dict((currency, Decimal('1.1') + day / Decimal(1000)) for currency in FLOATING)
+        rates.update((currency, Decimal('0.8') + day // 30 / Decimal(100)) for currency in PEGGED)
+        Rate.objects.upsert(source, rates, START + timedelta(day), changes_only=False)
+
+    baseline = report('full')
+    print('{:<48} {:>10} deleted'.format('compact', Rate.objects.compact(source)))
+    candidate = report('compacted')
+    compare('speedup', baseline, candidate)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+# coding=utf-8
+"""
+Every pair of exchange ratios from a rate snapshot against a CrossRateMatrix,
+and updating a few rates of the matrix against rebuilding it.
+"""
+from __future__ import absolute_import, print_function, unicode_literals
+
+from decimal import Decimal
+
+from .utils import bench, compare, setup
+
+setup()
+
+from txmoney.money.models.money import CURRENCIES  # noqa: E402 isort:skip
+from txmoney.rates.matrix import CrossRateMatrix  # noqa: E402 isort:skip
+from txmoney.rates.models import RateSnapshot  # noqa: E402 isort:skip
+
+
+def main():
+    codes = sorted(code for code in CURRENCIES if code != 'EUR')
+    rates = {code: Decimal(i + 1) / 7 for i, code in enumerate(codes)}
+    snapshot = RateSnapshot(None, rates, 'EUR')
+    pairs = [(a, b) for a in codes for b in codes]
+    label = '{} pairs'.format(len(pairs))
+
+    baseline = bench('snapshot ratios ' + label, lambda: [snapshot.ratio(a, b) for a, b in pairs], number=3)
+    matrix = CrossRateMatrix(rates, 'EUR')
+    candidate = bench('matrix ratios ' + label, lambda: [matrix.ratio(a, b) for a, b in pairs], number=3)
+    compare('speedup', baseline, candidate)
+    bench('matrix build {} currencies'.format(len(codes) + 1), lambda: CrossRateMatrix(rates, 'EUR'), number=3)
+
+    changes = [dict(rates, GBP=Decimal(i), USD=Decimal(i + 1), JPY=Decimal(i + 2)) for i in range(1, 4)]
+    baseline = bench('rebuild for 3 changes', lambda: [CrossRateMatrix(c, 'EUR') for c in changes], number=3)
+    candidate = bench('update with 3 changes', lambda: [matrix.update(c) for c in changes], number=3)
+    compare('speedup', baseline, candidate)
+
+
+if __name__ == '__main__':
+    main()
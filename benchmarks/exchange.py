@@ -0,0 +1,55 @@
+# coding=utf-8
+"""
+Exchanging a price list to another currency without and with the rate cache,
+with a rate snapshot and with exchange_many.
+Runs against the test settings in-memory SQLite database.
+"""
+from __future__ import absolute_import, print_function, unicode_literals
+
+from decimal import Decimal
+
+from .utils import bench, compare, setup
+
+setup()
+
+from django.core.management import call_command  # noqa: E402 isort:skip
+from txmoney.money.models import Money  # noqa: E402 isort:skip
+from txmoney.rates.cache import rate_cache  # noqa: E402 isort:skip
+from txmoney.rates.models import Rate, RateSource  # noqa: E402 isort:skip
+from txmoney.rates.utils import exchange_many  # noqa: E402 isort:skip
+
+COUNT = 1000
+
+
+def main():
+    call_command('migrate', verbosity=0)
+    source = RateSource.objects.create(name='Benchmark', base_currency='EUR')
+    Rate.objects.create(source=source, currency='USD', value=Decimal('1.2'))
+    Rate.objects.create(source=source, currency='GBP', value=Decimal('0.8'))
+    prices = [Money(i, 'GBP') for i in range(COUNT)]
+
+    timeout = rate_cache.timeout
+    rate_cache.timeout = 0
+    baseline = bench(
+        'exchange_to uncached x{}'.format(COUNT), lambda: [p.exchange_to('USD') for p in prices], number=5
+    )
+    rate_cache.timeout = timeout
+    candidate = bench('exchange_to cached x{}'.format(COUNT), lambda: [p.exchange_to('USD') for p in prices], number=5)
+    compare('speedup', baseline, candidate)
+    print('{:<48} {}'.format('cache info', rate_cache.info()))
+
+    snapshot = Rate.objects.snapshot()
+    candidate = bench(
+        'exchange_to snapshot x{}'.format(COUNT), lambda: [p.exchange_to('USD', snapshot=snapshot) for p in prices],
+        number=5
+    )
+    compare('speedup', baseline, candidate)
+
+    rate_cache.timeout = 0
+    candidate = bench('exchange_many uncached x{}'.format(COUNT), lambda: exchange_many(prices, 'USD'), number=5)
+    rate_cache.timeout = timeout
+    compare('speedup', baseline, candidate)
+
+
+if __name__ == '__main__':
+    main()
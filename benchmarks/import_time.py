@@ -0,0 +1,51 @@
+# coding=utf-8
+"""
+Cost of importing txmoney.money.models and of the first currency lookup,
+which is when the ISO 4217 registry gets built.
+
+Uses `python -X importtime` when available (Python 3.7+) to also print the
+slowest modules.
+"""
+from __future__ import absolute_import, print_function, unicode_literals
+
+import subprocess
+import sys
+
+SETUP = '''
+import django
+from django.conf import settings
+settings.configure(INSTALLED_APPS=['txmoney.rates'])
+django.setup()
+'''
+
+IMPORT = SETUP + '''
+import time
+start = time.time()
+import txmoney.money.models
+imported = time.time()
+txmoney.money.models.Currency.get_by_code('EUR')
+print((imported - start) * 1e3, (time.time() - imported) * 1e3)
+'''
+
+
+def main(repeat=10):
+    timings = []
+    for _ in range(repeat):
+        output = subprocess.check_output([sys.executable, '-c', IMPORT])
+        timings.append([float(value) for value in output.split()])
+    print('{:<48} {:>10.3f} ms'.format('import txmoney.money.models', min(t[0] for t in timings)))
+    print('{:<48} {:>10.3f} ms'.format('first Currency.get_by_code', min(t[1] for t in timings)))
+
+    if sys.version_info >= (3, 7):
+        process = subprocess.Popen(
+            [sys.executable, '-X', 'importtime', '-c', SETUP + 'import txmoney.money.models'],
+            stderr=subprocess.PIPE, universal_newlines=True
+        )
+        _, stderr = process.communicate()
+        rows = [line.split('|') for line in stderr.splitlines() if 'txmoney' in line]
+        for row in sorted(rows, key=lambda row: -int(row[0].split(':')[1]))[:10]:
+            print('{:<48} {:>10.3f} ms'.format(row[2].strip(), int(row[0].split(':')[1]) / 1e3))
+
+
+if __name__ == '__main__':
+    main()
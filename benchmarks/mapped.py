@@ -0,0 +1,63 @@
+# coding=utf-8
+"""
+Rate lookups for random currencies and dates from the database, with the
+process local rate cache disabled, against the memory-mapped rates file.
+
+Three years of daily rates of 30 currencies. Runs against the test settings
+in-memory SQLite database.
+"""
+from __future__ import absolute_import, print_function, unicode_literals
+
+import os
+import random
+import shutil
+import tempfile
+from datetime import date, timedelta
+from decimal import Decimal
+
+from .utils import bench, compare, setup
+
+setup()
+
+from django.core.management import call_command  # noqa: E402 isort:skip
+from django.test import override_settings  # noqa: E402 isort:skip
+from txmoney.rates.mapped import write_rates_file  # noqa: E402 isort:skip
+from txmoney.rates.models import Rate, RateSource  # noqa: E402 isort:skip
+from txmoney.rates.utils import get_rate_value  # noqa: E402 isort:skip
+
+START = date(2014, 1, 1)
+DAYS = 3 * 365
+CURRENCIES = ['C{:02d}'.format(i) for i in range(30)]
+
+
+def main():
+    random.seed(0)
+    call_command('migrate', verbosity=0)
+    source = RateSource.objects.create(name='Benchmark', base_currency='EUR')
+    for day in range(DAYS):
+        rates = dict((currency, Decimal('1.1') + (day + i) / Decimal(1000)) for i, currency in enumerate(CURRENCIES))
+        Rate.objects.upsert(source, rates, START + timedelta(day))
+
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, 'rates.bin')
+        write_rates_file(path)
+        size = os.path.getsize(path) // 1024
+        print('{:<48} {:>10} rates {:>8} KB'.format('rates file', DAYS * len(CURRENCIES), size))
+
+        lookups = [(random.choice(CURRENCIES), START + timedelta(random.randrange(DAYS))) for _ in range(100)]
+
+        def run():
+            return [get_rate_value(currency, day) for currency, day in lookups]
+
+        with override_settings(TXMONEY={'RATES_CACHE_TIMEOUT': 0}):
+            baseline = bench('database get_rate_value x100', run, number=5, repeat=3)
+        with override_settings(TXMONEY={'RATES_CACHE_TIMEOUT': 0, 'RATES_MAPPED_FILE': path}):
+            candidate = bench('mapped file get_rate_value x100', run, number=5, repeat=3)
+        compare('speedup', baseline, candidate)
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
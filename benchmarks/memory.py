@@ -0,0 +1,80 @@
+# coding=utf-8
+"""
+Memory used per Money and Currency instance.
+
+The "dict" rows reproduce the attribute layout Money and Currency had before
+they were slot based, so both layouts can be compared on the same interpreter.
+"""
+from __future__ import absolute_import, print_function, unicode_literals
+
+import sys
+from decimal import Decimal
+
+from .utils import setup
+
+setup()
+
+from txmoney.money.models.money import Currency, Money  # noqa: E402 isort:skip
+
+try:
+    import tracemalloc
+except ImportError:  # Python 2
+    tracemalloc = None
+
+COUNT = 100000
+
+
+class DictMoney(object):
+    def __init__(self, amount, currency):
+        self._amount = amount
+        self._currency = currency
+
+
+class DictCurrency(object):
+    def __init__(self, code, numeric='', name='', symbol='', decimals=2, countries=None):
+        self.code = code
+        self.numeric = numeric
+        self.name = name
+        self.symbol = symbol
+        self.decimals = decimals
+        self.countries = countries or []
+
+
+def shallow_size(obj):
+    size = sys.getsizeof(obj)
+    if hasattr(obj, '__dict__'):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+def traced_size(factory):
+    """
+    Average bytes allocated per instance when keeping COUNT of them alive.
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objs = [factory() for _ in range(COUNT)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objs
+    return (after - before) / COUNT
+
+
+def main():
+    amount = Decimal('123.45')
+    eur = Currency.get_by_code('EUR')
+    cases = [
+        ('Money (dict)', lambda: DictMoney(amount, eur)),
+        ('Money (slots)', lambda: Money(amount, eur)),
+        ('Currency (dict)', lambda: DictCurrency('XXX', '999', 'Test', 'X', 2, ['TEST'])),
+        ('Currency (slots)', lambda: Currency('XXX', '999', 'Test', 'X', 2, ['TEST'])),
+    ]
+
+    print('{:<24} {:>16} {:>16}'.format('', 'shallow bytes', 'traced bytes'))
+    for label, factory in cases:
+        traced = '{:.1f}'.format(traced_size(factory)) if tracemalloc else 'n/a'
+        print('{:<24} {:>16} {:>16}'.format(label, shallow_size(factory()), traced))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+# coding=utf-8
+"""
+Decimal backed Money against integer backed MinorUnitMoney in ledger-like
+hot loops: running totals, differences, comparisons, hashing and allocation.
+"""
+from __future__ import absolute_import, print_function, unicode_literals
+
+from decimal import Decimal
+
+from .utils import bench, compare, setup
+
+setup()
+
+from txmoney.money.models import MinorUnitMoney, Money  # noqa: E402 isort:skip
+
+COUNT = 1000
+
+
+def loops(items):
+    zero = items[0] - items[0]
+
+    def add():
+        total = zero
+        for item in items:
+            total = total + item
+        return total
+
+    def sub():
+        total = zero
+        for item in items:
+            total = total - item
+        return total
+
+    def compare_():
+        return sum(1 for item in items if item > zero)
+
+    def hash_():
+        return len(set(items))
+
+    def allocate():
+        return items[-1].allocate([1] * 100)
+
+    return [
+        ('add x{}'.format(COUNT), add),
+        ('sub x{}'.format(COUNT), sub),
+        ('compare x{}'.format(COUNT), compare_),
+        ('hash x{}'.format(COUNT), hash_),
+        ('allocate in 100', allocate),
+    ]
+
+
+def main():
+    decimal_items = [Money(Decimal(i * 37) / 100, 'EUR') for i in range(COUNT)]
+    minor_items = [MinorUnitMoney.from_money(item) for item in decimal_items]
+
+    for (name, before), (_, after) in zip(loops(decimal_items), loops(minor_items)):
+        try:
+            baseline = bench('{} (Money)'.format(name), before, number=100)
+        except TypeError:
+            # Money is not hashable
+            print('{:<48} {:>13}'.format('{} (Money)'.format(name), 'n/a'))
+            baseline = None
+        candidate = bench('{} (MinorUnitMoney)'.format(name), after, number=100)
+        if baseline:
+            compare('{} speedup'.format(name), baseline, candidate)
+
+
+if __name__ == '__main__':
+    main()
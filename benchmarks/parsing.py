@@ -0,0 +1,34 @@
+# coding=utf-8
+"""
+Parsing '123.45 EUR' strings: one Money.from_string per value against
+Money.parse_many.
+"""
+from __future__ import absolute_import, print_function, unicode_literals
+
+from .utils import bench, compare, setup
+
+setup()
+
+from txmoney.money.models import Money  # noqa: E402 isort:skip
+
+COUNT = 10000
+CODES = ('EUR', 'USD', 'GBP', 'JPY')
+
+
+def main():
+    values = ['{}.{:02d} {}'.format(i, i % 100, CODES[i % len(CODES)]) for i in range(COUNT)]
+
+    baseline = bench('from_string x{}'.format(COUNT), lambda: [Money.from_string(v) for v in values], number=20)
+    candidate = bench('parse_many x{}'.format(COUNT), lambda: Money.parse_many(values), number=20)
+    compare('speedup', baseline, candidate)
+    print('{:<48} {:>10.0f} values/s'.format('parse_many throughput', COUNT / candidate * 1e6))
+
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return
+    bench('parse_many as_array x{}'.format(COUNT), lambda: Money.parse_many(values, as_array=True), number=20)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,35 @@
+# coding=utf-8
+"""
+Rounding to currency precision: computing the quantize exponent on every call,
+as amount_rounded used to, against the precomputed currency rounding plans.
+"""
+from __future__ import absolute_import, print_function, unicode_literals
+
+from decimal import ROUND_HALF_UP, Decimal
+
+from .utils import bench, compare, setup
+
+setup()
+
+from txmoney.money.models import Money, round_many  # noqa: E402 isort:skip
+
+COUNT = 10000
+
+
+def main():
+    moneys = [Money(Decimal(i) / 7, 'EUR') for i in range(COUNT)]
+
+    def per_call_exponent():
+        return [m.amount.quantize(Decimal(10) ** -m.currency.decimals, rounding=ROUND_HALF_UP) for m in moneys]
+
+    baseline = bench('per call exponent x{}'.format(COUNT), per_call_exponent, number=20)
+    candidate = bench('amount_rounded x{}'.format(COUNT), lambda: [m.amount_rounded for m in moneys], number=20)
+    compare('speedup', baseline, candidate)
+
+    baseline = bench('Money.round x{}'.format(COUNT), lambda: [m.round() for m in moneys], number=20)
+    candidate = bench('round_many x{}'.format(COUNT), lambda: round_many(moneys), number=20)
+    compare('speedup', baseline, candidate)
+
+
+if __name__ == '__main__':
+    main()
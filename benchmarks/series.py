@@ -0,0 +1,54 @@
+# coding=utf-8
+"""
+Revaluing a Money every day of a year: one exchange_ratio per day, with the
+rate cache disabled, against exchange_series.
+Runs against the test settings in-memory SQLite database.
+"""
+from __future__ import absolute_import, print_function, unicode_literals
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+from .utils import bench, compare, setup
+
+setup()
+
+from django.core.management import call_command  # noqa: E402 isort:skip
+from txmoney.money.models import Money  # noqa: E402 isort:skip
+from txmoney.rates.cache import rate_cache  # noqa: E402 isort:skip
+from txmoney.rates.models import Rate, RateSource  # noqa: E402 isort:skip
+from txmoney.rates.utils import exchange_ratio, exchange_series  # noqa: E402 isort:skip
+
+START = date(2016, 1, 1)
+DAYS = 365
+
+
+def main():
+    call_command('migrate', verbosity=0)
+    source = RateSource.objects.create(name='Benchmark', base_currency='EUR')
+    for day in range(DAYS):
+        # Business days only, weekends are forward filled
+        rate_date = START + timedelta(day)
+        if rate_date.weekday() < 5:
+            for currency, value in (('USD', Decimal('1.1')), ('GBP', Decimal('0.8'))):
+                # Rate.date is auto_now_add, so set it afterwards
+                rate = Rate.objects.create(source=source, currency=currency, value=value + day / Decimal(1000))
+                Rate.objects.filter(pk=rate.pk).update(date=rate_date)
+
+    money = Money(100, 'GBP')
+    end = START + timedelta(DAYS - 1)
+    dates = [START + timedelta(day) for day in range(DAYS)]
+
+    rate_cache.timeout = 0
+    baseline = bench(
+        'exchange_ratio x{} days'.format(DAYS),
+        lambda: [money.amount * exchange_ratio('GBP', 'USD', d) for d in dates], number=1, repeat=3
+    )
+    candidate = bench(
+        'exchange_series {} days'.format(DAYS), lambda: exchange_series(money, 'USD', START, end), number=1, repeat=3
+    )
+    compare('speedup', baseline, candidate)
+
+
+if __name__ == '__main__':
+    main()
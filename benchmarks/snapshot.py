@@ -0,0 +1,43 @@
+# coding=utf-8
+"""
+Loading the rates of every currency for a date from a long history: one
+get_for_date per currency against a single Rate.objects.snapshot.
+
+150 currencies with a rate every day for 2000 days, 300000 rows. Runs
+against the test settings in-memory SQLite database.
+"""
+from __future__ import absolute_import, print_function, unicode_literals
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+from .utils import bench, compare, setup
+
+setup()
+
+from django.core.management import call_command  # noqa: E402 isort:skip
+from txmoney.rates.models import Rate, RateSource  # noqa: E402 isort:skip
+
+START = date(2012, 1, 1)
+DAYS = 2000
+CURRENCIES = ['C{:02d}'.format(i) for i in range(150)]
+
+
+def main():
+    call_command('migrate', verbosity=0)
+    source = RateSource.objects.create(name='Benchmark', base_currency='EUR')
+    for day in range(DAYS):
+        rates = [(currency, Decimal(i + 1) + day / Decimal(1000)) for i, currency in enumerate(CURRENCIES)]
+        Rate.objects.upsert(source, rates, START + timedelta(day), changes_only=False)
+
+    snapshot_date = START + timedelta(DAYS - 10)
+    baseline = bench(
+        'get_for_date x{}'.format(len(CURRENCIES)),
+        lambda: [Rate.objects.get_for_date(currency, snapshot_date) for currency in CURRENCIES], number=1, repeat=3
+    )
+    candidate = bench('snapshot', lambda: Rate.objects.snapshot(snapshot_date), number=1, repeat=3)
+    compare('speedup', baseline, candidate)
+
+
+if __name__ == '__main__':
+    main()
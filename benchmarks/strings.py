@@ -0,0 +1,32 @@
+# coding=utf-8
+"""
+Repeated string conversion of the same Money, as logging and cache key
+generation do, against formatting it on every call, and Money hashing.
+"""
+from __future__ import absolute_import, print_function, unicode_literals
+
+from .utils import bench, compare, setup
+
+setup()
+
+from txmoney.money.models import Money  # noqa: E402 isort:skip
+
+COUNT = 1000
+
+
+def main():
+    moneys = [Money('{}.25'.format(i), 'EUR') for i in range(COUNT)]
+
+    baseline = bench(
+        'format x{}'.format(COUNT), lambda: ['{} {}'.format(m.amount, m.currency) for m in moneys], number=200
+    )
+    candidate = bench('str x{}'.format(COUNT), lambda: [str(m) for m in moneys], number=200)
+    compare('speedup', baseline, candidate)
+
+    bench('set of Money x{}'.format(COUNT), lambda: set(moneys), number=200)
+    cache = {money: money * 2 for money in moneys}
+    bench('dict keyed by Money x{}'.format(COUNT), lambda: [cache[m] for m in moneys], number=200)
+
+
+if __name__ == '__main__':
+    main()
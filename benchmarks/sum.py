@@ -0,0 +1,45 @@
+# coding=utf-8
+"""
+Totals of many Money: builtin sum() against Money.sum and MoneyAccumulator.
+"""
+from __future__ import absolute_import, print_function, unicode_literals
+
+from decimal import Decimal
+
+from .utils import bench, compare, setup
+
+setup()
+
+from txmoney.money.models import Money, MoneyAccumulator  # noqa: E402 isort:skip
+
+COUNT = 10000
+
+
+def main():
+    moneys = [Money(Decimal(i) / 7, 'EUR') for i in range(COUNT)]
+    mixed = [Money(Decimal(i) / 7, ('EUR', 'USD', 'JPY')[i % 3]) for i in range(COUNT)]
+
+    baseline = bench('sum() x{}'.format(COUNT), lambda: sum(moneys), number=20)
+    candidate = bench('Money.sum x{}'.format(COUNT), lambda: Money.sum(moneys), number=20)
+    compare('speedup', baseline, candidate)
+    candidate = bench('MoneyAccumulator x{}'.format(COUNT), lambda: MoneyAccumulator().update(moneys).total, number=20)
+    compare('speedup', baseline, candidate)
+
+    def grouped_sum():
+        totals = {}
+        for money in mixed:
+            code = money.currency.code
+            totals[code] = totals[code] + money if code in totals else money
+        return totals
+
+    baseline = bench('per currency sum x{}'.format(COUNT), grouped_sum, number=20)
+    candidate = bench(
+        'grouped MoneyAccumulator x{}'.format(COUNT),
+        lambda: MoneyAccumulator(grouped=True).update(mixed).totals(),
+        number=20
+    )
+    compare('speedup', baseline, candidate)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+# coding=utf-8
+"""
+Helpers shared by the benchmark scripts.
+
+Benchmarks are plain scripts run from the repository root, for example::
+
+    python -m benchmarks.memory
+"""
+from __future__ import absolute_import, print_function, unicode_literals
+
+import os
+import timeit
+
+import django
+
+
+def setup():
+    """
+    Configures Django with the test application settings.
+    """
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'tests.testapp.settings')
+    django.setup()
+
+
+def bench(label, func, number=100000, repeat=5):
+    """
+    Prints and returns the best time per call of `func` in microseconds.
+    """
+    best = min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e6
+    print('{:<48} {:>10.3f} us'.format(label, best))
+    return best
+
+
+def compare(label, baseline, candidate):
+    """
+    Prints the speedup of `candidate` over `baseline` timings.
+    """
+    print('{:<48} {:>10.2f} x'.format(label, baseline / candidate))
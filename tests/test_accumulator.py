@@ -0,0 +1,99 @@
+# coding=utf-8
+from __future__ import absolute_import, unicode_literals
+
+from decimal import Decimal
+
+import pytest
+
+from txmoney.money.exceptions import CurrencyMismatch
+from txmoney.money.models import (
+    Currency, MinorUnitMoney, Money, MoneyAccumulator
+)
+from txmoney.settings import txmoney_settings as settings
+
+
+class TestMoneySum(object):
+    """
+    Tests of Money.sum
+    """
+
+    MONEY_SUM = [
+        ([Money('1.50', 'EUR'), Money('2', 'EUR')], None, Money('3.50', 'EUR')),
+        ([Money('1.50', 'EUR'), Money('2', 'EUR')], 'EUR', Money('3.50', 'EUR')),
+        ((Money(i, 'USD') for i in range(5)), None, Money('10', 'USD')),
+        ([], 'JPY', Money('0', 'JPY')),
+        ([], None, Money('0', settings.DEFAULT_CURRENCY)),
+    ]
+
+    @pytest.mark.parametrize('moneys,currency,expected', MONEY_SUM)
+    def test_sum(self, moneys, currency, expected):
+        result = Money.sum(moneys, currency)
+        assert result == expected
+        assert result.currency is expected.currency
+
+    def test_sum_matches_builtin(self):
+        moneys = [Money(Decimal(i) / 7, 'EUR') for i in range(100)]
+        assert Money.sum(moneys) == sum(moneys)
+
+    @pytest.mark.parametrize('moneys,currency', [
+        ([Money(1, 'EUR'), Money(1, 'USD')], None),
+        ([Money(1, 'EUR')], 'USD'),
+    ])
+    def test_sum_mismatch(self, moneys, currency):
+        with pytest.raises(CurrencyMismatch):
+            Money.sum(moneys, currency)
+
+
+class TestMoneyAccumulator(object):
+    """
+    Tests of the MoneyAccumulator class
+    """
+
+    def test_add(self):
+        total = MoneyAccumulator('EUR')
+        total.add(Money('10.50', 'EUR'))
+        total += Money('3', 'EUR')
+        total.update([Money('1', 'EUR'), MinorUnitMoney(1, 'EUR')])
+        assert total.total == Money('14.51', 'EUR')
+        assert total.totals() == {'EUR': Money('14.51', 'EUR')}
+        assert len(total) == 4
+
+    def test_currency_from_first_money(self):
+        total = MoneyAccumulator().update([Money(1, 'USD'), Money(2, 'USD')])
+        assert total.total == Money(3, 'USD')
+
+    def test_empty(self):
+        assert MoneyAccumulator('JPY').total == Money(0, 'JPY')
+        assert MoneyAccumulator().total == Money(0, settings.DEFAULT_CURRENCY)
+        assert MoneyAccumulator().totals() == {}
+        assert MoneyAccumulator(grouped=True).totals() == {}
+
+    def test_mismatch(self):
+        total = MoneyAccumulator('EUR')
+        with pytest.raises(CurrencyMismatch):
+            total.add(Money(1, 'USD'))
+
+    def test_update_mismatch_keeps_previous(self):
+        total = MoneyAccumulator()
+        with pytest.raises(CurrencyMismatch):
+            total.update([Money(1, 'EUR'), Money(2, 'EUR'), Money(1, 'USD')])
+        assert total.total == Money(3, 'EUR')
+        assert len(total) == 2
+
+    def test_grouped(self):
+        totals = MoneyAccumulator(grouped=True)
+        totals.update([Money('1', 'EUR'), Money('2', 'USD'), Money('3.5', 'EUR')])
+        assert totals.totals() == {'EUR': Money('4.5', 'EUR'), 'USD': Money('2', 'USD')}
+        with pytest.raises(CurrencyMismatch):
+            totals.total
+
+    def test_grouped_unregistered_currency(self):
+        currency = Currency('AAA', name='Ad-hoc currency')
+        totals = MoneyAccumulator(grouped=True).add(Money('1', currency))
+        totals.update([Money('2', currency), Money('1', 'EUR')])
+        assert totals.totals()['AAA'] == Money('3', currency)
+        assert totals.totals()['AAA'].currency is currency
+
+    def test_grouped_single_currency(self):
+        totals = MoneyAccumulator(grouped=True).update([Money('1', 'EUR'), Money('2', 'EUR')])
+        assert totals.total == Money('3', 'EUR')
@@ -0,0 +1,108 @@
+# coding=utf-8
+from __future__ import absolute_import, division, unicode_literals
+
+from decimal import Decimal
+from fractions import Fraction
+
+import pytest
+
+from txmoney.money.models import Money, allocate_many, iter_allocate
+from txmoney.money.models.allocation import allocate_units, integer_weights
+
+
+class TestAllocation(object):
+    """
+    Tests of the allocation engine
+    """
+
+    WEIGHTS = [
+        ([1, 2, 3], [1, 2, 3]),
+        ([Decimal('0.5'), Decimal('0.25')], [50, 25]),
+        ([Fraction(1, 3), Fraction(2, 3)], [1, 2]),
+        ([1, Decimal('0.5'), Fraction(1, 4)], [4, 2, 1]),
+        ([], []),
+    ]
+
+    @pytest.mark.parametrize('ratios,expected', WEIGHTS)
+    def test_integer_weights(self, ratios, expected):
+        assert integer_weights(ratios) == expected
+
+    @pytest.mark.parametrize('ratios', [[1, -1], [0, 0]])
+    def test_invalid_weights(self, ratios):
+        with pytest.raises(ValueError):
+            integer_weights(ratios)
+
+    UNITS = [
+        (100, [1, 1, 1], [34, 33, 33]),
+        (100, [1, 1, 1, 1, 1, 1], [17, 17, 17, 17, 16, 16]),
+        (-100, [1, 1, 1], [-34, -33, -33]),
+        (10, [1, 2, 7], [1, 2, 7]),
+        (7, [3, 3, 1], [3, 3, 1]),
+        (1, [1, 1], [1, 0]),
+        (1, [1, 3], [0, 1]),
+        (0, [1, 1], [0, 0]),
+        (5, [0, 1], [0, 5]),
+    ]
+
+    @pytest.mark.parametrize('units,weights,expected', UNITS)
+    def test_allocate_units(self, units, weights, expected):
+        assert allocate_units(units, weights) == expected
+
+    @pytest.mark.parametrize('units,weights,expected', UNITS)
+    def test_allocate_units_sum(self, units, weights, expected):
+        assert sum(allocate_units(units, weights)) == units
+
+    MONEY_ALLOCATION = [
+        (Money('100', 'EUR'), [1, 1, 1], ['33.34', '33.33', '33.33']),
+        (Money('-0.05', 'EUR'), [1, 1], ['-0.03', '-0.02']),
+        (Money('100', 'JPY'), [1, 1, 1], ['34', '33', '33']),
+        (Money('10.005', 'EUR'), [1, 1], ['5.003', '5.002']),
+        (Money('1', 'EUR'), [Decimal('0.7'), Decimal('0.3')], ['0.70', '0.30']),
+        (Money('1', 'EUR'), [Fraction(1, 3), Fraction(2, 3)], ['0.33', '0.67']),
+    ]
+
+    @pytest.mark.parametrize('money,ratios,expected', MONEY_ALLOCATION)
+    def test_allocate(self, money, ratios, expected):
+        result = money.allocate(ratios)
+        assert [share.amount for share in result] == [Decimal(amount) for amount in expected]
+        assert [str(share.amount) for share in result] == expected
+        assert all(share.currency is money.currency for share in result)
+        assert sum(share.amount for share in result) == money.amount
+
+    def test_allocate_generator(self):
+        result = Money('10', 'EUR').allocate(ratio for ratio in [1, 1, 1])
+        assert result == [Money('3.34', 'EUR'), Money('3.33', 'EUR'), Money('3.33', 'EUR')]
+
+    def test_allocate_many_ratios(self):
+        money = Money('123456.78', 'EUR')
+        result = money.allocate([1] * 10000)
+        assert len(result) == 10000
+        assert sum(share.amount for share in result) == money.amount
+        assert max(result) - min(result) <= Money('0.01', 'EUR')
+
+    @pytest.mark.parametrize('money,ratios,expected', MONEY_ALLOCATION)
+    def test_iter_allocate(self, money, ratios, expected):
+        assert list(iter_allocate(money, ratios)) == money.allocate(ratios)
+        result = list(iter_allocate(money, ratios, total=sum(ratios)))
+        assert sum(share.amount for share in result) == money.amount
+        # Each share is less than one unit away from its exact quota
+        unit = Fraction(Decimal(1).scaleb(Decimal(expected[0]).as_tuple().exponent))
+        total = sum(Fraction(ratio) for ratio in ratios)
+        for share, ratio in zip(result, ratios):
+            assert abs(Fraction(share.amount) - Fraction(money.amount) * Fraction(ratio) / total) < unit
+
+    def test_iter_allocate_generator(self):
+        money = Money('100', 'EUR')
+        result = iter_allocate(money, (1 for _ in range(3)), total=3)
+        # Streamed shares round down cumulative quotas, unlike allocate
+        assert [share.amount for share in result] == [Decimal('33.33'), Decimal('33.33'), Decimal('33.34')]
+
+    def test_allocate_many(self):
+        moneys = [Money('100', 'EUR'), Money('-1', 'USD'), Money('7', 'JPY')]
+        result = allocate_many(moneys, [1, 1, 1])
+        assert result == [
+            [Money('33.34', 'EUR'), Money('33.33', 'EUR'), Money('33.33', 'EUR')],
+            [Money('-0.34', 'USD'), Money('-0.33', 'USD'), Money('-0.33', 'USD')],
+            [Money('3', 'JPY'), Money('2', 'JPY'), Money('2', 'JPY')],
+        ]
+        assert result == [money.allocate([1, 1, 1]) for money in moneys]
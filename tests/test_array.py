@@ -0,0 +1,143 @@
+# coding=utf-8
+from __future__ import absolute_import, division, unicode_literals
+
+from decimal import Decimal
+
+import pytest
+
+from txmoney.money.exceptions import CurrencyDoesNotExist, CurrencyMismatch
+from txmoney.money.models import Money
+from txmoney.settings import txmoney_settings as settings
+
+np = pytest.importorskip('numpy')
+
+from txmoney.money.models.array import MoneyArray  # noqa: E402 isort:skip
+
+
+class TestMoneyArray(object):
+    """
+    Tests of the MoneyArray class
+    """
+
+    MONEYS = [Money('10.50', 'EUR'), Money('-3', 'USD'), Money('1.005', 'EUR'), Money('7', 'JPY')]
+
+    def test_creation(self):
+        value = MoneyArray(['10.50', 3, Decimal('1.25'), 2.5], 'EUR')
+        assert len(value) == 4
+        assert list(value.amounts) == [Decimal('10.50'), Decimal(3), Decimal('1.25'), Decimal('2.5')]
+        assert list(value.currencies) == ['EUR'] * 4
+
+    def test_creation_default_currency(self):
+        assert list(MoneyArray([1, 2]).currencies) == [settings.DEFAULT_CURRENCY] * 2
+
+    def test_creation_per_element_currency(self):
+        value = MoneyArray([1, 2], ['EUR', 'USD'])
+        assert value.to_moneys() == [Money(1, 'EUR'), Money(2, 'USD')]
+
+    def test_invalid_creation(self):
+        with pytest.raises(CurrencyDoesNotExist):
+            MoneyArray([1, 2], ['EUR', 'YYY'])
+        with pytest.raises(ValueError):
+            MoneyArray([1, 2], ['EUR'])
+
+    def test_money_conversion(self):
+        value = MoneyArray.from_moneys(self.MONEYS)
+        moneys = value.to_moneys()
+        assert moneys == self.MONEYS
+        assert all(a.currency is b.currency for a, b in zip(moneys, self.MONEYS))
+        assert list(value) == self.MONEYS
+        assert MoneyArray.from_moneys([]).to_moneys() == []
+
+    def test_parse_many(self):
+        value = Money.parse_many(['10.50 EUR', '3 USD', 'foo'], errors='skip', as_array=True)
+        assert isinstance(value, MoneyArray)
+        assert value.to_moneys() == [Money('10.50', 'EUR'), Money('3', 'USD')]
+
+    def test_indexing(self):
+        value = MoneyArray.from_moneys(self.MONEYS)
+        assert value[1] == Money('-3', 'USD')
+        assert value[-1] == Money('7', 'JPY')
+        assert value[1:3].to_moneys() == self.MONEYS[1:3]
+
+    def test_masking(self):
+        value = MoneyArray.from_moneys(self.MONEYS)
+        assert value[value.currencies == 'EUR'].to_moneys() == [Money('10.50', 'EUR'), Money('1.005', 'EUR')]
+        assert value[value > 0].to_moneys() == [Money('10.50', 'EUR'), Money('1.005', 'EUR'), Money('7', 'JPY')]
+
+    ARRAY_ARITHMETIC = [
+        (lambda a: a + a, [Money('21', 'EUR'), Money('-6', 'USD')]),
+        (lambda a: a - a, [Money('0', 'EUR'), Money('0', 'USD')]),
+        (lambda a: a + 1, [Money('11.50', 'EUR'), Money('-2', 'USD')]),
+        (lambda a: a - Decimal('0.5'), [Money('10', 'EUR'), Money('-3.5', 'USD')]),
+        (lambda a: a * 2, [Money('21', 'EUR'), Money('-6', 'USD')]),
+        (lambda a: 2 * a, [Money('21', 'EUR'), Money('-6', 'USD')]),
+        (lambda a: a * [2, Decimal('0.5')], [Money('21', 'EUR'), Money('-1.5', 'USD')]),
+        (lambda a: a * 0.5, [Money('5.25', 'EUR'), Money('-1.5', 'USD')]),
+        (lambda a: a / 2, [Money('5.25', 'EUR'), Money('-1.5', 'USD')]),
+        (lambda a: -a, [Money('-10.50', 'EUR'), Money('3', 'USD')]),
+        (lambda a: abs(a), [Money('10.50', 'EUR'), Money('3', 'USD')]),
+        (lambda a: a + MoneyArray(['1', '1'], ['EUR', 'USD']), [Money('11.50', 'EUR'), Money('-2', 'USD')]),
+    ]
+
+    @pytest.mark.parametrize('operation,expected', ARRAY_ARITHMETIC)
+    def test_arithmetic(self, operation, expected):
+        value = MoneyArray.from_moneys([Money('10.50', 'EUR'), Money('-3', 'USD')])
+        result = operation(value)
+        assert isinstance(result, MoneyArray)
+        assert result.to_moneys() == expected
+
+    def test_arithmetic_with_money(self):
+        value = MoneyArray([1, 2], 'EUR')
+        assert (value + Money(1, 'EUR')).to_moneys() == [Money(2, 'EUR'), Money(3, 'EUR')]
+        assert (value - Money(1, 'EUR')).to_moneys() == [Money(0, 'EUR'), Money(1, 'EUR')]
+
+    ARRAY_MISMATCHED = [
+        (lambda a: a + MoneyArray([1, 1, 1], ['EUR', 'EUR', 'EUR'])),
+        (lambda a: a - MoneyArray([1, 1, 1], ['EUR', 'USD', 'USD'])),
+        (lambda a: a + Money(1, 'EUR')),
+        (lambda a: a < Money(1, 'EUR')),
+        (lambda a: a >= MoneyArray([1, 1, 1], ['EUR', 'EUR', 'EUR'])),
+    ]
+
+    @pytest.mark.parametrize('operation', ARRAY_MISMATCHED)
+    def test_invalid_currency(self, operation):
+        value = MoneyArray([1, 2, 3], ['EUR', 'USD', 'EUR'])
+        with pytest.raises(CurrencyMismatch):
+            operation(value)
+
+    ARRAY_UNSUPPORTED = [
+        (lambda a: a * a),
+        (lambda a: a / a),
+        (lambda a: 1 / a),
+        (lambda a: 1 - a),
+    ]
+
+    @pytest.mark.parametrize('operation', ARRAY_UNSUPPORTED)
+    def test_invalid_arithmetic(self, operation):
+        with pytest.raises(TypeError):
+            operation(MoneyArray([1, 2], 'EUR'))
+
+    def test_comparison(self):
+        value = MoneyArray([1, 2, 3], 'EUR')
+        assert list(value < 2) == [True, False, False]
+        assert list(value <= Money(2, 'EUR')) == [True, True, False]
+        assert list(value > MoneyArray([0, 2, 4], 'EUR')) == [True, False, False]
+        assert list(value >= 2) == [False, True, True]
+        assert list(value == Money(2, 'EUR')) == [False, True, False]
+        assert list(value != Money(2, 'EUR')) == [True, False, True]
+        assert list(value == MoneyArray([1, 2, 3], ['EUR', 'USD', 'EUR'])) == [True, False, True]
+        with pytest.raises(ValueError):
+            MoneyArray(['1', '2'], 'EUR') == MoneyArray(['1'], 'EUR')
+        with pytest.raises(ValueError):
+            MoneyArray(['1', '2'], 'EUR') != MoneyArray(['1'], 'EUR')
+
+    def test_sum(self):
+        totals = MoneyArray.from_moneys(self.MONEYS).sum()
+        assert totals == {'EUR': Money('11.505', 'EUR'), 'USD': Money('-3', 'USD'), 'JPY': Money('7', 'JPY')}
+        assert MoneyArray([]).sum() == {}
+
+    def test_round(self):
+        value = MoneyArray(['1.005', '1.5', '-1.005'], ['EUR', 'JPY', 'EUR']).round()
+        assert value.to_moneys() == [Money('1.01', 'EUR'), Money('2', 'JPY'), Money('-1.01', 'EUR')]
+        assert [m.amount.as_tuple().exponent for m in value] == [-2, 0, -2]
+        assert MoneyArray(['1.05'], 'EUR').round(1).to_moneys() == [Money('1.1', 'EUR')]
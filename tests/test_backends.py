@@ -0,0 +1,450 @@
+# coding=utf-8
+from __future__ import absolute_import, unicode_literals
+
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from datetime import date
+from decimal import Decimal
+
+import requests
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from django.utils.six import StringIO
+from django.utils.six.moves import BaseHTTPServer, socketserver
+from django.utils.six.moves.urllib.parse import parse_qs, urlparse
+
+from txmoney.rates import backends
+from txmoney.rates.backends import (
+    BaseRateBackend, FileRateBackend, OpenExchangeBackend,
+    update_rates_concurrently
+)
+from txmoney.rates.exceptions import TXRateBackendError
+from txmoney.rates.models import Rate, RateSource
+
+try:
+    from mock import patch
+except ImportError:
+    from unittest.mock import patch
+
+RATES = {
+    '/ecb': {'GBP': 0.8, 'USD': 1.2},
+    '/oxr': {'GBP': 0.85, 'JPY': 130},
+    '/latest.json': {'EUR': 0.8, 'GBP': 0.7},
+}
+HISTORICAL_RE = re.compile(r'^/historical/\d{4}-\d{2}-(\d{2})\.json$')
+ETAG = '"v1"'
+LAST_MODIFIED = 'Sun, 01 Jan 2017 00:00:00 GMT'
+
+
+class StubHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    """
+    Serves RATES as JSON, after waiting the `delay` query parameter seconds.
+    Historical rates of a day have GBP at 0.7 plus a cent per day of month.
+
+    It answers 304 to requests with the current ETag, and 503 to as many
+    requests of a path as `failures` has for it. The path and the start and
+    end times of each request served are kept in `spans`.
+    """
+    protocol_version = 'HTTP/1.1'
+    requests = []
+    spans = []
+    failures = {}
+    delay = 0
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        self.requests.append((url.path, self.client_address, self.headers.get('If-None-Match')))
+        started = time.time()
+        time.sleep(float(query.get('delay', [self.delay])[0]))
+        self.spans.append((url.path, started, time.time()))
+
+        historical = HISTORICAL_RE.match(url.path)
+        if historical:
+            rates = {'EUR': 0.8, 'GBP': round(0.7 + int(historical.group(1)) / 100.0, 2)}
+        elif url.path in RATES:
+            rates = RATES[url.path]
+        else:
+            return self.respond(500)
+        if self.failures.get(url.path):
+            self.failures[url.path] -= 1
+            return self.respond(503)
+        if self.headers.get('If-None-Match') == ETAG:
+            return self.respond(304)
+
+        self.respond(200, json.dumps({'rates': rates}).encode('utf-8'), {
+            'Content-Type': 'application/json', 'ETag': ETAG, 'Last-Modified': LAST_MODIFIED,
+        })
+
+    def respond(self, status, body=b'', headers=None):
+        self.send_response(status)
+        for header, value in (headers or {}).items():
+            self.send_header(header, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def max_concurrent(spans):
+    """
+    Return the largest number of the StubHandler spans served at once
+    """
+    events = sorted([(start, 1) for _, start, _ in spans] + [(end, -1) for _, _, end in spans])
+    concurrent = largest = 0
+    for _, change in events:
+        concurrent += change
+        largest = max(largest, concurrent)
+    return largest
+
+
+class StubServer(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients that timed out close the connection before the response
+        pass
+
+
+class StubServerMixin(object):
+
+    @classmethod
+    def setUpClass(cls):
+        super(StubServerMixin, cls).setUpClass()
+        cls.server = StubServer(('127.0.0.1', 0), StubHandler)
+        cls.url = 'http://127.0.0.1:{}'.format(cls.server.server_address[1])
+        threading.Thread(target=cls.server.serve_forever).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super(StubServerMixin, cls).tearDownClass()
+
+
+class StubBackend(BaseRateBackend):
+    url = None
+
+    def __init__(self, source_name='Stub', path='/ecb', timeout=None):
+        super(StubBackend, self).__init__(source_name, 'EUR', timeout)
+        self.path = path
+
+    def get_rates_from_source(self):
+        response = requests.get(self.url + self.path, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json(parse_float=Decimal)['rates']
+
+
+class ECBBackend(StubBackend):
+
+    def __init__(self):
+        super(ECBBackend, self).__init__('ECB', '/ecb?delay=0.2')
+
+
+class OXRBackend(StubBackend):
+
+    def __init__(self):
+        super(OXRBackend, self).__init__('OXR', '/oxr?delay=0.2')
+
+
+class TestUpdateRatesConcurrently(StubServerMixin, TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestUpdateRatesConcurrently, cls).setUpClass()
+        StubBackend.url = cls.url
+
+    def setUp(self):
+        StubHandler.spans = []
+
+    def rates(self, source_name):
+        return dict(Rate.objects.filter(source__name=source_name).values_list('currency', 'value'))
+
+    def test_concurrent(self):
+        results = update_rates_concurrently([
+            StubBackend('ECB', '/ecb?delay=0.3'), StubBackend('OXR', '/oxr?delay=0.3'),
+        ])
+        assert max_concurrent(StubHandler.spans) == 2
+        assert results == {'ECB': 2, 'OXR': 2}
+        assert self.rates('ECB') == {'GBP': Decimal('0.8'), 'USD': Decimal('1.2')}
+        assert self.rates('OXR') == {'GBP': Decimal('0.85'), 'JPY': Decimal('130')}
+
+    def test_timeout(self):
+        results = update_rates_concurrently([
+            StubBackend('ECB', '/ecb?delay=0.5', timeout=0.1), StubBackend('OXR', '/oxr'),
+        ])
+        # The ECB request was given up before the stub server answered it
+        assert [span[0] for span in StubHandler.spans] == ['/oxr']
+        assert isinstance(results['ECB'], TXRateBackendError)
+        assert results['OXR'] == 2
+        assert self.rates('ECB') == {}
+        assert len(self.rates('OXR')) == 2
+
+    def test_timeout_message(self):
+        fetched = threading.Event()
+        self.addCleanup(fetched.set)
+        backend = StubBackend('ECB', timeout=0.01)
+        with patch.object(backend, 'get_rates_from_source', side_effect=fetched.wait):
+            results = update_rates_concurrently([backend])
+        assert str(results['ECB']) == "Error retrieving 'ECB' rates. Timed out"
+
+    def test_error(self):
+        results = update_rates_concurrently([StubBackend('ECB', '/missing'), StubBackend('OXR', '/oxr')])
+        assert isinstance(results['ECB'], TXRateBackendError)
+        assert results['OXR'] == 2
+        assert not Rate.objects.filter(source__name='ECB').exists()
+
+    def test_up_to_date(self):
+        RateSource.objects.create(name='ECB', base_currency='EUR')
+        assert update_rates_concurrently([StubBackend('ECB', '/missing')]) == {'ECB': 0}
+
+    def test_command(self):
+        out = StringIO()
+        call_command('update_rates', 'tests.test_backends.ECBBackend', 'tests.test_backends.OXRBackend', stdout=out)
+        assert max_concurrent(StubHandler.spans) == 2
+        assert 'Successfully updated rates for "ECB", 2 written' in out.getvalue()
+        assert 'Successfully updated rates for "OXR", 2 written' in out.getvalue()
+        assert len(self.rates('OXR')) == 2
+
+    def test_command_force(self):
+        call_command('update_rates', 'tests.test_backends.ECBBackend', stdout=StringIO())
+        Rate.objects.filter(currency='GBP').update(value=Decimal('0.7'))
+        out = StringIO()
+        call_command('update_rates', 'tests.test_backends.ECBBackend', '--force', stdout=out)
+        assert 'Successfully updated rates for "ECB", 1 written' in out.getvalue()
+        assert self.rates('ECB') == {'GBP': Decimal('0.8'), 'USD': Decimal('1.2')}
+
+    def test_command_errors(self):
+        with self.assertRaises(CommandError):
+            call_command('update_rates', 'tests.test_backends.MissingBackend', stdout=StringIO())
+
+
+class TestOpenExchangeBackend(StubServerMixin, TestCase):
+
+    def setUp(self):
+        StubHandler.requests = []
+        StubHandler.spans = []
+        StubHandler.failures = {}
+        caches['default'].clear()
+        self.txmoney = {
+            'DEFAULT_CURRENCY': 'EUR', 'OPENEXCHANGE_URL': self.url + '/latest.json', 'OPENEXCHANGE_APP_ID': 'test',
+            'OPENEXCHANGE_HISTORICAL_URL': self.url + '/historical/{date}.json', 'OPENEXCHANGE_BASE_CURRENCY': 'USD',
+            'RATES_HTTP_BACKOFF': 0
+        }
+        overrides = override_settings(TXMONEY=self.txmoney)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+    def test_rates(self):
+        rates = OpenExchangeBackend().get_rates_from_source()
+        assert rates == {'GBP': Decimal('0.7') / Decimal('0.8'), 'USD': Decimal(1) / Decimal('0.8')}
+
+    def test_keep_alive(self):
+        OpenExchangeBackend().get_rates_from_source()
+        OpenExchangeBackend().get_rates_from_source()
+        assert len(StubHandler.requests) == 2
+        assert StubHandler.requests[0][1] == StubHandler.requests[1][1]
+
+    def test_not_modified(self):
+        OpenExchangeBackend().update_rates()
+        assert Rate.objects.count() == 2
+        RateSource.objects.update(last_update='2017-01-01T00:00:00Z')
+
+        backend = OpenExchangeBackend()
+        assert backend.get_rates_from_source() == {}
+        assert StubHandler.requests[-1][2] == ETAG
+        backend.update_rates({})
+        assert Rate.objects.count() == 2
+        assert RateSource.objects.get().is_updated
+
+    def test_validators_saved_with_rates(self):
+        OpenExchangeBackend().get_rates_from_source()
+        # The rates were not stored, so they are downloaded again
+        assert OpenExchangeBackend().get_rates_from_source() != {}
+        assert StubHandler.requests[-1][2] is None
+
+    def test_retry(self):
+        StubHandler.failures['/latest.json'] = 2
+        assert OpenExchangeBackend().get_rates_from_source()
+        assert len(StubHandler.requests) == 3
+
+    def test_retries_exhausted(self):
+        StubHandler.failures['/latest.json'] = 10
+        with self.assertRaises(TXRateBackendError):
+            OpenExchangeBackend().get_rates_from_source()
+        assert len(StubHandler.requests) == 4
+
+    def test_session_settings(self):
+        StubHandler.failures['/latest.json'] = 10
+        with override_settings(TXMONEY=dict(self.txmoney, RATES_HTTP_RETRIES=1)):
+            with self.assertRaises(TXRateBackendError):
+                OpenExchangeBackend().get_rates_from_source()
+        assert len(StubHandler.requests) == 2
+        assert backends.get_session().adapters['https://'].max_retries.total == 3
+
+
+class TestBackfillRates(TestOpenExchangeBackend):
+
+    def setUp(self):
+        super(TestBackfillRates, self).setUp()
+        self.addCleanup(setattr, StubHandler, 'delay', 0)
+
+    def rates(self, rate_date):
+        return dict(Rate.objects.filter(date=rate_date).values_list('currency', 'value'))
+
+    def test_get_rates_for_date(self):
+        rates = OpenExchangeBackend().get_rates_for_date(date(2017, 1, 2))
+        assert rates == {'GBP': Decimal('0.72') / Decimal('0.8'), 'USD': Decimal(1) / Decimal('0.8')}
+        assert StubHandler.requests[-1][0] == '/historical/2017-01-02.json'
+
+    def test_backfill(self):
+        StubHandler.delay = 0.2
+        results = OpenExchangeBackend().backfill_rates(date(2017, 1, 1), date(2017, 1, 6), workers=3)
+        assert 1 < max_concurrent(StubHandler.spans) <= 3
+        assert results == dict((date(2017, 1, day), 2) for day in range(1, 7))
+        assert Rate.objects.count() == 12
+        assert self.rates(date(2017, 1, 3)) == {'GBP': Decimal('0.9125'), 'USD': Decimal('1.25')}
+        assert Rate.objects.get_for_date('GBP', date(2017, 1, 4)).value == Decimal('0.925')
+        # Backfilled days don't mark the source as updated today
+        assert OpenExchangeBackend().is_outdated()
+
+    def test_resume(self):
+        StubHandler.failures['/historical/2017-01-02.json'] = 10
+        results = OpenExchangeBackend().backfill_rates(date(2017, 1, 1), date(2017, 1, 3))
+        assert isinstance(results[date(2017, 1, 2)], TXRateBackendError)
+        assert results[date(2017, 1, 1)] == results[date(2017, 1, 3)] == 2
+
+        StubHandler.requests = []
+        StubHandler.failures = {}
+        results = OpenExchangeBackend().backfill_rates(date(2017, 1, 1), date(2017, 1, 3))
+        assert results == {date(2017, 1, 1): 0, date(2017, 1, 2): 2, date(2017, 1, 3): 0}
+        assert [request[0] for request in StubHandler.requests] == ['/historical/2017-01-02.json']
+
+    def test_force(self):
+        OpenExchangeBackend().backfill_rates(date(2017, 1, 1), date(2017, 1, 2))
+        Rate.objects.filter(date=date(2017, 1, 1), currency='GBP').update(value=1)
+        results = OpenExchangeBackend().backfill_rates(date(2017, 1, 1), date(2017, 1, 2), force=True)
+        assert results == {date(2017, 1, 1): 1, date(2017, 1, 2): 0}
+        assert self.rates(date(2017, 1, 1))['GBP'] == Decimal('0.8875')
+
+    def test_command(self):
+        out = StringIO()
+        call_command(
+            'update_rates', 'txmoney.rates.backends.OpenExchangeBackend', '--from', '2017-01-01', '--to', '2017-01-03',
+            '--workers', '2', stdout=out
+        )
+        assert 'Backfilled rates for "openexchangerates.org" from 2017-01-01 to 2017-01-03, 6 written' in \
+            out.getvalue()
+        assert Rate.objects.count() == 6
+
+    def test_command_errors(self):
+        StubHandler.failures['/historical/2017-01-02.json'] = 10
+        with self.assertRaises(CommandError) as context:
+            call_command(
+                'update_rates', 'txmoney.rates.backends.OpenExchangeBackend', '--from', '2017-01-01',
+                '--to', '2017-01-02', stdout=StringIO()
+            )
+        assert '2017-01-02' in str(context.exception)
+        assert Rate.objects.filter(date=date(2017, 1, 1)).count() == 2
+        with self.assertRaises(CommandError):
+            call_command('update_rates', 'tests.test_backends.ECBBackend', '--from', '2017-01-01', stdout=StringIO())
+        with self.assertRaises(CommandError):
+            call_command('update_rates', '--to', '2017-01-01', stdout=StringIO())
+
+
+class TestFileRateBackend(TestCase):
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, 'eurofxref-hist.csv')
+        with open(self.path, 'w') as f:
+            f.write('Date,USD,GBP,\n')
+            for day in range(31, 0, -1):
+                f.write('2017-01-%02d,1.%02d,0.8,\n' % (day, day))
+
+    def backend(self):
+        return FileRateBackend(self.path, 'ECB', 'EUR')
+
+    def test_settings(self):
+        with self.assertRaises(ImproperlyConfigured):
+            FileRateBackend()
+        txmoney = {'DEFAULT_CURRENCY': 'EUR', 'RATES_FILE_PATH': self.path, 'RATES_FILE_NAME': 'ECB'}
+        with override_settings(TXMONEY=txmoney):
+            assert FileRateBackend().source_name == 'ECB'
+
+    def test_get_rates(self):
+        backend = self.backend()
+        assert backend.get_rates_from_source() == {'USD': Decimal('1.31'), 'GBP': Decimal('0.8')}
+        assert backend.get_rates_for_date(date(2017, 1, 2)) == {'USD': Decimal('1.02'), 'GBP': Decimal('0.8')}
+        with self.assertRaises(TXRateBackendError):
+            backend.get_rates_for_date(date(2017, 2, 1))
+        assert backend.update_rates() == 2
+
+    def test_base_currency(self):
+        with override_settings(TXMONEY={'DEFAULT_CURRENCY': 'USD'}):
+            rates = self.backend().get_rates_for_date(date(2017, 1, 25))
+        assert rates == {'EUR': Decimal(1) / Decimal('1.25'), 'GBP': Decimal('0.8') / Decimal('1.25')}
+
+    def test_backfill(self):
+        with patch.object(backends, 'iter_file_rates', wraps=backends.iter_file_rates) as iter_file_rates:
+            results = self.backend().backfill_rates(date(2017, 1, 5), date(2017, 1, 24))
+        assert iter_file_rates.call_count == 1
+        assert results == dict((date(2017, 1, day), 2) for day in range(5, 25))
+        assert Rate.objects.count() == 40
+        assert Rate.objects.get_for_date('USD', date(2017, 1, 10)).value == Decimal('1.10')
+
+        results = self.backend().backfill_rates(date(2017, 1, 1), date(2017, 2, 1))
+        assert sum(results.values()) == 22
+        assert results[date(2017, 2, 1)] == 0
+
+    def test_errors(self):
+        with open(self.path, 'a') as f:
+            f.write('2016-12-31,x,0.8,\n')
+        with self.assertRaises(TXRateBackendError):
+            self.backend().backfill_rates(date(2016, 12, 1), date(2017, 1, 31))
+        # Dates read before the failing row's one are stored
+        assert Rate.objects.count() == 60
+
+    def test_changes_only(self):
+        with override_settings(TXMONEY={'DEFAULT_CURRENCY': 'EUR', 'RATES_CHANGES_ONLY': True}):
+            results = self.backend().backfill_rates(date(2017, 1, 1), date(2017, 1, 31))
+        assert sum(results.values()) == 62
+        assert Rate.objects.filter(currency='GBP').count() == 1
+        assert Rate.objects.filter(currency='USD').count() == 31
+        assert Rate.objects.get_for_date('GBP', date(2017, 1, 20)).value == Decimal('0.8')
+
+    def test_changes_only_resume(self):
+        with open(self.path, 'w') as f:
+            f.write('Date,USD,GBP,\n')
+            for day in range(3, 0, -1):
+                f.write('2017-01-%02d,1.1,0.8,\n' % day)
+        with override_settings(TXMONEY={'DEFAULT_CURRENCY': 'EUR', 'RATES_CHANGES_ONLY': True}):
+            self.backend().backfill_rates(date(2017, 1, 1), date(2017, 1, 3))
+            assert list(Rate.objects.values_list('date', flat=True).distinct()) == [date(2017, 1, 1)]
+
+            # Days whose rates were all compacted are not backfilled again
+            backend = self.backend()
+            with patch.object(backend, 'update_rates_for_date') as update_rates_for_date:
+                results = backend.backfill_rates(date(2017, 1, 1), date(2017, 1, 4))
+        assert update_rates_for_date.call_args_list == []
+        assert results == dict((date(2017, 1, day), 0) for day in range(1, 5))
+
+    def test_command(self):
+        out = StringIO()
+        txmoney = {'DEFAULT_CURRENCY': 'EUR', 'RATES_FILE_PATH': self.path, 'RATES_FILE_NAME': 'ECB'}
+        with override_settings(TXMONEY=txmoney):
+            call_command(
+                'update_rates', 'txmoney.rates.backends.FileRateBackend', '--from', '2017-01-01', '--to', '2017-01-31',
+                stdout=out
+            )
+        assert 'Backfilled rates for "ECB" from 2017-01-01 to 2017-01-31, 62 written' in out.getvalue()
@@ -0,0 +1,112 @@
+# coding=utf-8
+from __future__ import absolute_import, unicode_literals
+
+import gzip
+import io
+import os
+import shutil
+import tempfile
+from datetime import date
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+
+from txmoney.rates import files
+from txmoney.rates.files import (
+    iter_csv_rates, iter_file_rates, iter_json_rates, iter_xml_rates
+)
+
+try:
+    from mock import patch
+except ImportError:
+    from unittest.mock import patch
+
+JSON = '''{
+    "2017-01-02": {"USD": 1.0465, "GBP": 0.85168},
+    "2017-01-03": {"USD": 1.0389, "GBP": 0.8496}
+}'''
+
+XML = '''<?xml version="1.0" encoding="UTF-8"?>
+<gesmes:Envelope xmlns:gesmes="http://www.gesmes.org/xml/2002-08-01"
+                 xmlns="http://www.ecb.int/vocabulary/2002-08-01/eurofxref">
+    <gesmes:subject>Reference rates</gesmes:subject>
+    <Cube>
+        <Cube time="2017-01-03"><Cube currency="USD" rate="1.0389"/><Cube currency="GBP" rate="0.8496"/></Cube>
+        <Cube time="2017-01-02"><Cube currency="USD" rate="1.0465"/><Cube currency="GBP" rate="0.85168"/></Cube>
+    </Cube>
+</gesmes:Envelope>'''
+
+ROWS = [
+    (date(2017, 1, 2), 'USD', Decimal('1.0465')), (date(2017, 1, 2), 'GBP', Decimal('0.85168')),
+    (date(2017, 1, 3), 'USD', Decimal('1.0389')), (date(2017, 1, 3), 'GBP', Decimal('0.8496')),
+]
+
+
+class TestJSONRates(SimpleTestCase):
+
+    def test_dates(self):
+        assert sorted(iter_json_rates(io.StringIO(JSON))) == sorted(ROWS)
+
+    def test_time_series(self):
+        text = '{"base": "EUR", "start_date": "2017-01-02", "count": 2, "meta": {"a": [1, {"b": 2}]}, "rates": %s}'
+        assert sorted(iter_json_rates(io.StringIO(text % JSON))) == sorted(ROWS)
+
+    def test_small_reads(self):
+        # Values cut between reads
+        for size in (1, 2, 3, 7):
+            with patch.object(files, 'READ_SIZE', size):
+                assert sorted(iter_json_rates(io.StringIO('{"count": 12345, "rates": %s}' % JSON))) == sorted(ROWS)
+
+    def test_empty(self):
+        assert list(iter_json_rates(io.StringIO(' {} '))) == []
+
+    def test_errors(self):
+        errors = ('', '{"2017-01-02": {"USD": 1.0', '[1]', '{"2017-01-02": {"USD": 1} "x": 1}', '{"rates": {"x": {}}}')
+        for text in errors:
+            with self.assertRaises(ValueError):
+                list(iter_json_rates(io.StringIO(text)))
+
+
+class TestCSVRates(SimpleTestCase):
+
+    def test_columns(self):
+        text = 'date,currency,rate\n2017-01-02,USD,1.0465\n2017-01-02,GBP,0.85168\n\n' \
+               '2017-01-03,USD,1.0389\n2017-01-03,GBP,0.8496\n2017-01-03,JPY,N/A\n'
+        assert list(iter_csv_rates(io.StringIO(text))) == ROWS
+
+    def test_currency_columns(self):
+        text = 'Date,USD,GBP,JPY,\n2017-01-02,1.0465,0.85168,N/A,\n2017-01-03, 1.0389, 0.8496,,\n'
+        assert list(iter_csv_rates(io.StringIO(text))) == ROWS
+
+    def test_empty(self):
+        assert list(iter_csv_rates(io.StringIO(''))) == []
+
+
+class TestXMLRates(SimpleTestCase):
+
+    def test_ecb(self):
+        assert sorted(iter_xml_rates(io.BytesIO(XML.encode('utf-8')))) == sorted(ROWS)
+        assert list(iter_xml_rates(io.BytesIO(XML.encode('utf-8'))))[0] == (date(2017, 1, 3), 'USD', Decimal('1.0389'))
+
+
+class TestFileRates(SimpleTestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+
+    def write(self, name, text):
+        path = os.path.join(self.dir, name)
+        with (gzip.open(path, 'wb') if name.endswith('.gz') else io.open(path, 'wb')) as f:
+            f.write(text.encode('utf-8'))
+        return path
+
+    def test_formats(self):
+        for name, text in (('rates.json', JSON), ('rates.XML', XML), ('rates.xml.gz', XML), ('rates.json.gz', JSON)):
+            assert sorted(iter_file_rates(self.write(name, text))) == sorted(ROWS)
+        path = self.write('rates.csv.gz', 'Date,USD,GBP\n2017-01-02,1.0465,0.85168\n2017-01-03,1.0389,0.8496\n')
+        assert list(iter_file_rates(path)) == ROWS
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            list(iter_file_rates(self.write('rates.txt', JSON)))
@@ -0,0 +1,20 @@
+# coding=utf-8
+from __future__ import absolute_import, unicode_literals
+
+import subprocess
+import sys
+
+# Models with MoneyField defaults need the currencies, so use no apps
+SCRIPT = '''
+import django
+from django.conf import settings
+settings.configure(INSTALLED_APPS=['txmoney.rates'])
+django.setup()
+import txmoney.money.models
+from txmoney.money.models.money import CURRENCIES
+assert not CURRENCIES.loaded
+'''
+
+
+def test_currencies_not_loaded_on_import():
+    subprocess.check_call([sys.executable, '-c', SCRIPT])
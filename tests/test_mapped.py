@@ -0,0 +1,210 @@
+# coding=utf-8
+from __future__ import absolute_import, unicode_literals
+
+import os
+import shutil
+import tempfile
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils.six import StringIO
+
+from tests.utils import FakeBackend
+from txmoney.rates import mapped
+from txmoney.rates.backends import update_rates_concurrently
+from txmoney.rates.cache import rate_cache
+from txmoney.rates.mapped import (
+    MappedRates, RatesFile, mapped_rates, write_rates_file
+)
+from txmoney.rates.models import Rate, RateSource
+from txmoney.rates.utils import exchange_ratio
+
+try:
+    from mock import patch
+except ImportError:
+    from unittest.mock import patch
+
+
+class MappedRatesTestCase(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.path = os.path.join(self.directory, 'rates.bin')
+        self.ecb = RateSource.objects.create(name='ECB', base_currency='EUR')
+        self.oxr = RateSource.objects.create(name='OXR', base_currency='EUR')
+        Rate.objects.upsert(self.ecb, {'GBP': Decimal('0.8'), 'USD': Decimal('1.2')}, date(2017, 1, 2))
+        Rate.objects.upsert(self.ecb, {'GBP': Decimal('0.85')}, date(2017, 1, 4))
+        Rate.objects.upsert(self.oxr, {'GBP': Decimal('0.9'), 'JPY': Decimal('122.123456')}, date(2017, 1, 3))
+        rate_cache.clear()
+
+    def settings(self, **kwargs):
+        kwargs.update(DEFAULT_CURRENCY='EUR', RATES_MAPPED_FILE=self.path, RATES_MAPPED_CHECK_INTERVAL=0)
+        return override_settings(TXMONEY=kwargs)
+
+
+class TestRatesFile(MappedRatesTestCase):
+
+    def setUp(self):
+        super(TestRatesFile, self).setUp()
+        assert write_rates_file(self.path) == 5
+        self.rates = RatesFile(self.path)
+
+    def test_get(self):
+        assert len(self.rates) == 5
+        assert self.rates.sources == {'ECB': self.ecb.pk, 'OXR': self.oxr.pk}
+        assert self.rates.get('GBP', date(2017, 1, 2), self.ecb.pk) == (date(2017, 1, 2), Decimal('0.8'))
+        assert self.rates.get('GBP', date(2017, 1, 3), self.ecb.pk) == (date(2017, 1, 2), Decimal('0.8'))
+        assert self.rates.get('GBP', date(2017, 2, 1), self.ecb.pk) == (date(2017, 1, 4), Decimal('0.85'))
+        assert self.rates.get('JPY', date(2017, 1, 3), self.oxr.pk) == (date(2017, 1, 3), Decimal('122.123456'))
+        assert self.rates.get('GBP', date(2017, 1, 1), self.ecb.pk) is None
+        assert self.rates.get('JPY', date(2017, 1, 3), self.ecb.pk) is None
+        assert self.rates.get('AUD', date(2017, 1, 3), self.oxr.pk) is None
+
+    def test_same_as_get_for_date(self):
+        for day in range(5):
+            rate_date = date(2017, 1, 1) + timedelta(day)
+            for source in (self.ecb, self.oxr):
+                for currency in ('GBP', 'USD', 'JPY'):
+                    try:
+                        expected = Rate.objects.get_for_date(currency, rate_date, source).value
+                    except Rate.DoesNotExist:
+                        expected = None
+                    assert self.rates.get_value(currency, rate_date, source) == expected
+
+    def test_sources(self):
+        assert self.rates.get_value('GBP', date(2017, 1, 3), 'OXR') == Decimal('0.9')
+        assert self.rates.get_value('GBP', date(2017, 1, 3), self.ecb.pk) == Decimal('0.8')
+        assert self.rates.get_value('GBP', date(2017, 1, 3), 'Unknown') is None
+        assert self.rates.get_value('GBP', date(2017, 1, 3), sources=['ECB', 'OXR']) == Decimal('0.8')
+        assert self.rates.get_value('JPY', date(2017, 1, 3), sources=['ECB']) == Decimal('122.123456')
+        assert self.rates.get_value('JPY', date(2017, 1, 3), sources=['ECB'], fallback=False) is None
+        # The latest rate of any source
+        assert self.rates.get_value('GBP', date(2017, 1, 3), sources=[]) == Decimal('0.9')
+
+    def test_same_date_sources(self):
+        # Written after the ECB rate of the same date
+        Rate.objects.upsert(self.oxr, {'GBP': Decimal('0.5')}, date(2017, 1, 4))
+        write_rates_file(self.path)
+        rates = RatesFile(self.path)
+        expected = Rate.objects.get_for_sources('GBP', date(2017, 1, 5), sources=[]).value
+        assert rates.get_value('GBP', date(2017, 1, 5), sources=[]) == expected == Decimal('0.5')
+
+    def test_invalid_file(self):
+        with open(self.path, 'wb') as stream:
+            stream.write(b'rates' * 10)
+        with self.assertRaises(ValueError):
+            RatesFile(self.path)
+
+
+class TestMappedRates(MappedRatesTestCase):
+
+    def test_replace(self):
+        rates = MappedRates(self.path, 0)
+        assert rates.get_file() is None
+        write_rates_file(self.path)
+        first = rates.get_file()
+        assert rates.get_value('GBP', date(2017, 1, 5)) == Decimal('0.85')
+        assert rates.get_file() is first
+
+        Rate.objects.upsert(self.ecb, {'GBP': Decimal('0.7')}, date(2017, 1, 5))
+        write_rates_file(self.path)
+        assert rates.get_value('GBP', date(2017, 1, 5), self.ecb) == Decimal('0.7')
+        # The replaced file is still readable
+        assert first.get_value('GBP', date(2017, 1, 5), self.ecb) == Decimal('0.85')
+        assert os.listdir(self.directory) == ['rates.bin']
+
+    def test_check_interval(self):
+        rates = MappedRates(self.path, 60)
+        assert rates.get_file() is None
+        write_rates_file(self.path)
+        assert rates.get_file() is None
+
+    def test_exchange_ratio(self):
+        with self.settings(RATES_SOURCES=['ECB']):
+            write_rates_file(self.path)
+            with self.assertNumQueries(0):
+                assert exchange_ratio('EUR', 'GBP', date(2017, 1, 3)) == Decimal('0.8')
+                assert exchange_ratio('USD', 'JPY', date(2017, 1, 3)) == Decimal('122.123456') / Decimal('1.2')
+                assert exchange_ratio('EUR', 'GBP', date(2017, 1, 3), source=self.oxr) == Decimal('0.9')
+            # Rates missing from the file come from the database
+            Rate.objects.upsert(self.ecb, {'AUD': Decimal('1.4')}, date(2017, 1, 3))
+            assert exchange_ratio('EUR', 'AUD', date(2017, 1, 3)) == Decimal('1.4')
+        assert not mapped_rates.enabled
+
+    def test_missing_file(self):
+        with self.settings():
+            assert exchange_ratio('EUR', 'GBP', date(2017, 1, 3), source=self.ecb) == Decimal('0.8')
+
+    def test_update_rates(self):
+        with self.settings():
+            assert update_rates_concurrently([FakeBackend({'GBP': Decimal('0.75')})]) == {'Fake source': 1}
+            with self.assertNumQueries(0):
+                assert exchange_ratio('EUR', 'GBP', source='Fake source') == Decimal('0.75')
+            # A missing file is written even if no rates changed, an existing one only if they did
+            os.remove(self.path)
+            update_rates_concurrently([FakeBackend({'GBP': Decimal('0.75')})], force=True)
+            assert RatesFile(self.path).get_value('GBP', date.today(), 'Fake source') == Decimal('0.75')
+            mtime = os.stat(self.path).st_mtime
+            os.utime(self.path, (mtime - 10, mtime - 10))
+            update_rates_concurrently([FakeBackend({'GBP': Decimal('0.75')})], force=True)
+            assert os.stat(self.path).st_mtime == mtime - 10
+
+    def test_backfill_command(self):
+        with self.settings():
+            call_command(
+                'update_rates', 'tests.utils.FakeBackend', '--from', '2017-01-02', '--to', '2017-01-03',
+                stdout=StringIO()
+            )
+        assert RatesFile(self.path).get_value('GBP', date(2017, 1, 3), 'Fake source') == Decimal('0.75')
+
+
+class TestBackendUpdateRates(TransactionTestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.path = os.path.join(self.directory, 'rates.bin')
+
+    def test_update_rates(self):
+        with override_settings(TXMONEY={'DEFAULT_CURRENCY': 'EUR', 'RATES_MAPPED_FILE': self.path}):
+            FakeBackend({'GBP': Decimal('0.75')}).update_rates()
+            assert RatesFile(self.path).get_value('GBP', date.today(), 'Fake source') == Decimal('0.75')
+            FakeBackend({'GBP': Decimal('0.7')}).update_rates(force=True)
+            assert RatesFile(self.path).get_value('GBP', date.today(), 'Fake source') == Decimal('0.7')
+
+    def get_value(self, rate_date):
+        return RatesFile(self.path).get_value('GBP', rate_date, 'Fake source')
+
+    def test_rate_changes(self):
+        with override_settings(TXMONEY={'DEFAULT_CURRENCY': 'EUR', 'RATES_MAPPED_FILE': self.path}):
+            source = RateSource.objects.create(name='Fake source', base_currency='EUR')
+            rate = Rate.objects.create(source=source, currency='GBP', value=Decimal('0.8'))
+            assert self.get_value(date.today()) == Decimal('0.8')
+            rate.value = Decimal('0.9')
+            rate.save()
+            assert self.get_value(date.today()) == Decimal('0.9')
+            rate.delete()
+            assert self.get_value(date.today()) is None
+
+            Rate.objects.upsert(source, {'GBP': Decimal('0.8')}, date(2017, 1, 1))
+            Rate.objects.upsert(source, {'GBP': Decimal('0.8')}, date(2017, 1, 2))
+            assert self.get_value(date(2017, 1, 2)) == Decimal('0.8')
+            assert Rate.objects.compact(source) == 1
+            assert len(RatesFile(self.path)) == 1
+
+            # Only once committed
+            with transaction.atomic():
+                Rate.objects.upsert(source, {'GBP': Decimal('0.7')}, date(2017, 1, 3))
+                assert self.get_value(date(2017, 1, 3)) == Decimal('0.8')
+            assert self.get_value(date(2017, 1, 3)) == Decimal('0.7')
+
+    def test_backfill(self):
+        with override_settings(TXMONEY={'DEFAULT_CURRENCY': 'EUR', 'RATES_MAPPED_FILE': self.path}):
+            with patch.object(mapped, 'write_rates_file', wraps=write_rates_file) as write:
+                FakeBackend({'GBP': Decimal('0.75')}).backfill_rates(date(2017, 1, 1), date(2017, 1, 5))
+        assert write.call_count == 1
+        assert self.get_value(date(2017, 1, 5)) == Decimal('0.75')
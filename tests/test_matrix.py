@@ -0,0 +1,79 @@
+# coding=utf-8
+from __future__ import absolute_import, division, unicode_literals
+
+from decimal import Decimal
+
+import pytest
+from django.test import TestCase
+
+from txmoney.money.models import Money
+from txmoney.rates.models import Rate, RateSource
+
+np = pytest.importorskip('numpy')
+
+from txmoney.money.models.array import MoneyArray  # noqa: E402 isort:skip
+from txmoney.rates.matrix import CrossRateMatrix  # noqa: E402 isort:skip
+
+RATES = {'GBP': Decimal('0.8'), 'USD': Decimal('1.2'), 'JPY': Decimal('130')}
+
+
+class TestCrossRateMatrix(object):
+    """
+    Tests of the CrossRateMatrix class
+    """
+
+    def test_creation(self):
+        matrix = CrossRateMatrix(RATES, 'EUR')
+        assert len(matrix) == 4
+        assert matrix.currencies == ('EUR', 'GBP', 'JPY', 'USD')
+        assert matrix.matrix.shape == (4, 4)
+        assert 'GBP' in matrix
+        assert 'MXN' not in matrix
+
+    def test_ratio(self):
+        matrix = CrossRateMatrix(RATES, 'EUR')
+        assert matrix.ratio('GBP', 'USD') == Decimal('1.5')
+        assert matrix.ratio('USD', 'GBP') == Decimal('0.8') / Decimal('1.2')
+        assert matrix.ratio('EUR', 'JPY') == Decimal('130')
+        assert matrix.ratio('JPY', 'JPY') == Decimal(1)
+        for code_from in matrix.currencies:
+            for code_to in matrix.currencies:
+                ratio = matrix.ratio(code_from, code_to)
+                assert isinstance(ratio, Decimal)
+                assert ratio == dict(RATES, EUR=1)[code_to] / dict(RATES, EUR=1)[code_from]
+        with pytest.raises(Rate.DoesNotExist):
+            matrix.ratio('MXN', 'EUR')
+
+    def test_convert(self):
+        matrix = CrossRateMatrix(RATES, 'EUR')
+        assert list(matrix.convert(['10', 20], 'GBP', 'USD')) == [Decimal(15), Decimal(30)]
+        assert list(matrix.convert(['10', '1', '8'], ['GBP', 'EUR', 'GBP'], 'USD')) == [
+            Decimal(15), Decimal('1.2'), Decimal(12)
+        ]
+
+    def test_exchange(self):
+        matrix = CrossRateMatrix(RATES, 'EUR')
+        moneys = MoneyArray.from_moneys([Money(10, 'GBP'), Money(1, 'EUR')])
+        assert matrix.exchange(moneys, 'USD').to_moneys() == [Money(15, 'USD'), Money('1.2', 'USD')]
+
+    def test_update(self):
+        matrix = CrossRateMatrix(RATES, 'EUR')
+        assert matrix.update({'GBP': Decimal('0.6'), 'USD': Decimal('1.2'), 'MXN': Decimal('20')}) == {'GBP', 'MXN'}
+        rebuilt = CrossRateMatrix(dict(RATES, GBP=Decimal('0.6'), MXN=Decimal('20')), 'EUR')
+        assert len(matrix) == 5
+        for code_from in rebuilt.currencies:
+            for code_to in rebuilt.currencies:
+                assert matrix.ratio(code_from, code_to) == rebuilt.ratio(code_from, code_to)
+        assert matrix.update({'GBP': Decimal('0.6')}) == set()
+
+
+class TestCrossRateMatrixForDate(TestCase):
+
+    def test_for_date(self):
+        source = RateSource.objects.create(name='Test source', base_currency='EUR')
+        for code, value in RATES.items():
+            Rate.objects.create(source=source, currency=code, value=value)
+        with self.assertNumQueries(1):
+            matrix = CrossRateMatrix.for_date()
+        assert matrix.base_currency == 'EUR'
+        assert matrix.ratio('GBP', 'USD') == Decimal('1.5')
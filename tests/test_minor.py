@@ -0,0 +1,183 @@
+# coding=utf-8
+from __future__ import absolute_import, division, unicode_literals
+
+import pickle
+from decimal import ROUND_05UP, ROUND_DOWN, ROUND_HALF_EVEN, Decimal
+from fractions import Fraction
+
+import pytest
+from django.test import override_settings
+
+from txmoney.money.exceptions import CurrencyMismatch, IncorrectMoneyInputError
+from txmoney.money.models import Currency, MinorUnitMoney, Money
+from txmoney.money.models.minor import _div_round
+from txmoney.money.models.money import ROUNDING_MODES
+from txmoney.settings import txmoney_settings as settings
+
+
+class TestMinorUnitMoney(object):
+    """
+    Tests of the MinorUnitMoney class
+    """
+
+    MINOR_CREATION = [
+        (MinorUnitMoney(1050, 'EUR'), 1050, Decimal('10.50'), 'EUR'),
+        (MinorUnitMoney(-1050, 'EUR'), -1050, Decimal('-10.50'), 'EUR'),
+        (MinorUnitMoney(1050, 'JPY'), 1050, Decimal('1050'), 'JPY'),
+        (MinorUnitMoney(1050, 'BHD'), 1050, Decimal('1.050'), 'BHD'),
+        (MinorUnitMoney(1050, Currency.get_by_code('EUR')), 1050, Decimal('10.50'), 'EUR'),
+        (MinorUnitMoney(1050), 1050, Decimal('10.50'), settings.DEFAULT_CURRENCY),
+        (MinorUnitMoney(currency='EUR'), 0, Decimal('0'), 'EUR'),
+    ]
+
+    @pytest.mark.parametrize('value,units,amount,currency', MINOR_CREATION)
+    def test_creation(self, value, units, amount, currency):
+        assert value.units == units
+        assert value.amount == amount
+        assert value.currency.code == currency
+
+    @pytest.mark.parametrize('units', ['10', Decimal('10'), 10.0, True])
+    def test_invalid_creation(self, units):
+        with pytest.raises(IncorrectMoneyInputError):
+            MinorUnitMoney(units, 'EUR')
+
+    def test_immutable(self):
+        value = MinorUnitMoney(1050, 'EUR')
+        with pytest.raises(AttributeError):
+            value._units = 1
+        with pytest.raises(AttributeError):
+            value.units = 1
+
+    def test_pickle(self):
+        value = MinorUnitMoney(1050, 'EUR')
+        assert pickle.loads(pickle.dumps(value)) == value
+
+    def test_str(self):
+        assert str(MinorUnitMoney(-1050, 'EUR')) == '-10.50 EUR'
+        assert repr(MinorUnitMoney(1050, 'JPY')) == '1050 JPY'
+
+    MONEY_CONVERSION = [
+        (Money('10.50', 'EUR'), 1050),
+        (Money('10.5', 'EUR'), 1050),
+        (Money('-0.01', 'EUR'), -1),
+        (Money('10.5000', 'EUR'), 1050),
+        (Money('1050', 'JPY'), 1050),
+        (Money('1.05', 'BHD'), 1050),
+        (Money('123456789012345678.91', 'EUR'), 12345678901234567891),
+    ]
+
+    @pytest.mark.parametrize('money,units', MONEY_CONVERSION)
+    def test_money_conversion(self, money, units):
+        value = MinorUnitMoney.from_money(money)
+        assert value.units == units
+        assert value.currency is money.currency
+        assert value.to_money() == money
+
+    @pytest.mark.parametrize('money', [Money('10.505', 'EUR'), Money('0.5', 'JPY')])
+    def test_lossy_money_conversion(self, money):
+        with pytest.raises(IncorrectMoneyInputError):
+            MinorUnitMoney.from_money(money)
+
+    MINOR_ARITHMETIC = [
+        (lambda: MinorUnitMoney(100, 'EUR') + MinorUnitMoney(50, 'EUR'), MinorUnitMoney(150, 'EUR')),
+        (lambda: MinorUnitMoney(100, 'EUR') - MinorUnitMoney(150, 'EUR'), MinorUnitMoney(-50, 'EUR')),
+        (lambda: MinorUnitMoney(100, 'EUR') * 3, MinorUnitMoney(300, 'EUR')),
+        (lambda: 3 * MinorUnitMoney(100, 'EUR'), MinorUnitMoney(300, 'EUR')),
+        (lambda: -MinorUnitMoney(100, 'EUR'), MinorUnitMoney(-100, 'EUR')),
+        (lambda: +MinorUnitMoney(100, 'EUR'), MinorUnitMoney(100, 'EUR')),
+        (lambda: abs(MinorUnitMoney(-100, 'EUR')), MinorUnitMoney(100, 'EUR')),
+        (lambda: sum([MinorUnitMoney(100, 'EUR'), MinorUnitMoney(1, 'EUR')]), MinorUnitMoney(101, 'EUR')),
+    ]
+
+    @pytest.mark.parametrize('value,expected', MINOR_ARITHMETIC)
+    def test_arithmetic(self, value, expected):
+        assert value() == expected
+
+    MINOR_ARITHMETIC_UNSUPPORTED = [
+        (lambda: MinorUnitMoney(100, 'EUR') + 1),
+        (lambda: MinorUnitMoney(100, 'EUR') - Decimal(1)),
+        (lambda: MinorUnitMoney(100, 'EUR') + Money(1, 'EUR')),
+        (lambda: MinorUnitMoney(100, 'EUR') * Decimal('1.5')),
+        (lambda: MinorUnitMoney(100, 'EUR') * MinorUnitMoney(100, 'EUR')),
+        (lambda: MinorUnitMoney(100, 'EUR') / 2),
+        (lambda: MinorUnitMoney(100, 'EUR') // 2),
+        (lambda: MinorUnitMoney(100, 'EUR') < 100),
+    ]
+
+    @pytest.mark.parametrize('value', MINOR_ARITHMETIC_UNSUPPORTED)
+    def test_invalid_arithmetic(self, value):
+        with pytest.raises(TypeError):
+            value()
+
+    def test_invalid_currency(self):
+        with pytest.raises(CurrencyMismatch):
+            MinorUnitMoney(100, 'EUR') + MinorUnitMoney(100, 'USD')
+        with pytest.raises(CurrencyMismatch):
+            MinorUnitMoney(100, 'EUR') < MinorUnitMoney(100, 'USD')
+
+    MINOR_EQUALITY = [
+        (MinorUnitMoney(100, 'EUR') == MinorUnitMoney(100, 'EUR'), True),
+        (MinorUnitMoney(100, 'EUR') == MinorUnitMoney(100, 'USD'), False),
+        (MinorUnitMoney(100, 'EUR') != MinorUnitMoney(100, 'USD'), True),
+        (MinorUnitMoney(0, 'EUR') == 0, True),
+        (MinorUnitMoney(100, 'EUR') == 100, False),
+        (MinorUnitMoney(100, 'EUR') < MinorUnitMoney(101, 'EUR'), True),
+        (MinorUnitMoney(100, 'EUR') <= MinorUnitMoney(100, 'EUR'), True),
+        (MinorUnitMoney(100, 'EUR') > MinorUnitMoney(101, 'EUR'), False),
+        (MinorUnitMoney(100, 'EUR') >= MinorUnitMoney(101, 'EUR'), False),
+        (bool(MinorUnitMoney(0, 'EUR')), False),
+        (bool(MinorUnitMoney(-1, 'EUR')), True),
+    ]
+
+    @pytest.mark.parametrize('value,expected', MINOR_EQUALITY)
+    def test_equality(self, value, expected):
+        assert value == expected
+
+    def test_hash(self):
+        assert hash(MinorUnitMoney(100, 'EUR')) == hash(MinorUnitMoney(100, 'EUR'))
+        assert hash(MinorUnitMoney(0, 'EUR')) == hash(0)
+        assert len({MinorUnitMoney(100, 'EUR'), MinorUnitMoney(100, 'EUR'), MinorUnitMoney(100, 'USD')}) == 2
+
+    MINOR_ROUNDING = [
+        (MinorUnitMoney(1050, 'EUR'), 0, 1100),
+        (MinorUnitMoney(1049, 'EUR'), 0, 1000),
+        (MinorUnitMoney(-1050, 'EUR'), 0, -1100),
+        (MinorUnitMoney(-1049, 'EUR'), 0, -1000),
+        (MinorUnitMoney(1055, 'EUR'), 1, 1060),
+        (MinorUnitMoney(1055, 'EUR'), None, 1055),
+        (MinorUnitMoney(1055, 'EUR'), 4, 1055),
+    ]
+
+    @pytest.mark.parametrize('value,n,units', MINOR_ROUNDING)
+    def test_round(self, value, n, units):
+        assert value.round(n).units == units
+
+    @pytest.mark.parametrize('rounding', ROUNDING_MODES)
+    def test_div_round(self, rounding):
+        for numerator in range(-260, 261, 7):
+            expected = Decimal(numerator).scaleb(-2).quantize(Decimal(1), rounding=rounding)
+            assert _div_round(numerator, 100, rounding) == expected
+
+    def test_round_currency_rounding(self):
+        value = MinorUnitMoney(1025, 'EUR')
+        with override_settings(TXMONEY={'DEFAULT_CURRENCY': 'EUR', 'CURRENCY_ROUNDING': {'EUR': ROUND_HALF_EVEN}}):
+            assert value.round(1).units == 1020
+            assert value.round(1).to_money() == value.to_money().round(1)
+        with override_settings(TXMONEY={'DEFAULT_CURRENCY': 'EUR', 'DEFAULT_ROUNDING': ROUND_DOWN}):
+            assert MinorUnitMoney(-1029, 'EUR').round(1).units == -1020
+        assert MinorUnitMoney(1005, Currency('XXX', rounding=ROUND_05UP)).round(1).units == 1010
+        assert value.round(1).units == 1030
+
+    MINOR_ALLOCATION = [
+        (MinorUnitMoney(100, 'EUR'), [1, 1, 1], [34, 33, 33]),
+        (MinorUnitMoney(100, 'EUR'), [1, 2], [33, 67]),
+        (MinorUnitMoney(5, 'EUR'), [1, 1], [3, 2]),
+        (MinorUnitMoney(-5, 'EUR'), [1, 1], [-3, -2]),
+        (MinorUnitMoney(100, 'EUR'), [Decimal('0.5'), Fraction(1, 2)], [50, 50]),
+    ]
+
+    @pytest.mark.parametrize('value,ratios,expected', MINOR_ALLOCATION)
+    def test_allocate(self, value, ratios, expected):
+        result = value.allocate(ratios)
+        assert [share.units for share in result] == expected
+        assert sum(result) == value
@@ -1,14 +1,22 @@
 # coding=utf-8
 from __future__ import absolute_import, division, unicode_literals
 
-from decimal import Decimal
+import copy
+import pickle
+from decimal import ROUND_DOWN, ROUND_HALF_EVEN, ROUND_HALF_UP, Decimal
 
 import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.test import override_settings
+from django.utils import six
 
 from txmoney.money.exceptions import (
     CurrencyDoesNotExist, CurrencyMismatch, IncorrectMoneyInputError
 )
-from txmoney.money.models.money import CURRENCIES, Currency, Money
+from txmoney.money.models.money import (
+    CURRENCIES, Currency, CurrencyRegistry, Money, register_currency,
+    round_many
+)
 from txmoney.settings import txmoney_settings as settings
 
 
@@ -69,6 +77,115 @@ class TestCurrency(object):
     def test_all(self):
         assert isinstance(Currency.all(), dict)
 
+    def test_get_by_numeric(self):
+        assert Currency.get_by_numeric('978') is Currency.get_by_code('EUR')
+        assert Currency.get_by_numeric(978) is Currency.get_by_code('EUR')
+        assert Currency.get_by_numeric('36') is Currency.get_by_code('AUD')
+        with pytest.raises(CurrencyDoesNotExist):
+            Currency.get_by_numeric('1')
+        with pytest.raises(CurrencyDoesNotExist):
+            Currency.get_by_numeric('foo')
+
+    def test_get_by_country(self):
+        assert Currency.get_by_code('EUR') in Currency.get_by_country('spain')
+        assert Currency.get_by_country('SPAIN') == Currency.get_by_country('Spain')
+        assert Currency.get_by_country('Atlantis') == ()
+
+    def test_register_currency(self):
+        currency = Currency('XTS', '963', 'Testing', 'T', 2, ['Atlantis'])
+        register_currency(currency)
+        try:
+            assert Currency.get_by_code('xts') is currency
+            assert Currency.get_by_numeric(963) is currency
+            assert Currency.get_by_country('atlantis') == (currency,)
+            assert Money(1, 'XTS').currency is currency
+            with pytest.raises(ValueError):
+                register_currency(Currency('XTS'))
+            replacement = Currency('XTS', '963', 'Testing', 'T', 4)
+            register_currency(replacement, replace=True)
+            assert Currency.get_by_code('XTS') is replacement
+        finally:
+            CURRENCIES._by_code.pop('XTS')
+            CURRENCIES._by_numeric.pop('963', None)
+            CURRENCIES._by_country.pop('ATLANTIS', None)
+
+    def test_registry_replace(self):
+        registry = CurrencyRegistry(lambda: {'XTS': Currency('XTS', '963', countries=['Atlantis', 'Spain'])})
+        replacement = registry.register(Currency('XTS', '964', countries=['Atlantis']), replace=True)
+        assert registry.get_by_code('XTS') is replacement
+        assert registry.get_by_numeric('964') is replacement
+        with pytest.raises(CurrencyDoesNotExist):
+            registry.get_by_numeric('963')
+        assert registry.get_by_country('Atlantis') == (replacement,)
+        assert registry.get_by_country('Spain') == ()
+
+    def test_registry_lazy(self):
+        registry = CurrencyRegistry(lambda: {'EUR': Currency('EUR', '978', countries=['Spain'])})
+        assert not registry.loaded
+        assert 'EUR' in registry
+        assert registry.loaded
+        assert len(registry) == 1
+        assert registry.get_by_code('eur') is registry['EUR']
+
+    def test_rounding_plan(self):
+        currency = Currency.get_by_code('EUR')
+        assert currency.exponent == Decimal('0.01')
+        assert currency.scale == 100
+        assert currency.rounding == ROUND_HALF_UP
+        assert Currency.get_by_code('JPY').exponent == Decimal('1')
+        assert Currency('XXX', decimals=3, rounding=ROUND_DOWN).rounding == ROUND_DOWN
+
+    def test_quantize(self):
+        assert Currency.get_by_code('EUR').quantize(Decimal('10.225')) == Decimal('10.23')
+        assert Currency('XXX', decimals=1, rounding=ROUND_DOWN).quantize(Decimal('10.29')) == Decimal('10.2')
+
+    def test_rounding_settings(self):
+        money = Money('10.225', 'EUR')
+        with override_settings(TXMONEY={'DEFAULT_CURRENCY': 'EUR', 'CURRENCY_ROUNDING': {'EUR': ROUND_HALF_EVEN}}):
+            assert Currency.get_by_code('EUR').rounding == ROUND_HALF_EVEN
+            assert money.amount_rounded == Decimal('10.22')
+            assert Money('10.225', 'USD').amount_rounded == Decimal('10.23')
+        with override_settings(TXMONEY={'DEFAULT_CURRENCY': 'EUR', 'DEFAULT_ROUNDING': ROUND_DOWN}):
+            assert money.round() == Money('10.22', 'EUR')
+        assert money.amount_rounded == Decimal('10.23')
+
+    def test_hash(self):
+        assert hash(Currency.get_by_code('EUR')) == hash('EUR')
+        assert hash(Currency('XXX', 999)) == hash(Currency('XXX', 999))
+        assert {Currency.get_by_code('EUR'): 1}['EUR'] == 1
+
+    def test_invalid_rounding(self):
+        with pytest.raises(ImproperlyConfigured):
+            Currency('XXX', rounding='ROUND_WHATEVER')
+
+    def test_get_by_code_singleton(self):
+        assert Currency.get_by_code('eur') is Currency.get_by_code('EUR')
+        assert Currency.get_by_code('EUR') is Money(1, 'EUR').currency
+
+    def test_immutable(self):
+        currency = Currency.get_by_code('EUR')
+        with pytest.raises(AttributeError):
+            currency.decimals = 3
+        with pytest.raises(AttributeError):
+            del currency.code
+        with pytest.raises(AttributeError):
+            currency.foo = 'bar'
+
+    def test_copy(self):
+        currency = Currency.get_by_code('EUR')
+        assert copy.copy(currency) is currency
+        assert copy.deepcopy(currency) is currency
+
+    def test_pickle(self):
+        currency = Currency.get_by_code('EUR')
+        assert pickle.loads(pickle.dumps(currency)) is currency
+
+        custom = Currency('XXX', 999, 'Test', 'X', 3, ['España'])
+        unpickled = pickle.loads(pickle.dumps(custom))
+        assert unpickled == custom
+        assert unpickled.decimals == 3
+        assert unpickled.countries == ('España',)
+
 
 class TestMoney(object):
     """
@@ -118,6 +235,33 @@ class TestMoney(object):
         with pytest.raises(IncorrectMoneyInputError):
             value()
 
+    def test_make(self):
+        currency = Currency.get_by_code('EUR')
+        value = Money._make(Decimal('10.50'), currency)
+        assert isinstance(value, Money)
+        assert value == Money('10.50', 'EUR')
+        assert value.currency is currency
+
+    OPERATION_RESULT_TYPES = [
+        (lambda m: +m),
+        (lambda m: -m),
+        (lambda m: abs(m)),
+        (lambda m: m + m),
+        (lambda m: m - 1),
+        (lambda m: m * 2),
+        (lambda m: m / 2),
+        (lambda m: m.round()),
+        (lambda m: m.allocate([1, 1])[0]),
+    ]
+
+    @pytest.mark.parametrize('operation', OPERATION_RESULT_TYPES)
+    def test_operation_results(self, operation):
+        money = Money('10.50', 'EUR')
+        result = operation(money)
+        assert isinstance(result, Money)
+        assert isinstance(result.amount, Decimal)
+        assert result.currency is money.currency
+
     def test_amount_attribute(self):
         value = Money(101, 'USD')
         assert value.amount == 101
@@ -139,6 +283,27 @@ class TestMoney(object):
     def test_amount_rounded_attribute(self, value, expected):
         assert value.amount_rounded == expected
 
+    MONEY_ROUND_PLAN = [
+        (Money('10.225', 'EUR'), None, Money('10.23', 'EUR')),
+        (Money('10.225', 'EUR'), 1, Money('10.2', 'EUR')),
+        (Money('10.5', 'EUR'), 0, Money('11', 'EUR')),
+        (Money('10.5', 'JPY'), None, Money('11', 'JPY')),
+    ]
+
+    @pytest.mark.parametrize('value,n,expected', MONEY_ROUND_PLAN)
+    def test_round_plan(self, value, n, expected):
+        result = value.round(n)
+        assert result == expected
+        assert result.amount.as_tuple().exponent == expected.amount.as_tuple().exponent
+
+    def test_round_many(self):
+        moneys = [Money('10.225', 'EUR'), Money('10.5', 'JPY')]
+        assert round_many(moneys) == [Money('10.23', 'EUR'), Money('11', 'JPY')]
+        assert round_many([Decimal('10.225'), Decimal('1')], 'EUR') == [Decimal('10.23'), Decimal('1.00')]
+        assert round_many([Money('10.225', 'EUR'), Decimal('1.5')], 'JPY') == [Money('10.23', 'EUR'), Decimal('2')]
+        with pytest.raises(ValueError):
+            round_many([Decimal('1')])
+
     def test_mutation_of_amount_rounded_attribute(self):
         money = Money('2', 'EUR')
         with pytest.raises(AttributeError):
@@ -153,6 +318,50 @@ class TestMoney(object):
         with pytest.raises(AttributeError):
             money.currency = 'USD'
 
+    def test_mutation_of_internal_attributes(self):
+        money = Money('2', 'EUR')
+        with pytest.raises(AttributeError):
+            money._amount = Decimal(1)
+        with pytest.raises(AttributeError):
+            del money._currency
+        with pytest.raises(AttributeError):
+            money.foo = 'bar'
+
+    def test_no_instance_dict(self):
+        assert not hasattr(Money('2', 'EUR'), '__dict__')
+        assert not hasattr(Currency.get_by_code('EUR'), '__dict__')
+
+    def test_copy(self):
+        money = Money('2', 'EUR')
+        assert copy.copy(money) is money
+        assert copy.deepcopy(money) is money
+
+    def test_pickle(self):
+        money = Money('2.50', 'EUR')
+        unpickled = pickle.loads(pickle.dumps(money))
+        assert unpickled == money
+        assert unpickled.currency is money.currency
+
+    def test_pickle_after_str(self):
+        money = Money('2.50', 'EUR')
+        str(money)
+        unpickled = pickle.loads(pickle.dumps(money))
+        assert unpickled == money
+        assert str(unpickled) == '2.50 EUR'
+
+    def test_hash(self):
+        assert hash(Money('2.50', 'EUR')) == hash(Money('2.5', 'EUR'))
+        assert hash(Money(0, 'EUR')) == hash(0) == hash(Money('0.00', 'USD'))
+        assert len({Money('2.50', 'EUR'), Money('2.5', 'EUR'), Money('2.5', 'USD')}) == 2
+        assert {Money(0, 'EUR'): 'zero'}[0] == 'zero'
+
+    def test_cached_str(self):
+        money = Money('2.50', 'EUR')
+        assert six.text_type(money) is six.text_type(money)
+        assert repr(money) == '2.50 EUR'
+        with pytest.raises(AttributeError):
+            money._str = 'foo'
+
     MONEY_STRINGS = [
         # Default currency:
         (Money(' 123'), '123 {}'.format(settings.DEFAULT_CURRENCY),),
@@ -406,6 +615,29 @@ class TestMoney(object):
         assert value.currency == settings.DEFAULT_CURRENCY
         assert value.currency == CURRENCIES[settings.DEFAULT_CURRENCY]
 
+    def test_parse_many(self):
+        values = Money.parse_many(['100.0 GBP', ' -1.5eur ', '100.35', '+.5 JPY', '1e3 USD'])
+        assert values == [
+            Money('100.0', 'GBP'), Money('-1.5', 'EUR'), Money('100.35', settings.DEFAULT_CURRENCY),
+            Money('0.5', 'JPY'), Money('1000', 'USD'),
+        ]
+        assert values[1].currency is CURRENCIES['EUR']
+        assert Money.parse_many(iter(['1', '2']), default_currency='JPY') == [Money(1, 'JPY'), Money(2, 'JPY')]
+        assert Money.parse_many([]) == []
+
+    @pytest.mark.parametrize('value', ['', 'EUR', '1.2.3 EUR', '1 EURO', '1 YYY', 'Infinity EUR', None, 1])
+    def test_parse_many_errors(self, value):
+        with pytest.raises(IncorrectMoneyInputError):
+            Money.parse_many(['1 EUR', value])
+        assert Money.parse_many(['1 EUR', value], errors='coerce') == [Money(1, 'EUR'), None]
+        assert Money.parse_many(['1 EUR', value], errors='skip') == [Money(1, 'EUR')]
+
+    def test_parse_many_invalid_errors(self):
+        with pytest.raises(ValueError):
+            Money.parse_many(['1 EUR'], errors='ignore')
+        with pytest.raises(ValueError):
+            Money.parse_many(['1 EUR'], errors='coerce', as_array=True)
+
     MONEY_ROUND = [
         (lambda: Money('123.001', 'EUR').round(), Money('123', 'EUR')),
         (lambda: Money('123.005', 'EUR').round(), Money('123.01', 'EUR')),
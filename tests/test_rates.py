@@ -1,12 +1,33 @@
 # coding=utf-8
 from __future__ import absolute_import, unicode_literals
 
-from datetime import datetime, timedelta
+import pickle
+import random
+import shutil
+import tempfile
+import threading
+import time
+from datetime import date, datetime, timedelta
 from decimal import Decimal
+from importlib import import_module
 
-from django.test import TestCase
+from django.apps import apps
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from django.utils.six import StringIO
 
-from txmoney.rates.models import Rate, RateSource
+from tests.utils import FakeBackend
+from txmoney.money.models import Money
+from txmoney.rates.cache import RateCache, rate_cache
+from txmoney.rates.models import (
+    LatestRate, Rate, RateSeries, RateSnapshot, RateSource
+)
+from txmoney.rates.signals import rates_updated
+from txmoney.rates.store import RateStore, rate_store
+from txmoney.rates.utils import exchange_many, exchange_ratio, exchange_series
 
 try:
     from mock import patch
@@ -23,9 +44,19 @@ class TestRateSource(TestCase):
         self.assertTrue(self.rs.is_updated)
 
     def test_not_is_updated(self):
-        with patch.object(self.rs, 'last_update', return_value=datetime.now() - timedelta(1)):
+        with patch.object(self.rs, 'last_update', timezone.now() - timedelta(1)):
             return self.assertFalse(self.rs.is_updated)
 
+    def test_is_updated_local_date(self):
+        for time_zone in ('Pacific/Kiritimati', 'Etc/GMT+12'):
+            with override_settings(TIME_ZONE=time_zone):
+                today = date.today()
+                midnight = timezone.make_aware(datetime(today.year, today.month, today.day))
+                for last_update, updated in ((midnight + timedelta(minutes=1), True),
+                                             (midnight - timedelta(minutes=1), False)):
+                    RateSource.objects.filter(pk=self.rs.pk).update(last_update=last_update)
+                    assert RateSource.objects.get(pk=self.rs.pk).is_updated is updated
+
 
 class TestRate(TestCase):
 
@@ -33,3 +64,707 @@ class TestRate(TestCase):
         rs = RateSource.objects.create(name='Test source')
         self.c1 = Rate.objects.create(source=rs, currency='GBP', value=Decimal('1.1176'))
         self.c2 = Rate.objects.create(source=rs, currency='MXN', value=Decimal('0.054069'))
+
+
+class TestRateCache(TestCase):
+
+    def test_hits_and_misses(self):
+        cache = RateCache(timeout=60, max_size=10)
+        assert cache.get('a', lambda: 1) == 1
+        assert cache.get('a', lambda: 2) == 1
+        assert cache.info() == (1, 1, 10, 1)
+        cache.clear()
+        assert cache.get('a', lambda: 2) == 2
+
+    def test_timeout(self):
+        cache = RateCache(timeout=0.01, max_size=10)
+        cache.get('a', lambda: 1)
+        time.sleep(0.02)
+        assert cache.get('a', lambda: 2) == 2
+        assert cache.misses == 2
+
+    def test_disabled(self):
+        cache = RateCache(timeout=0)
+        cache.get('a', lambda: 1)
+        assert cache.get('a', lambda: 2) == 2
+        assert cache.info().currsize == 0
+
+    def test_max_size(self):
+        cache = RateCache(timeout=60, max_size=2)
+        cache.get('a', lambda: 1)
+        cache.get('b', lambda: 2)
+        cache.get('a', lambda: 1)
+        cache.get('c', lambda: 3)
+        assert cache.get('a', lambda: 4) == 1
+        assert cache.get('b', lambda: 5) == 5
+
+    def test_errors_not_cached(self):
+        cache = RateCache(timeout=60)
+
+        def fail():
+            raise Rate.DoesNotExist()
+
+        with self.assertRaises(Rate.DoesNotExist):
+            cache.get('a', fail)
+        assert cache.get('a', lambda: 1) == 1
+
+    def test_single_flight(self):
+        cache = RateCache(timeout=60)
+        started = threading.Event()
+        calls = []
+
+        def slow_loader():
+            calls.append(1)
+            started.set()
+            time.sleep(0.05)
+            return 1
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get('a', slow_loader))) for _ in range(5)]
+        threads[0].start()
+        started.wait()
+        for thread in threads[1:]:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert results == [1] * 5
+        assert len(calls) == 1
+        assert cache.info()[:2] == (4, 1)
+
+
+class TestExchangeRatio(TestCase):
+
+    def setUp(self):
+        self.source = RateSource.objects.create(name='Test source', base_currency='EUR')
+        Rate.objects.create(source=self.source, currency='GBP', value=Decimal('0.8'))
+        Rate.objects.create(source=self.source, currency='USD', value=Decimal('1.2'))
+        rate_cache.clear()
+
+    def test_cached(self):
+        with self.assertNumQueries(2):
+            assert exchange_ratio('GBP', 'USD') == Decimal('1.5')
+        with self.assertNumQueries(0):
+            assert exchange_ratio('GBP', 'USD') == Decimal('1.5')
+            assert exchange_ratio('USD', 'GBP', date.today()) == Decimal('0.8') / Decimal('1.2')
+
+    def test_invalidated_on_save(self):
+        exchange_ratio('EUR', 'GBP')
+        Rate.objects.filter(currency='GBP').delete()
+        Rate.objects.create(source=self.source, currency='GBP', value=Decimal('0.9'))
+        assert exchange_ratio('EUR', 'GBP') == Decimal('0.9')
+
+    def test_invalidated_on_update_rates(self):
+        exchange_ratio('EUR', 'GBP')
+        Rate.objects.filter(currency='GBP').update(date=date.today() - timedelta(1))
+        FakeBackend({'GBP': Decimal('0.7')}).update_rates()
+        assert exchange_ratio('EUR', 'GBP') == Decimal('0.7')
+
+    def test_update_rates_without_on_commit(self):
+        # Django 1.8 has no transaction.on_commit
+        exchange_ratio('EUR', 'GBP')
+        Rate.objects.filter(currency='GBP').update(date=date.today() - timedelta(1))
+        with patch('txmoney.compat.VERSION', (1, 8, 19)), patch('django.db.transaction.on_commit', None):
+            assert FakeBackend({'GBP': Decimal('0.7')}).update_rates() == 1
+        assert exchange_ratio('EUR', 'GBP') == Decimal('0.7')
+
+    def test_exchange_many(self):
+        moneys = [Money(10, 'GBP'), Money(12, 'USD'), Money(1, 'EUR'), Money(20, 'GBP')]
+        with self.assertNumQueries(1):
+            result = exchange_many(moneys, 'USD')
+        assert result == [Money(15, 'USD'), Money(12, 'USD'), Money('1.2', 'USD'), Money(30, 'USD')]
+        assert [money.exchange_to('USD') for money in moneys] == result
+        with self.assertNumQueries(0):
+            assert exchange_many([], 'USD') == []
+            assert exchange_many([Money(1, 'EUR')], 'EUR') == [Money(1, 'EUR')]
+        with self.assertRaises(Rate.DoesNotExist):
+            exchange_many(moneys, 'JPY')
+
+    def test_exchange_to_today(self):
+        tomorrow = date.today() + timedelta(1)
+
+        class Tomorrow(date):
+            @classmethod
+            def today(cls):
+                return tomorrow
+
+        # The default date is the one of the call, not of the import
+        with patch('txmoney.money.models.money.date', Tomorrow):
+            with patch('txmoney.money.models.money.exchange_ratio', return_value=Decimal(2)) as ratio:
+                assert Money(10, 'EUR').exchange_to('GBP') == Money(20, 'GBP')
+        assert ratio.call_args[0][2] == tomorrow
+
+    def test_disabled(self):
+        with override_settings(TXMONEY={'DEFAULT_CURRENCY': 'EUR', 'RATES_CACHE_TIMEOUT': 0}):
+            exchange_ratio('EUR', 'GBP')
+            with self.assertNumQueries(1):
+                exchange_ratio('EUR', 'GBP')
+
+
+class TestRateSnapshot(TestCase):
+
+    def setUp(self):
+        self.source = RateSource.objects.create(name='Test source', base_currency='EUR')
+        self.other = RateSource.objects.create(name='Other source', base_currency='EUR')
+        today = date.today()
+        self.yesterday = today - timedelta(1)
+        for source, currency, value, rate_date in [
+            (self.source, 'GBP', '0.8', self.yesterday),
+            (self.source, 'GBP', '0.9', today),
+            (self.source, 'USD', '1.2', self.yesterday - timedelta(1)),
+            (self.other, 'GBP', '0.85', self.yesterday),
+            (self.other, 'JPY', '130', today),
+        ]:
+            rate = Rate.objects.create(source=source, currency=currency, value=Decimal(value))
+            Rate.objects.filter(pk=rate.pk).update(date=rate_date)
+
+    def test_snapshot(self):
+        with self.assertNumQueries(1):
+            snapshot = Rate.objects.snapshot()
+        assert dict(snapshot) == {'GBP': Decimal('0.9'), 'USD': Decimal('1.2'), 'JPY': Decimal('130')}
+        assert snapshot.date == date.today()
+
+        # Latest created rate wins between sources for the same date
+        snapshot = Rate.objects.snapshot(self.yesterday)
+        assert dict(snapshot) == {'GBP': Decimal('0.85'), 'USD': Decimal('1.2')}
+
+    def test_snapshot_history(self):
+        random.seed(0)
+        sources = [self.source, self.other, RateSource.objects.create(name='Third source', base_currency='EUR')]
+        currencies = ['C{:02d}'.format(i) for i in range(10)]
+        start = date(2017, 1, 1)
+        for day in range(60):
+            for source in sources:
+                rates = [
+                    (currency, Decimal(random.randrange(1, 100))) for currency in currencies if random.random() < 0.4
+                ]
+                Rate.objects.upsert(source, rates, start + timedelta(day), changes_only=False)
+        rows = list(Rate.objects.values_list('source', 'currency', 'value', 'date', 'id'))
+
+        def expected(rate_date, source_ids):
+            latest = {}
+            for source_id, currency, value, row_date, pk in sorted(rows, key=lambda row: (row[3], row[4])):
+                if row_date <= rate_date and source_id in source_ids:
+                    latest[currency] = value
+            return latest
+
+        for day in (0, 1, 30, 59, 90):
+            rate_date = start + timedelta(day)
+            with self.assertNumQueries(1):
+                snapshot = Rate.objects.snapshot(rate_date, sources=[])
+            assert dict(snapshot) == expected(rate_date, [source.pk for source in sources])
+            for source in sources:
+                assert dict(Rate.objects.snapshot(rate_date, source.pk)) == expected(rate_date, [source.pk])
+
+    def test_snapshot_source(self):
+        snapshot = Rate.objects.snapshot(self.yesterday, source=self.source)
+        assert dict(snapshot) == {'GBP': Decimal('0.8'), 'USD': Decimal('1.2')}
+        assert dict(Rate.objects.snapshot(source=self.other.pk)) == {'GBP': Decimal('0.85'), 'JPY': Decimal('130')}
+
+    def test_exchange(self):
+        snapshot = Rate.objects.snapshot(self.yesterday, source=self.source)
+        with self.assertNumQueries(0):
+            assert exchange_ratio('GBP', 'USD', snapshot=snapshot) == Decimal('1.5')
+            assert exchange_ratio('EUR', 'EUR', snapshot=snapshot) == Decimal(1)
+            assert Money('10', 'GBP').exchange_to('USD', snapshot=snapshot) == Money('15', 'USD')
+            assert Money('10', 'GBP').exchange_to('EUR', snapshot=snapshot) == Money('12.5', 'EUR')
+            with self.assertRaises(Rate.DoesNotExist):
+                Money('10', 'GBP').exchange_to('JPY', snapshot=snapshot)
+
+    def test_immutable_and_picklable(self):
+        snapshot = Rate.objects.snapshot()
+        with self.assertRaises(AttributeError):
+            snapshot.foo = 'bar'
+        with self.assertRaises(TypeError):
+            snapshot['GBP'] = Decimal(1)
+        unpickled = pickle.loads(pickle.dumps(snapshot))
+        assert isinstance(unpickled, RateSnapshot)
+        assert unpickled == snapshot
+        assert unpickled.date == snapshot.date
+        assert unpickled.base_currency == 'EUR'
+
+
+class RateStoreMixin(object):
+    cache_backend = None
+
+    def setUp(self):
+        self.location = tempfile.mkdtemp()
+        self.settings = override_settings(
+            CACHES={'rates': {'BACKEND': self.cache_backend, 'LOCATION': self.location}},
+            TXMONEY={'DEFAULT_CURRENCY': 'EUR', 'RATES_STORE_CACHE': 'rates'},
+        )
+        self.settings.enable()
+        self.source = RateSource.objects.create(name='Test source', base_currency='EUR')
+        Rate.objects.create(source=self.source, currency='GBP', value=Decimal('0.8'))
+        Rate.objects.create(source=self.source, currency='USD', value=Decimal('1.2'))
+
+    def tearDown(self):
+        caches['rates'].clear()
+        self.settings.disable()
+        shutil.rmtree(self.location)
+
+
+class RateStoreTests(RateStoreMixin):
+
+    def test_shared_snapshot(self):
+        with self.assertNumQueries(1):
+            snapshot = rate_store.get_snapshot(date.today())
+        assert snapshot['GBP'] == Decimal('0.8')
+        with self.assertNumQueries(0):
+            assert rate_store.get_snapshot(date.today()) == snapshot
+            # Another process only reads the shared cache
+            assert RateStore('rates').get_snapshot(date.today()) == snapshot
+
+    def test_generation(self):
+        other = RateStore('rates', check_interval=0)
+        generation = other.generation()
+        other.get_snapshot(date.today())
+        rates_updated.send(sender=None, source=self.source)
+        assert other.generation() == generation + 1
+        with self.assertNumQueries(1):
+            other.get_snapshot(date.today())
+        with self.assertNumQueries(0):
+            other.get_snapshot(date.today())
+            rate_store.get_snapshot(date.today())
+
+    def test_check_interval(self):
+        other = RateStore('rates', check_interval=60)
+        other.get_snapshot(date.today())
+        with patch.object(other, 'generation', wraps=other.generation) as generation:
+            other.get_snapshot(date.today())
+            rates_updated.send(sender=None, source=self.source)
+            other.get_snapshot(date.today())
+        assert not generation.called
+        # Bumped in this process
+        other.bump()
+        with self.assertNumQueries(1):
+            assert other.get_snapshot(date.today())['GBP'] == Decimal('0.8')
+
+    def test_missing_generation(self):
+        store = RateStore('rates')
+        store.cache.delete('txmoney:rates:generation')
+        store.bump()
+        assert store.generation() == 1
+
+    def test_exchange_ratio(self):
+        assert exchange_ratio('GBP', 'USD') == Decimal('1.5')
+        Rate.objects.filter(currency='GBP').update(value=Decimal('0.6'))
+        with self.assertNumQueries(0):
+            assert exchange_ratio('GBP', 'USD') == Decimal('1.5')
+        rates_updated.send(sender=None, source=self.source)
+        assert exchange_ratio('GBP', 'USD') == Decimal('2')
+
+
+class TestLocMemRateStore(RateStoreTests, TestCase):
+    cache_backend = 'django.core.cache.backends.locmem.LocMemCache'
+
+
+class TestFileRateStore(RateStoreTests, TestCase):
+    cache_backend = 'django.core.cache.backends.filebased.FileBasedCache'
+
+
+class TestRateStoreUpdateRates(RateStoreMixin, TransactionTestCase):
+    cache_backend = 'django.core.cache.backends.locmem.LocMemCache'
+
+    def test_update_rates(self):
+        received = []
+
+        def receiver(**kwargs):
+            received.append(kwargs['source'].name)
+
+        rates_updated.connect(receiver)
+        try:
+            generation = rate_store.generation()
+            FakeBackend({'GBP': Decimal('0.7')}).update_rates()
+        finally:
+            rates_updated.disconnect(receiver)
+        assert received == ['Fake source']
+        assert rate_store.generation() > generation
+
+
+class TestRateSeries(TestCase):
+
+    def setUp(self):
+        self.source = RateSource.objects.create(name='Test source', base_currency='EUR')
+        self.other = RateSource.objects.create(name='Other source', base_currency='EUR')
+        for source, currency, value, rate_date in [
+            (self.source, 'GBP', '0.8', date(2016, 12, 28)),
+            (self.source, 'GBP', '0.9', date(2017, 1, 3)),
+            (self.source, 'GBP', '0.7', date(2017, 1, 10)),
+            (self.source, 'USD', '1.2', date(2017, 1, 2)),
+            (self.other, 'USD', '1.5', date(2017, 1, 4)),
+        ]:
+            rate = Rate.objects.create(source=source, currency=currency, value=Decimal(value))
+            Rate.objects.filter(pk=rate.pk).update(date=rate_date)
+
+    def test_series(self):
+        with self.assertNumQueries(1):
+            series = Rate.objects.series(['GBP', 'USD', 'EUR'], date(2017, 1, 1), date(2017, 1, 5))
+        assert series.dates == [date(2017, 1, day) for day in range(1, 6)]
+        assert series['GBP'] == tuple(Decimal(v) for v in ('0.8', '0.8', '0.9', '0.9', '0.9'))
+        assert series['USD'] == (None, Decimal('1.2'), Decimal('1.2'), Decimal('1.5'), Decimal('1.5'))
+        assert set(series) == {'GBP', 'USD'}
+
+    def test_same_as_get_for_date(self):
+        series = Rate.objects.series(['GBP', 'USD'], date(2017, 1, 2), date(2017, 1, 12))
+        for rate_date in series.dates:
+            for code in ('GBP', 'USD'):
+                assert series.get_rate(code, rate_date) == Rate.objects.get_for_date(code, rate_date).value
+
+    def test_source(self):
+        series = Rate.objects.series(['USD'], date(2017, 1, 1), date(2017, 1, 5), source=self.source)
+        assert series['USD'] == (None,) + (Decimal('1.2'),) * 4
+
+    def test_lookups(self):
+        series = Rate.objects.series(['GBP', 'USD'], date(2017, 1, 1), date(2017, 1, 5))
+        assert series.get_rate('EUR', date(2017, 1, 1)) == Decimal(1)
+        assert series.ratio('GBP', 'USD', date(2017, 1, 4)) == Decimal('1.5') / Decimal('0.9')
+        assert series.ratios('EUR', 'GBP') == [Decimal(v) for v in ('0.8', '0.8', '0.9', '0.9', '0.9')]
+        with self.assertRaises(Rate.DoesNotExist):
+            series.get_rate('USD', date(2017, 1, 1))
+        with self.assertRaises(Rate.DoesNotExist):
+            series.ratios('GBP', 'USD')
+        with self.assertRaises(Rate.DoesNotExist):
+            series.get_rate('JPY', date(2017, 1, 1))
+        with self.assertRaises(ValueError):
+            series.get_rate('GBP', date(2017, 1, 6))
+
+    def test_exchange_series(self):
+        with self.assertNumQueries(1):
+            result = exchange_series(Money(9, 'GBP'), 'USD', date(2017, 1, 3), date(2017, 1, 4))
+        assert result == [(date(2017, 1, 3), Money('12', 'USD')), (date(2017, 1, 4), Money('15', 'USD'))]
+
+        series = Rate.objects.series(['GBP', 'USD'], date(2017, 1, 1), date(2017, 1, 5))
+        with self.assertNumQueries(0):
+            result = exchange_series(Money(9, 'GBP'), 'EUR', date(2017, 1, 2), date(2017, 1, 3), series=series)
+        assert [money.round() for _, money in result] == [Money('11.25', 'EUR'), Money(10, 'EUR')]
+
+    def test_pickle(self):
+        series = Rate.objects.series(['GBP'], date(2017, 1, 1), date(2017, 1, 5))
+        unpickled = pickle.loads(pickle.dumps(series))
+        assert isinstance(unpickled, RateSeries)
+        assert unpickled == series
+        assert unpickled.dates == series.dates
+
+
+class TestRateSources(TestCase):
+
+    def setUp(self):
+        self.ecb = RateSource.objects.create(name='ECB', base_currency='EUR')
+        self.oxr = RateSource.objects.create(name='OXR', base_currency='EUR')
+        Rate.objects.create(source=self.ecb, currency='GBP', value=Decimal('0.8'))
+        Rate.objects.create(source=self.oxr, currency='GBP', value=Decimal('0.85'))
+        Rate.objects.create(source=self.oxr, currency='USD', value=Decimal('1.2'))
+        rate_cache.clear()
+
+    def test_get_for_date_source(self):
+        assert Rate.objects.get_for_date('GBP', source=self.ecb).value == Decimal('0.8')
+        assert Rate.objects.get_for_date('GBP', source=self.oxr.pk).value == Decimal('0.85')
+        assert Rate.objects.get_for_date('GBP', source='OXR').value == Decimal('0.85')
+        with self.assertRaises(Rate.DoesNotExist):
+            Rate.objects.get_for_date('USD', source=self.ecb)
+
+    def test_get_for_sources(self):
+        assert Rate.objects.get_for_sources('GBP', sources=['OXR', 'ECB']).value == Decimal('0.85')
+        assert Rate.objects.get_for_sources('GBP', sources=['ECB', 'OXR']).value == Decimal('0.8')
+        assert Rate.objects.get_for_sources('USD', sources=['ECB', 'OXR']).value == Decimal('1.2')
+        assert Rate.objects.get_for_sources('USD', sources=['ECB']).value == Decimal('1.2')
+        with self.assertRaises(Rate.DoesNotExist):
+            Rate.objects.get_for_sources('USD', sources=['ECB'], fallback=False)
+
+    def test_settings(self):
+        with override_settings(TXMONEY={'DEFAULT_CURRENCY': 'EUR', 'RATES_SOURCES': ['ECB', 'OXR']}):
+            assert exchange_ratio('EUR', 'GBP') == Decimal('0.8')
+            assert exchange_ratio('EUR', 'USD') == Decimal('1.2')
+        with override_settings(TXMONEY={'DEFAULT_CURRENCY': 'EUR', 'RATES_SOURCES': ['ECB'],
+                                        'RATES_SOURCE_FALLBACK': False}):
+            with self.assertRaises(Rate.DoesNotExist):
+                exchange_ratio('EUR', 'USD')
+
+    def test_exchange_source(self):
+        assert exchange_ratio('EUR', 'GBP', source=self.oxr) == Decimal('0.85')
+        assert exchange_ratio('EUR', 'GBP', source=self.ecb) == Decimal('0.8')
+        assert Money(10, 'EUR').exchange_to('GBP', source=self.ecb) == Money(8, 'GBP')
+
+    def test_snapshot_sources(self):
+        with override_settings(TXMONEY={'DEFAULT_CURRENCY': 'EUR', 'RATES_SOURCES': ['ECB']}):
+            snapshot = Rate.objects.snapshot()
+            assert snapshot['GBP'] == Decimal('0.8')
+            assert snapshot['USD'] == Decimal('1.2')
+            assert exchange_many([Money(10, 'EUR')], 'GBP') == [Money(8, 'GBP')]
+            assert exchange_many([Money(10, 'EUR')], 'GBP', source='OXR') == [Money('8.5', 'GBP')]
+        assert Rate.objects.snapshot(sources=['OXR'])['GBP'] == Decimal('0.85')
+        assert Rate.objects.snapshot(source='OXR')['GBP'] == Decimal('0.85')
+        assert 'USD' not in Rate.objects.snapshot(sources=['ECB'], fallback=False)
+        assert 'USD' not in Rate.objects.snapshot(source=self.ecb.pk)
+
+    def test_series_sources(self):
+        Rate.objects.upsert(self.ecb, {'GBP': Decimal('0.7')}, date(2017, 1, 3))
+        Rate.objects.upsert(self.oxr, {'GBP': Decimal('0.9')}, date(2017, 1, 1))
+        series = Rate.objects.series(['GBP', 'USD'], date(2017, 1, 1), date(2017, 1, 4), sources=['ECB'])
+        # Days without an ECB rate fall back to the other sources
+        assert series['GBP'] == tuple(Decimal(v) for v in ('0.9', '0.9', '0.7', '0.7'))
+        series = Rate.objects.series(['GBP', 'USD'], date(2017, 1, 1), date(2017, 1, 4), sources=['ECB'],
+                                     fallback=False)
+        assert series['GBP'] == (None, None, Decimal('0.7'), Decimal('0.7'))
+        assert series['USD'] == (None,) * 4
+
+    def test_store_sources(self):
+        with override_settings(
+            CACHES={'rates': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'sources'}},
+            TXMONEY={'DEFAULT_CURRENCY': 'EUR', 'RATES_STORE_CACHE': 'rates', 'RATES_SOURCES': ['ECB']},
+        ):
+            assert rate_store.enabled
+            assert exchange_ratio('EUR', 'GBP') == Decimal('0.8')
+            assert exchange_many([Money(10, 'EUR')], 'GBP') == [Money(8, 'GBP')]
+            assert exchange_ratio('EUR', 'GBP', source='OXR') == Decimal('0.85')
+            assert exchange_ratio('EUR', 'GBP', source=self.oxr) == Decimal('0.85')
+            assert exchange_ratio('EUR', 'GBP', source='ECB') == Decimal('0.8')
+            with self.assertRaises(Rate.DoesNotExist):
+                exchange_ratio('EUR', 'USD', source='ECB')
+            caches['rates'].clear()
+
+    def test_latest_rate_index(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('EXPLAIN QUERY PLAN is SQLite specific')
+        query = Rate.objects.filter(source=self.ecb, currency='GBP', date__lte=date.today()).order_by('-date')[:1]
+        sql, params = query.query.get_compiler(using='default').as_sql()
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+            plan = ' '.join(str(row[-1]) for row in cursor.fetchall())
+        assert 'COVERING INDEX txmoney_rate_source_currency_date_idx' in plan
+        assert 'TEMP B-TREE' not in plan
+
+
+class RateUpsertTests(object):
+    on_conflict = True
+
+    def setUp(self):
+        self.source = RateSource.objects.create(name='ECB', base_currency='EUR')
+        patcher = patch('txmoney.rates.models._supports_on_conflict', return_value=self.on_conflict)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def rates(self):
+        return dict(Rate.objects.filter(source=self.source, date=date.today()).values_list('currency', 'value'))
+
+    def test_insert(self):
+        assert Rate.objects.upsert(self.source, {'GBP': Decimal('0.8'), 'USD': Decimal('1.2')}) == 2
+        assert self.rates() == {'GBP': Decimal('0.8'), 'USD': Decimal('1.2')}
+
+    def test_idempotent(self):
+        rates = {'GBP': Decimal('0.8'), 'USD': Decimal('1.2'), 'JPY': Decimal(1) / 3}
+        Rate.objects.upsert(self.source, rates)
+        assert Rate.objects.upsert(self.source, rates) == 0
+        assert Rate.objects.count() == 3
+
+    def test_update_changed(self):
+        Rate.objects.upsert(self.source, {'GBP': Decimal('0.8'), 'USD': Decimal('1.2')})
+        assert Rate.objects.upsert(self.source, [('GBP', Decimal('0.8')), ('USD', '1.3'), ('JPY', 130)]) == 2
+        assert self.rates() == {'GBP': Decimal('0.8'), 'USD': Decimal('1.3'), 'JPY': Decimal('130')}
+
+    def test_other_dates_and_sources(self):
+        Rate.objects.create(source=self.source, currency='GBP', value=Decimal('0.7'))
+        Rate.objects.filter(source=self.source).update(date=date.today() - timedelta(1))
+        oxr = RateSource.objects.create(name='OXR', base_currency='EUR')
+        Rate.objects.create(source=oxr, currency='GBP', value=Decimal('0.9'))
+        assert Rate.objects.upsert(self.source, {'GBP': Decimal('0.8')}) == 1
+        assert Rate.objects.count() == 3
+
+    def test_chunks(self):
+        rates = dict(('C%02d' % i, i + 1) for i in range(25))
+        with self.assertNumQueries(14 if self.on_conflict else 17):
+            assert Rate.objects.upsert(self.source, rates, chunk_size=10) == 25
+        assert len(self.rates()) == 25
+
+    def test_update_rates(self):
+        backend = FakeBackend({'GBP': Decimal('0.8')})
+        assert backend.update_rates() == 1
+        assert backend.update_rates() == 0
+        assert backend.update_rates(force=True) == 0
+        backend.rates = {'GBP': Decimal('0.7'), 'USD': Decimal('1.2')}
+        assert backend.update_rates(force=True) == 2
+        assert exchange_ratio('EUR', 'GBP') == Decimal('0.7')
+
+
+class TestRateUpsert(RateUpsertTests, TestCase):
+    pass
+
+
+class TestRateUpsertFallback(RateUpsertTests, TestCase):
+    on_conflict = False
+
+
+class TestChangesOnly(TestCase):
+    start = date(2017, 1, 1)
+    values = {
+        'GBP': ['0.8', '0.8', '0.8', '0.9', '0.9', '0.8', '0.8', '0.85', '0.85', '0.85'],
+        'USD': ['1.2'] * 10,
+    }
+
+    def setUp(self):
+        self.source = RateSource.objects.create(name='ECB', base_currency='EUR')
+
+    def write(self, changes_only, days=range(10)):
+        for day in days:
+            rates = dict((currency, Decimal(values[day])) for currency, values in self.values.items())
+            Rate.objects.upsert(self.source, rates, self.start + timedelta(day), changes_only=changes_only)
+
+    def lookups(self):
+        days = [self.start + timedelta(day) for day in range(12)]
+        return [
+            (Rate.objects.get_for_date(currency, day).value, Rate.objects.snapshot(day)[currency])
+            for day in days for currency in self.values
+        ]
+
+    def stored(self, currency):
+        return list(Rate.objects.filter(currency=currency).order_by('date').values_list('date', 'value'))
+
+    def test_compact(self):
+        self.write(False)
+        lookups = self.lookups()
+        assert Rate.objects.compact() == 15
+        assert Rate.objects.count() == 5
+        assert self.lookups() == lookups
+        assert self.stored('GBP') == [
+            (date(2017, 1, 1), Decimal('0.8')), (date(2017, 1, 4), Decimal('0.9')),
+            (date(2017, 1, 6), Decimal('0.8')), (date(2017, 1, 8), Decimal('0.85')),
+        ]
+        assert Rate.objects.compact() == 0
+
+    def test_compact_sources(self):
+        other = RateSource.objects.create(name='OXR', base_currency='EUR')
+        self.write(False, range(3))
+        Rate.objects.upsert(other, {'GBP': Decimal('1.7')}, self.start + timedelta(1))
+        lookups = self.lookups()
+        # Only the USD rates are not shared with the other source
+        assert Rate.objects.compact() == 2
+        assert self.lookups() == lookups
+        assert len(self.stored('GBP')) == 4
+
+        # Nor discarded when written
+        self.write(True, [3])
+        assert Rate.objects.filter(currency='GBP', date=self.start + timedelta(3)).exists()
+        assert not Rate.objects.filter(currency='USD', date=self.start + timedelta(3)).exists()
+
+        # Lookups don't compare sources without fallback
+        with override_settings(TXMONEY={'DEFAULT_CURRENCY': 'EUR', 'RATES_SOURCES': ['ECB'],
+                                        'RATES_SOURCE_FALLBACK': False}):
+            assert Rate.objects.compact() == 2
+            assert Rate.objects.snapshot(self.start + timedelta(2))['GBP'] == Decimal('0.8')
+
+    def test_compact_from(self):
+        self.write(False)
+        lookups = self.lookups()
+        assert Rate.objects.compact(self.source, date(2017, 1, 5), chunk_size=2) == 10
+        assert self.lookups() == lookups
+        assert len(self.stored('USD')) == 4
+
+    def test_changes_only(self):
+        self.write(True)
+        assert Rate.objects.count() == 5
+        self.write(False, [9])
+        self.write(True, [9])
+        assert Rate.objects.count() == 5
+        self.write(False)
+        Rate.objects.compact()
+        assert Rate.objects.count() == 5
+        assert [rate.date for rate in Rate.objects.filter(currency='USD')] == [self.start]
+
+    def test_changes_only_update(self):
+        self.write(True)
+        lookups = self.lookups()
+        # A stored rate equal to the previous one is deleted
+        Rate.objects.upsert(self.source, {'GBP': Decimal('0.9')}, date(2017, 1, 6))
+        assert Rate.objects.upsert(self.source, {'GBP': Decimal('0.9')}, date(2017, 1, 6), changes_only=True) == 1
+        assert not Rate.objects.filter(currency='GBP', date=date(2017, 1, 6)).exists()
+        assert Rate.objects.get_for_date('GBP', date(2017, 1, 7)).value == Decimal('0.9')
+        assert Rate.objects.upsert(self.source, {'GBP': Decimal('0.8')}, date(2017, 1, 6), changes_only=True) == 1
+        assert self.lookups() == lookups
+
+    def test_update_rates(self):
+        source = RateSource.objects.create(name='Fake source', base_currency='EUR')
+        Rate.objects.upsert(source, {'GBP': Decimal('0.8')}, date.today() - timedelta(1))
+        RateSource.objects.update(last_update='2017-01-01T00:00:00Z')
+        with override_settings(TXMONEY={'DEFAULT_CURRENCY': 'EUR', 'RATES_CHANGES_ONLY': True}):
+            assert FakeBackend({'GBP': Decimal('0.8'), 'USD': Decimal('1.2')}).update_rates() == 1
+            assert exchange_ratio('EUR', 'GBP') == Decimal('0.8')
+        assert not Rate.objects.filter(currency='GBP', date=date.today()).exists()
+
+    def test_command(self):
+        self.write(False)
+        out = StringIO()
+        call_command('compact_rates', '--source', 'ECB', stdout=out)
+        assert 'Compacted rates for "ECB" in EUR, 15 deleted' in out.getvalue()
+
+
+class TestLatestRate(TestCase):
+
+    def setUp(self):
+        self.ecb = RateSource.objects.create(name='ECB', base_currency='EUR')
+        self.oxr = RateSource.objects.create(name='OXR', base_currency='EUR')
+        self.yesterday = date.today() - timedelta(1)
+        rate_cache.clear()
+
+    def latest(self, source):
+        return dict(
+            (currency, (value, rate_date))
+            for currency, value, rate_date in source.latest_rates.values_list('currency', 'value', 'date')
+        )
+
+    def test_upsert(self):
+        Rate.objects.upsert(self.ecb, {'GBP': Decimal('0.8'), 'USD': Decimal('1.2')}, self.yesterday)
+        Rate.objects.upsert(self.ecb, {'GBP': Decimal('0.85')})
+        assert self.latest(self.ecb) == {
+            'GBP': (Decimal('0.85'), date.today()), 'USD': (Decimal('1.2'), self.yesterday),
+        }
+        Rate.objects.upsert(self.ecb, {'GBP': Decimal('0.9')})
+        # Older dates don't replace later latest rates
+        Rate.objects.upsert(self.ecb, {'GBP': Decimal('0.7'), 'USD': Decimal('1.1')}, self.yesterday - timedelta(1))
+        assert self.latest(self.ecb) == {
+            'GBP': (Decimal('0.9'), date.today()), 'USD': (Decimal('1.2'), self.yesterday),
+        }
+
+    def test_create_and_delete(self):
+        Rate.objects.upsert(self.ecb, {'GBP': Decimal('0.8')}, self.yesterday)
+        rate = Rate.objects.create(source=self.ecb, currency='GBP', value=Decimal('0.85'))
+        assert self.latest(self.ecb) == {'GBP': (Decimal('0.85'), date.today())}
+        rate.delete()
+        assert self.latest(self.ecb) == {'GBP': (Decimal('0.8'), self.yesterday)}
+        Rate.objects.get().delete()
+        assert self.latest(self.ecb) == {}
+
+    def test_compact(self):
+        for day in range(3, 0, -1):
+            Rate.objects.upsert(self.ecb, {'GBP': Decimal('0.8')}, date.today() - timedelta(day))
+        Rate.objects.compact()
+        assert self.latest(self.ecb) == {'GBP': (Decimal('0.8'), date.today() - timedelta(3))}
+
+    def test_get_for_date(self):
+        Rate.objects.upsert(self.ecb, {'GBP': Decimal('0.8')}, self.yesterday)
+        Rate.objects.upsert(self.ecb, {'GBP': Decimal('0.85')}, date.today() + timedelta(1))
+        Rate.objects.upsert(self.oxr, {'GBP': Decimal('0.9'), 'USD': Decimal('1.2')})
+        assert LatestRate.objects.get_for_date('GBP', source='ECB').value == Decimal('0.8')
+        assert LatestRate.objects.get_for_date('GBP', date.today() + timedelta(1), self.ecb).value == Decimal('0.85')
+        assert LatestRate.objects.get_for_date('GBP').value == Decimal('0.9')
+        assert LatestRate.objects.get_for_sources('USD', sources=['ECB']).value == Decimal('1.2')
+        with self.assertRaises(Rate.DoesNotExist):
+            LatestRate.objects.get_for_sources('USD', sources=['ECB'], fallback=False)
+        with self.assertRaises(Rate.DoesNotExist):
+            LatestRate.objects.get_for_date('JPY')
+
+    def test_exchange_ratio(self):
+        Rate.objects.upsert(self.ecb, {'GBP': Decimal('0.8')}, self.yesterday)
+        Rate.objects.upsert(self.ecb, {'GBP': Decimal('0.85')})
+        with self.assertNumQueries(1):
+            assert exchange_ratio('EUR', 'GBP', source=self.ecb) == Decimal('0.85')
+        assert exchange_ratio('EUR', 'GBP', self.yesterday, source=self.ecb) == Decimal('0.8')
+
+    def test_migration_fill(self):
+        fill_latest_rates = import_module('txmoney.rates.migrations.0003_latestrate').fill_latest_rates
+        Rate.objects.upsert(self.ecb, {'GBP': Decimal('0.8')}, self.yesterday)
+        Rate.objects.upsert(self.ecb, {'GBP': Decimal('0.85'), 'USD': Decimal('1.2')})
+        LatestRate.objects.all().delete()
+        fill_latest_rates(apps, connection.schema_editor())
+        assert self.latest(self.ecb) == {
+            'GBP': (Decimal('0.85'), date.today()), 'USD': (Decimal('1.2'), date.today()),
+        }
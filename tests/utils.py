@@ -0,0 +1,22 @@
+# coding=utf-8
+from __future__ import absolute_import, unicode_literals
+
+from decimal import Decimal
+
+from txmoney.rates.backends import BaseRateBackend
+
+
+class FakeBackend(BaseRateBackend):
+    """
+    Backend with the same `rates` for every date, GBP at 0.75 by default
+    """
+
+    def __init__(self, rates=None):
+        super(FakeBackend, self).__init__('Fake source', 'EUR')
+        self.rates = rates or {'GBP': Decimal('0.75')}
+
+    def get_rates_from_source(self):
+        return self.rates
+
+    def get_rates_for_date(self, rate_date):
+        return self.rates
@@ -2,6 +2,7 @@
 from __future__ import absolute_import, unicode_literals
 
 from django import VERSION
+from django.db import transaction
 from django.db.models.manager import ManagerDescriptor
 
 
@@ -16,3 +17,14 @@ def setup_managers(sender):
             (_id, name, money_manager(manager))
             for _id, name, manager in sender._meta.concrete_managers if name == 'objects'
         ])
+
+
+def on_commit(func, using=None):
+    """
+    Runs `func` once the current transaction commits, or right away on
+    Django 1.8, which has no transaction.on_commit
+    """
+    if VERSION >= (1, 9):
+        transaction.on_commit(func, using)
+    else:
+        func()
@@ -1,4 +1,7 @@
 # -*- coding: utf-8 -*-
 from __future__ import absolute_import
 
-from .money import Currency, Money  # noqa
+from .accumulator import MoneyAccumulator  # noqa
+from .allocation import allocate_many, iter_allocate  # noqa
+from .minor import MinorUnitMoney  # noqa
+from .money import Currency, Money, register_currency, round_many  # noqa
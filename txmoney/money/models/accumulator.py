@@ -0,0 +1,131 @@
+# coding=utf-8
+from __future__ import absolute_import, unicode_literals
+
+from decimal import Decimal
+
+from ...settings import get_settings
+from ..exceptions import CurrencyMismatch
+from .money import Currency, Money
+
+
+class MoneyAccumulator(object):
+    """
+    A mutable running total of Money for hot loops. Amounts are added as raw
+    Decimals, so no Money is built until the total is read.
+
+    The following are supported:
+        total = MoneyAccumulator('EUR')
+        total.add(Money('10.50', 'EUR'))
+        total += Money('3', 'EUR')
+        total.update(invoice.lines)
+        total.total                         # Money 13.50 EUR
+
+    With `grouped=True` Money in any currency is accepted and totals are kept
+    per currency:
+        totals = MoneyAccumulator(grouped=True)
+        totals.update([Money('1 EUR'), Money('2 USD'), Money('3 EUR')])
+        totals.totals()                     # {'EUR': Money 4 EUR, 'USD': Money 2 USD}
+    """
+
+    __slots__ = ('_currency', '_amount', '_grouped', '_amounts', '_currencies', '_count')
+
+    def __init__(self, currency=None, grouped=False):
+        if currency is not None and not isinstance(currency, Currency):
+            currency = Currency.get_by_code(currency)
+        self._currency = currency
+        self._amount = Decimal(0)
+        self._grouped = grouped
+        self._amounts = {}
+        self._currencies = {}
+        self._count = 0
+
+    def add(self, money):
+        """
+        Adds a Money to the total.
+        """
+        currency = money.currency
+        if self._grouped:
+            code = currency.code
+            amounts = self._amounts
+            if code not in amounts:
+                self._currencies[code] = currency
+            amounts[code] = amounts.get(code, 0) + money.amount
+        else:
+            if currency is not self._currency:
+                if self._currency is None:
+                    self._currency = currency
+                elif currency != self._currency:
+                    raise CurrencyMismatch('Currency mismatch: {} != {}'.format(self._currency, currency))
+            self._amount += money.amount
+        self._count += 1
+        return self
+
+    __iadd__ = add
+
+    def update(self, moneys):
+        """
+        Adds every Money in an iterable to the total.
+        """
+        # Same as calling `add` for each Money, with the state kept in locals
+        count = 0
+        if self._grouped:
+            amounts = self._amounts
+            currencies = self._currencies
+            try:
+                for money in moneys:
+                    code = money.currency.code
+                    if code not in amounts:
+                        currencies[code] = money.currency
+                    amounts[code] = amounts.get(code, 0) + money.amount
+                    count += 1
+            finally:
+                self._count += count
+            return self
+
+        currency = self._currency
+        amount = self._amount
+        try:
+            for money in moneys:
+                if money.currency is not currency:
+                    if currency is None:
+                        currency = money.currency
+                    elif money.currency != currency:
+                        raise CurrencyMismatch('Currency mismatch: {} != {}'.format(currency, money.currency))
+                amount += money.amount
+                count += 1
+        finally:
+            self._currency = currency
+            self._amount = amount
+            self._count += count
+        return self
+
+    def __len__(self):
+        """
+        Number of Money added.
+        """
+        return self._count
+
+    @property
+    def total(self):
+        """
+        Total as a Money
+        """
+        if self._grouped:
+            totals = self.totals()
+            if len(totals) > 1:
+                raise CurrencyMismatch('Cannot total mixed currencies: {}'.format(', '.join(sorted(totals))))
+            if totals:
+                return next(iter(totals.values()))
+        return Money._make(self._amount, self._currency or Currency.get_by_code(get_settings().DEFAULT_CURRENCY))
+
+    def totals(self):
+        """
+        Totals per currency
+        :return: dict mapping currency codes to Money
+        """
+        if not self._grouped:
+            return {self._currency.code: self.total} if self._currency else {}
+        return {
+            code: Money._make(amount, self._currencies[code])
+            for code, amount in self._amounts.items()
+        }
@@ -0,0 +1,166 @@
+# coding=utf-8
+"""
+Allocation of money amounts between weighted ratios.
+
+Allocations work with integers: amounts are expressed in minor units (or
+finer, when the amount carries more decimals than its currency) and ratios
+are scaled to integer weights, so shares always add up exactly to the
+original amount.
+"""
+from __future__ import absolute_import, division, unicode_literals
+
+from decimal import Decimal
+from fractions import Fraction
+from heapq import nlargest
+
+from django.utils.six import integer_types
+
+try:
+    from math import gcd
+except ImportError:  # Python 2
+    from fractions import gcd
+
+
+def integer_weights(ratios):
+    """
+    Scales ratios (ints, Decimals or Fractions) to integer weights keeping
+    their proportions.
+    """
+    ratios = list(ratios)
+    if set(map(type, ratios)).issubset(integer_types):
+        weights = ratios
+    else:
+        # Scale each distinct ratio once, they usually repeat a lot
+        distinct = set(ratios)
+        if all(isinstance(ratio, integer_types + (Decimal,)) for ratio in distinct):
+            exponent = min(Decimal(ratio).as_tuple().exponent for ratio in distinct)
+            scaled = {ratio: int(Decimal(ratio).scaleb(-exponent)) for ratio in distinct}
+        else:
+            fractions = {ratio: Fraction(ratio) for ratio in distinct}
+            scale = 1
+            for ratio in fractions.values():
+                scale = scale * ratio.denominator // gcd(scale, ratio.denominator)
+            scaled = {ratio: int(fraction * scale) for ratio, fraction in fractions.items()}
+        weights = [scaled[ratio] for ratio in ratios]
+
+    if any(weight < 0 for weight in weights):
+        raise ValueError('Allocation ratios cannot be negative')
+    if weights and not any(weights):
+        raise ValueError('Allocation ratios cannot all be zero')
+    return weights
+
+
+def allocate_units(units, weights, total=None):
+    """
+    Splits an integer amount between integer weights with the largest
+    remainder method: every share gets the integer part of its quota and the
+    units left are given to the shares with the largest remainders, first
+    ones winning ties.
+    """
+    if not weights:
+        return []
+    total = total or sum(weights)
+    sign = -1 if units < 0 else 1
+    units = abs(units)
+
+    quotas = [units * weight for weight in weights]
+    shares = [quota // total for quota in quotas]
+
+    left = units - sum(shares)
+    if left:
+        remainders = [quota % total for quota in quotas]
+        for i in nlargest(left, range(len(shares)), key=remainders.__getitem__):
+            shares[i] += 1
+
+    if sign < 0:
+        return [-share for share in shares]
+    return shares
+
+
+def iter_allocate_units(units, weights, total):
+    """
+    Streaming variant of `allocate_units` for an iterable of integer weights
+    whose `total` is known up front.
+
+    Shares are the differences between consecutive floored cumulative quotas,
+    so they are produced in constant memory, add up exactly to `units` and
+    each one is less than one unit away from its exact quota. Units left by
+    the rounding go to the shares where the cumulative quota crosses a whole
+    unit rather than to the largest remainders: 1000 units between three
+    equal weights are split as [333, 333, 334], not [334, 333, 333].
+    """
+    sign = -1 if units < 0 else 1
+    units = abs(units)
+    cumulative = allocated = 0
+    for weight in weights:
+        cumulative += weight
+        target = (units * cumulative) // total
+        yield sign * (target - allocated)
+        allocated = target
+
+
+def _split(money):
+    """
+    Returns the amount of a Money as an integer and its decimal exponent, using
+    the currency minor units or the amount decimals if it has more.
+    """
+    amount = money.amount
+    exponent = min(-money.currency.decimals, amount.as_tuple().exponent)
+    return int(amount.scaleb(-exponent)), exponent
+
+
+def _join(money, shares, exponent):
+    """
+    Builds a Money for each integer share. Money is immutable, so equal
+    shares reuse the same instance.
+    """
+    make = money._make
+    currency = money.currency
+    moneys = {share: make(Decimal(share).scaleb(exponent), currency) for share in set(shares)}
+    return [moneys[share] for share in shares]
+
+
+def allocate(money, ratios):
+    """
+    Allocates a Money between ratios
+    :param ratios: allocation ratios (ints, Decimals or Fractions)
+    :return: Money list of allocated money
+    """
+    units, exponent = _split(money)
+    return _join(money, allocate_units(units, integer_weights(ratios)), exponent)
+
+
+def iter_allocate(money, ratios, total=None):
+    """
+    Lazily allocates a Money between integer ratios.
+
+    Without `total` the shares are the ones `allocate` gives. When `total`
+    (the sum of the ratios) is given `ratios` can be any iterable, including
+    a generator, and is consumed only once; shares are then split as in
+    `iter_allocate_units`, so the units left by rounding may go to other
+    shares than with `allocate`.
+    """
+    units, exponent = _split(money)
+    if total is None:
+        shares = allocate_units(units, integer_weights(ratios))
+    else:
+        shares = iter_allocate_units(units, ratios, total)
+    make = money._make
+    currency = money.currency
+    for share in shares:
+        yield make(Decimal(share).scaleb(exponent), currency)
+
+
+def allocate_many(moneys, ratios):
+    """
+    Allocates every Money in `moneys` between the same ratios. Ratios are
+    scaled to integer weights only once for the whole batch.
+    :return: list with a Money list of allocated money per input Money
+    """
+    weights = integer_weights(ratios)
+    total = sum(weights)
+    results = []
+    for money in moneys:
+        units, exponent = _split(money)
+        results.append(_join(money, allocate_units(units, weights, total), exponent))
+    return results
@@ -0,0 +1,245 @@
+# coding=utf-8
+"""
+Columnar container for many Money values.
+
+Requires NumPy, which is an optional dependency of TXMoney.
+"""
+from __future__ import absolute_import, division, unicode_literals
+
+from decimal import Decimal
+
+import numpy as np
+from django.utils.six import string_types
+
+from ...settings import get_settings
+from ..exceptions import CurrencyMismatch, InvalidMoneyOperation
+from .money import Currency, Money
+
+_as_decimal = np.frompyfunc(lambda value: value if isinstance(value, Decimal) else Decimal(str(value)), 1, 1)
+
+
+def _to_decimals(values):
+    """
+    Converts a scalar or an array-like of numbers to Decimal, keeping the shape.
+    """
+    if isinstance(values, (np.ndarray, list, tuple)):
+        values = np.asarray(values, dtype=object)
+        return _as_decimal(values).astype(object) if values.size else values
+    if isinstance(values, Decimal):
+        return values
+    return Decimal(str(values))
+
+
+class MoneyArray(object):
+    """
+    A MoneyArray holds a sequence of amounts and their currencies as two
+    parallel NumPy arrays: an object array of Decimal amounts and an array of
+    ISO 4217 currency codes. Operations are applied to the whole array without
+    building a Money per element.
+
+    The following are supported:
+        MoneyArray(['10.50', '3'], 'EUR')                   # all in EUR
+        MoneyArray(['10.50', '3'], ['EUR', 'USD'])          # one currency per amount
+        MoneyArray.from_moneys([Money('10.50 EUR'), Money('3 USD')])
+
+    Arithmetic between a MoneyArray and another MoneyArray or a Money
+    requires matching currencies element by element, otherwise
+    `CurrencyMismatch` is raised.
+    """
+
+    def __init__(self, amounts, currencies=None):
+        amounts = np.asarray(_to_decimals(list(amounts)), dtype=object).reshape(-1)
+        if currencies is None or isinstance(currencies, (string_types, Currency)):
+            currency = Currency.get_by_code(currencies or get_settings().DEFAULT_CURRENCY)
+            currencies = np.full(len(amounts), currency.code, dtype='U3')
+        else:
+            currencies = np.asarray([getattr(c, 'code', c) for c in currencies], dtype='U3')
+            for code in np.unique(currencies):
+                Currency.get_by_code(code)
+        if currencies.shape != amounts.shape:
+            raise ValueError('Got {} amounts and {} currencies'.format(len(amounts), len(currencies)))
+        self._amounts = amounts
+        self._currencies = currencies
+
+    @classmethod
+    def _make(cls, amounts, currencies):
+        """
+        Trusted constructor that skips all input conversion and validation.
+        """
+        array = cls.__new__(cls)
+        array._amounts = amounts
+        array._currencies = currencies
+        return array
+
+    @classmethod
+    def from_moneys(cls, moneys):
+        """
+        Builds a MoneyArray from an iterable of Money.
+        """
+        moneys = list(moneys)
+        amounts = np.empty(len(moneys), dtype=object)
+        amounts[:] = [money.amount for money in moneys]
+        currencies = np.array([money.currency.code for money in moneys], dtype='U3')
+        return cls._make(amounts, currencies)
+
+    def to_moneys(self):
+        """
+        Returns a list with a Money for each element.
+        """
+        get_by_code = Currency.get_by_code
+        return [Money._make(amount, get_by_code(code)) for amount, code in zip(self._amounts, self._currencies)]
+
+    @property
+    def amounts(self):
+        return self._amounts
+
+    @property
+    def currencies(self):
+        return self._currencies
+
+    def __len__(self):
+        return len(self._amounts)
+
+    def __iter__(self):
+        return iter(self.to_moneys())
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            return Money._make(self._amounts[index], Currency.get_by_code(self._currencies[index]))
+        return self._make(self._amounts[index], self._currencies[index])
+
+    def __repr__(self):
+        return 'MoneyArray({})'.format(', '.join(
+            '{} {}'.format(amount, code) for amount, code in zip(self._amounts, self._currencies)
+        ))
+
+    def _other_amounts(self, other):
+        """
+        Returns amounts of a Money or MoneyArray operand, raising if any of
+        its currencies differs from the ones in this array.
+        """
+        if isinstance(other, MoneyArray):
+            if len(other) != len(self):
+                raise ValueError('Cannot operate MoneyArrays of lengths {} and {}'.format(len(self), len(other)))
+            mismatch = np.flatnonzero(self._currencies != other._currencies)
+            if mismatch.size:
+                index = mismatch[0]
+                raise CurrencyMismatch('Currency mismatch at index {}: {} != {}'.format(
+                    index, self._currencies[index], other._currencies[index]
+                ))
+            return other._amounts
+        mismatch = np.flatnonzero(self._currencies != other.currency.code)
+        if mismatch.size:
+            raise CurrencyMismatch('Currency mismatch: {} != {}'.format(self._currencies[mismatch[0]], other.currency))
+        return other.amount
+
+    def __pos__(self):
+        return self
+
+    def __neg__(self):
+        return self._make(-self._amounts, self._currencies)
+
+    def __abs__(self):
+        return self._make(np.abs(self._amounts), self._currencies)
+
+    def __add__(self, other):
+        if isinstance(other, (Money, MoneyArray)):
+            return self._make(self._amounts + self._other_amounts(other), self._currencies)
+        return self._make(self._amounts + _to_decimals(other), self._currencies)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        if isinstance(other, (Money, MoneyArray)):
+            return self._make(self._amounts - self._other_amounts(other), self._currencies)
+        return self._make(self._amounts - _to_decimals(other), self._currencies)
+
+    def __rsub__(self, other):
+        raise TypeError('Cannot subtract MoneyArray from {}'.format(other))
+
+    def __mul__(self, other):
+        if isinstance(other, (Money, MoneyArray)):
+            raise InvalidMoneyOperation('Cannot multiply monetary quantities')
+        return self._make(self._amounts * _to_decimals(other), self._currencies)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        if isinstance(other, (Money, MoneyArray)):
+            raise InvalidMoneyOperation('Cannot divide two monetary quantities')
+        return self._make(self._amounts / _to_decimals(other), self._currencies)
+
+    __div__ = __truediv__
+
+    def __rtruediv__(self, other):
+        raise InvalidMoneyOperation('Cannot divide by monetary quantities')
+
+    __rdiv__ = __rtruediv__
+
+    # Comparison operators, returning boolean arrays
+    def __eq__(self, other):
+        if isinstance(other, MoneyArray):
+            if len(other) != len(self):
+                raise ValueError('Cannot compare MoneyArrays of lengths {} and {}'.format(len(self), len(other)))
+            return (self._amounts == other._amounts) & (self._currencies == other._currencies)
+        if isinstance(other, Money):
+            return (self._amounts == other.amount) & (self._currencies == other.currency.code)
+        return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return ~result
+
+    __hash__ = None
+
+    def _compare(self, other, op):
+        if isinstance(other, (Money, MoneyArray)):
+            other = self._other_amounts(other)
+        else:
+            other = _to_decimals(other)
+        return op(self._amounts, other).astype(bool)
+
+    def __lt__(self, other):
+        return self._compare(other, np.less)
+
+    def __gt__(self, other):
+        return self._compare(other, np.greater)
+
+    def __le__(self, other):
+        return self._compare(other, np.less_equal)
+
+    def __ge__(self, other):
+        return self._compare(other, np.greater_equal)
+
+    def _groups(self):
+        """
+        Yields each distinct currency with the mask of its elements.
+        """
+        codes, inverse = np.unique(self._currencies, return_inverse=True)
+        for i, code in enumerate(codes):
+            yield Currency.get_by_code(code), inverse == i
+
+    def sum(self):
+        """
+        Totals per currency
+        :return: dict mapping currency codes to Money
+        """
+        return {
+            currency.code: Money._make(sum(self._amounts[mask], Decimal(0)), currency)
+            for currency, mask in self._groups()
+        }
+
+    def round(self, n=None):
+        """
+        Rounds each amount to `n` decimals or, by default, to the decimals of
+        its currency, with the currency rounding mode.
+        """
+        amounts = np.empty(len(self), dtype=object)
+        for currency, mask in self._groups():
+            exponent = currency.exponent if n is None else Decimal(10) ** -n
+            rounding = currency.rounding
+            quantize = np.frompyfunc(lambda value: value.quantize(exponent, rounding=rounding), 1, 1)
+            amounts[mask] = quantize(self._amounts[mask])
+        return self._make(amounts, self._currencies)
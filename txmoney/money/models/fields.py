@@ -107,7 +107,7 @@ def setup_default(default, default_currency, nullable):
             # 'amount'
             amount = default
             currency = default_currency
-        default = Money(Decimal(amount), Currency(code=currency))
+        default = Money(Decimal(amount), currency)
     elif isinstance(default, (float, Decimal, int)):
         default = Money(default, default_currency)
     if not (nullable and default is None) and not isinstance(default, Money):
@@ -136,6 +136,11 @@ class MoneyFieldProxy(object):
         currency_value = obj.__dict__[self.currency_field_name]
         if amount_value is None:
             return None
+        if isinstance(amount_value, Decimal) and amount_value.is_finite() and currency_value:
+            # Amount has already been cleaned by `to_python`, skip Money input parsing
+            if not isinstance(currency_value, Currency):
+                currency_value = Currency.get_by_code(currency_value)
+            return Money._make(amount_value, currency_value)
         return Money(amount=amount_value, currency=currency_value)
 
     def __get__(self, obj, *args):
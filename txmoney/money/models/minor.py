@@ -0,0 +1,261 @@
+# coding=utf-8
+from __future__ import absolute_import, division, unicode_literals
+
+from decimal import (
+    ROUND_05UP, ROUND_CEILING, ROUND_FLOOR, ROUND_HALF_DOWN, ROUND_HALF_EVEN,
+    ROUND_HALF_UP, ROUND_UP, Decimal
+)
+
+from django.utils.six import integer_types, python_2_unicode_compatible
+
+from ...settings import get_settings
+from ..exceptions import (
+    CurrencyMismatch, IncorrectMoneyInputError, InvalidMoneyOperation
+)
+from .allocation import allocate_units, integer_weights
+from .money import Currency, Money
+
+
+def _div_round(numerator, denominator, rounding):
+    """
+    Integer division rounding with a `decimal` module ROUND_* mode.
+    `denominator` must be positive.
+    """
+    quotient, remainder = divmod(abs(numerator), denominator)
+    negative = numerator < 0
+    if not remainder:
+        up = False
+    elif rounding in (ROUND_HALF_UP, ROUND_HALF_DOWN, ROUND_HALF_EVEN):
+        twice = 2 * remainder
+        up = twice > denominator or twice == denominator and (
+            rounding == ROUND_HALF_UP or rounding == ROUND_HALF_EVEN and quotient % 2 == 1
+        )
+    elif rounding == ROUND_05UP:
+        up = quotient % 5 == 0
+    else:
+        up = rounding == ROUND_UP or rounding == (ROUND_FLOOR if negative else ROUND_CEILING)
+    if up:
+        quotient += 1
+    return -quotient if negative else quotient
+
+
+@python_2_unicode_compatible
+class MinorUnitMoney(object):
+    """
+    A MinorUnitMoney stores an amount as an integer number of the currency
+    minor units (cents for EUR, units for JPY), so additions, subtractions,
+    comparisons and hashing are plain integer operations.
+
+    The following are supported:
+        MinorUnitMoney(1050, 'EUR')                     # 10.50 EUR
+        MinorUnitMoney.from_money(Money('10.50 EUR'))   # 10.50 EUR
+        MinorUnitMoney(1050, 'EUR').to_money()          # Money 10.50 EUR
+
+    MinorUnitMoney instances are immutable.
+    """
+
+    __slots__ = ('_units', '_currency')
+
+    def __init__(self, units=0, currency=None):
+        if isinstance(units, bool) or not isinstance(units, integer_types):
+            raise IncorrectMoneyInputError('Minor units must be an integer, got {!r}'.format(units))
+
+        currency = currency or get_settings().DEFAULT_CURRENCY
+
+        if not isinstance(currency, Currency):
+            currency = Currency.get_by_code(currency)
+
+        object.__setattr__(self, '_units', units)
+        object.__setattr__(self, '_currency', currency)
+
+    @classmethod
+    def _make(cls, units, currency):
+        """
+        Trusted constructor that skips all input validation.
+        """
+        money = _new(cls)
+        _set_units(money, units)
+        _set_currency(money, currency)
+        return money
+
+    @classmethod
+    def from_money(cls, money):
+        """
+        Converts a Money into minor units. The conversion must be lossless,
+        round the Money first if it has more decimals than its currency.
+        """
+        currency = money.currency
+        units = money.amount.scaleb(currency.decimals)
+        if units != units.to_integral_value():
+            raise IncorrectMoneyInputError(
+                'Cannot represent {} in {} minor units without rounding'.format(money, currency)
+            )
+        return cls._make(int(units), currency)
+
+    def to_money(self):
+        """
+        Converts back into a Decimal based Money.
+        """
+        return Money._make(self.amount, self._currency)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('MinorUnitMoney instances are immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError('MinorUnitMoney instances are immutable')
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return self.__class__, (self._units, self._currency)
+
+    @property
+    def units(self):
+        """
+        Amount in currency minor units
+        :return: int
+        """
+        return self._units
+
+    @property
+    def amount(self):
+        """
+        Amount with currency precision
+        :return: decimal
+        """
+        return Decimal(self._units).scaleb(-self._currency.decimals)
+
+    @property
+    def currency(self):
+        return self._currency
+
+    def _currency_check(self, other):
+        """ Compare the currencies matches and raise if not """
+        if self._currency is not other._currency and self._currency != other._currency:
+            raise CurrencyMismatch('Currency mismatch: {} != {}'.format(self._currency, other._currency))
+
+    def __str__(self):
+        return '{} {}'.format(self.amount, self._currency)
+
+    def __repr__(self):
+        return str(self)
+
+    def __pos__(self):
+        return self
+
+    def __neg__(self):
+        return self._make(-self._units, self._currency)
+
+    def __abs__(self):
+        return self._make(abs(self._units), self._currency)
+
+    def __add__(self, other):
+        if isinstance(other, MinorUnitMoney):
+            self._currency_check(other)
+            return self._make(self._units + other._units, self._currency)
+        raise InvalidMoneyOperation('Cannot add {!r} to minor unit quantities'.format(other))
+
+    def __radd__(self, other):
+        # Allow the builtin sum(), which starts from 0
+        if other == 0 and not isinstance(other, bool):
+            return self
+        return NotImplemented
+
+    def __sub__(self, other):
+        if isinstance(other, MinorUnitMoney):
+            self._currency_check(other)
+            return self._make(self._units - other._units, self._currency)
+        raise InvalidMoneyOperation('Cannot subtract {!r} from minor unit quantities'.format(other))
+
+    def __mul__(self, other):
+        if isinstance(other, MinorUnitMoney):
+            raise InvalidMoneyOperation('Cannot multiply monetary quantities')
+        if isinstance(other, integer_types) and not isinstance(other, bool):
+            return self._make(self._units * other, self._currency)
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        raise InvalidMoneyOperation('Division not supported for minor unit quantities, use allocate')
+
+    __div__ = __floordiv__ = __rtruediv__ = __rdiv__ = __truediv__
+
+    # Boolean
+    def __bool__(self):
+        return self._units != 0
+
+    __nonzero__ = __bool__
+
+    # Comparison operators
+    def __eq__(self, other):
+        if isinstance(other, MinorUnitMoney):
+            return self._units == other._units and (
+                self._currency is other._currency or self._currency == other._currency
+            )
+        # Allow comparison to 0
+        return self._units == 0 and other == 0 and not isinstance(other, bool)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        if self._units == 0:
+            # Consistent with the equality to 0
+            return hash(0)
+        return hash((self._units, self._currency.code))
+
+    def __lt__(self, other):
+        if isinstance(other, MinorUnitMoney):
+            self._currency_check(other)
+            return self._units < other._units
+        return NotImplemented
+
+    def __gt__(self, other):
+        if isinstance(other, MinorUnitMoney):
+            self._currency_check(other)
+            return self._units > other._units
+        return NotImplemented
+
+    def __le__(self, other):
+        if isinstance(other, MinorUnitMoney):
+            self._currency_check(other)
+            return self._units <= other._units
+        return NotImplemented
+
+    def __ge__(self, other):
+        if isinstance(other, MinorUnitMoney):
+            self._currency_check(other)
+            return self._units >= other._units
+        return NotImplemented
+
+    def round(self, n=None):
+        """
+        Rounds to `n` decimals with the currency rounding mode, as Money.round,
+        keeping the value in minor units.
+        """
+        n = self._currency.decimals if n is None else n
+        shift = self._currency.decimals - n
+        if shift <= 0:
+            return self
+        step = 10 ** shift
+        return self._make(_div_round(self._units, step, self._currency.rounding) * step, self._currency)
+
+    def allocate(self, ratios):
+        """
+        Allocates a sum of money with the largest remainder method
+        :param ratios: allocation ratios (ints, Decimals or Fractions)
+        :return: MinorUnitMoney list of allocated money
+        """
+        return [
+            self._make(units, self._currency) for units in allocate_units(self._units, integer_weights(ratios))
+        ]
+
+
+_new = object.__new__
+_set_units = MinorUnitMoney._units.__set__
+_set_currency = MinorUnitMoney._currency.__set__
@@ -1,19 +1,53 @@
 # coding=utf-8
 from __future__ import absolute_import, division, unicode_literals
 
+import re
 from datetime import date
-from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from decimal import (
+    ROUND_05UP, ROUND_CEILING, ROUND_DOWN, ROUND_FLOOR, ROUND_HALF_DOWN,
+    ROUND_HALF_EVEN, ROUND_HALF_UP, ROUND_UP, Decimal, InvalidOperation
+)
+from threading import Lock
 
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
 from django.utils.encoding import smart_text
 from django.utils.six import python_2_unicode_compatible, string_types
-from django.utils.translation import ugettext_lazy as _
 
 from ...rates.utils import exchange_ratio
+from ...settings import get_settings
 from ...settings import txmoney_settings as settings
 from ..exceptions import (
     CurrencyDoesNotExist, CurrencyMismatch, IncorrectMoneyInputError,
     InvalidMoneyOperation
 )
+from .allocation import allocate
+
+try:
+    from collections.abc import Mapping
+except ImportError:  # Python 2
+    from collections import Mapping
+
+
+# '123.45 EUR', '-1e3EUR' or '123.45' (in the default currency)
+MONEY_RE = re.compile(r'^\s*([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)\s*([A-Za-z]{3})?\s*$')
+
+PARSE_ERRORS = ('raise', 'coerce', 'skip')
+
+ROUNDING_MODES = (
+    ROUND_05UP, ROUND_CEILING, ROUND_DOWN, ROUND_FLOOR, ROUND_HALF_DOWN, ROUND_HALF_EVEN, ROUND_HALF_UP, ROUND_UP
+)
+
+
+def get_rounding(code, rounding=None):
+    """
+    Rounding mode for a currency: `rounding` if given, otherwise the one set
+    for the currency in CURRENCY_ROUNDING or DEFAULT_ROUNDING.
+    """
+    rounding = rounding or get_settings().CURRENCY_ROUNDING.get(code) or get_settings().DEFAULT_ROUNDING
+    if rounding not in ROUNDING_MODES:
+        raise ImproperlyConfigured("Invalid rounding mode '{}' for currency {}".format(rounding, code))
+    return rounding
 
 
 class Currency(object):
@@ -22,22 +56,61 @@ class Currency(object):
     used in one or more states/countries. A Currency instance
     encapsulates the related data of: the ISO 4217 currency/numeric code, a
     canonical name, the currency symbol, used decimals and countries the currency is used in.
+
+    Currencies are immutable. The ones in the ``CURRENCIES`` registry are
+    singletons, so ``Currency.get_by_code`` always returns the same instance
+    for a code and equality checks can short-circuit on identity.
+
+    Each currency also holds its rounding plan: the `exponent` amounts are
+    quantized to, the `rounding` mode and the minor unit `scale`. Unless
+    given, the rounding mode comes from the DEFAULT_ROUNDING and
+    CURRENCY_ROUNDING settings.
     """
 
-    def __init__(self, code, numeric='', name='', symbol='', decimals=2, countries=None):
-        if not countries:
-            countries = []
-        self.code = code
-        self.numeric = numeric
-        self.name = name
-        self.symbol = symbol
-        self.decimals = decimals
-        self.countries = countries
+    __slots__ = (
+        'code', 'numeric', 'name', 'symbol', 'decimals', 'countries', 'exponent', 'scale', 'rounding', '_rounding'
+    )
+
+    def __init__(self, code, numeric='', name='', symbol='', decimals=2, countries=None, rounding=None):
+        decimals = int(decimals)
+        _setattr = object.__setattr__
+        _setattr(self, 'code', code)
+        _setattr(self, 'numeric', numeric)
+        _setattr(self, 'name', name)
+        _setattr(self, 'symbol', symbol)
+        _setattr(self, 'decimals', decimals)
+        _setattr(self, 'countries', tuple(countries or ()))
+        _setattr(self, 'exponent', Decimal(10) ** -decimals)
+        _setattr(self, 'scale', 10 ** decimals)
+        _setattr(self, '_rounding', rounding)
+        _setattr(self, 'rounding', get_rounding(code, rounding))
+
+    def __setattr__(self, name, value):
+        raise AttributeError('Currency instances are immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError('Currency instances are immutable')
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        if self.code in CURRENCIES and CURRENCIES[self.code] is self:
+            # Keep registered currencies as singletons across pickling
+            return Currency.get_by_code, (self.code,)
+        return Currency, (
+            self.code, self.numeric, self.name, self.symbol, self.decimals, self.countries, self._rounding
+        )
 
     def __repr__(self):
         return self.code
 
     def __eq__(self, other):
+        if self is other:
+            return True
         if isinstance(other, Currency):
             return self.code and other.code and self.code == other.code
         if isinstance(other, string_types):
@@ -47,23 +120,178 @@ class Currency(object):
     def __ne__(self, other):
         return not self.__eq__(other)
 
+    def __hash__(self):
+        # Consistent with the equality to the currency code
+        return hash(self.code)
+
+    def quantize(self, amount):
+        """
+        Rounds a Decimal to the currency precision.
+        """
+        return amount.quantize(self.exponent, rounding=self.rounding)
+
     @staticmethod
     def get_by_code(code):
         """
         Search a currency by its code.
         :param code: (String) ISO 4217 currency code
         """
-        try:
-            return CURRENCIES[str(code).upper()]
-        except KeyError:
-            raise CurrencyDoesNotExist(code)
+        return CURRENCIES.get_by_code(code)
+
+    @staticmethod
+    def get_by_numeric(numeric):
+        """
+        Search a currency by its numeric code.
+        :param numeric: (String or int) ISO 4217 numeric code
+        """
+        return CURRENCIES.get_by_numeric(numeric)
+
+    @staticmethod
+    def get_by_country(country):
+        """
+        Search the currencies used in a country.
+        :param country: (String) country name, as in `Currency.countries`
+        :return: tuple of Currency
+        """
+        return CURRENCIES.get_by_country(country)
 
     @staticmethod
     def all():
         """
         Get all system currencies.
         """
-        return CURRENCIES
+        return dict(CURRENCIES)
+
+
+class CurrencyRegistry(Mapping):
+    """
+    Read-only mapping of currency codes to the system currencies, with
+    secondary indexes by ISO numeric code and by country.
+
+    The ISO 4217 currencies are only built on first access, so importing
+    TXMoney doesn't pay for them. More currencies can be added with
+    `register_currency`.
+    """
+
+    def __init__(self, loader):
+        self._loader = loader
+        self._lock = Lock()
+        self._by_code = None
+        self._by_numeric = {}
+        self._by_country = {}
+
+    @property
+    def loaded(self):
+        return self._by_code is not None
+
+    def _load(self):
+        with self._lock:
+            if self._by_code is None:
+                by_code = {}
+                for currency in self._loader().values():
+                    self._index(by_code, currency)
+                self._by_code = by_code
+        return self._by_code
+
+    @staticmethod
+    def _numeric_key(numeric):
+        try:
+            return '{:03d}'.format(int(numeric))
+        except (TypeError, ValueError):
+            return None
+
+    def _index(self, by_code, currency):
+        by_code[currency.code] = currency
+        numeric = self._numeric_key(currency.numeric)
+        if numeric:
+            self._by_numeric[numeric] = currency
+        for country in currency.countries:
+            key = country.upper()
+            self._by_country[key] = tuple(
+                c for c in self._by_country.get(key, ()) if c.code != currency.code
+            ) + (currency,)
+
+    def _unindex(self, by_code, currency):
+        del by_code[currency.code]
+        numeric = self._numeric_key(currency.numeric)
+        if numeric and self._by_numeric.get(numeric) is currency:
+            del self._by_numeric[numeric]
+        for country in currency.countries:
+            key = country.upper()
+            currencies = tuple(c for c in self._by_country.get(key, ()) if c is not currency)
+            if currencies:
+                self._by_country[key] = currencies
+            else:
+                self._by_country.pop(key, None)
+
+    def register(self, currency, replace=False):
+        """
+        Adds a currency to the registry.
+
+        Raises ValueError if there is already a currency with the same code,
+        unless `replace` is set.
+        """
+        by_code = self._by_code or self._load()
+        with self._lock:
+            if currency.code in by_code:
+                if not replace:
+                    raise ValueError('Currency {} is already registered'.format(currency.code))
+                self._unindex(by_code, by_code[currency.code])
+            self._index(by_code, currency)
+        return currency
+
+    def get_by_code(self, code):
+        by_code = self._by_code or self._load()
+        try:
+            # Fast path for already normalized codes
+            return by_code[code]
+        except (KeyError, TypeError):
+            pass
+        try:
+            return by_code[str(code).upper()]
+        except KeyError:
+            raise CurrencyDoesNotExist(code)
+
+    def get_by_numeric(self, numeric):
+        if not self.loaded:
+            self._load()
+        try:
+            return self._by_numeric[self._numeric_key(numeric)]
+        except KeyError:
+            raise CurrencyDoesNotExist(numeric)
+
+    def get_by_country(self, country):
+        if not self.loaded:
+            self._load()
+        return self._by_country.get(country.upper(), ())
+
+    def __getitem__(self, code):
+        return (self._by_code or self._load())[code]
+
+    def __contains__(self, code):
+        return code in (self._by_code or self._load())
+
+    def __iter__(self):
+        return iter(self._by_code or self._load())
+
+    def __len__(self):
+        return len(self._by_code or self._load())
+
+
+def _load_currencies():
+    from .currencies import load_currencies
+    return load_currencies()
+
+
+CURRENCIES = CurrencyRegistry(_load_currencies)
+
+
+def register_currency(currency, replace=False):
+    """
+    Makes a currency available to `Currency.get_by_code` and the rest of
+    lookups. Usually called from an AppConfig.ready method.
+    """
+    return CURRENCIES.register(currency, replace)
 
 
 @python_2_unicode_compatible
@@ -92,16 +320,20 @@ class Money(object):
 
         # native types
         Money(Decimal('123.0'), Currency(code='AAA', name='My Currency')  # 123.0 AAA
+
+    Money instances are immutable and hashable, equal Money (and zero Money
+    and 0) have the same hash.
     """
 
+    __slots__ = ('_amount', '_currency', '_str')
+
     def __init__(self, amount=Decimal(0.0), currency=None):
         if isinstance(amount, Decimal):
             if amount in (Decimal('Inf'), Decimal('-Inf')):
                 raise IncorrectMoneyInputError("Cannot initialize '%s' with infinity amount" % currency)
-            self._amount = amount
         else:
             try:
-                self._amount = Decimal(smart_text(amount).strip())
+                amount = Decimal(smart_text(amount).strip())
             except InvalidOperation:
                 try:
                     # check for the odd case of Money("123.00 EUR", "USD")
@@ -110,17 +342,46 @@ class Money(object):
                             'Initialized with conflicting currencies {} {}'.format(currency, amount)
                         )
 
-                    self._amount, currency = self._from_string(amount)
+                    amount, currency = self._from_string(amount)
                 except:
                     raise IncorrectMoneyInputError('Cannot initialize with amount {}'.format(amount))
 
-        currency = currency or settings.DEFAULT_CURRENCY
+        currency = currency or get_settings().DEFAULT_CURRENCY
 
         if not isinstance(currency, Currency):
             currency = Currency.get_by_code(currency)
 
-        self._currency = currency
-        assert isinstance(self._amount, Decimal)
+        assert isinstance(amount, Decimal)
+        object.__setattr__(self, '_amount', amount)
+        object.__setattr__(self, '_currency', currency)
+
+    @classmethod
+    def _make(cls, amount, currency):
+        """
+        Trusted constructor that skips all input parsing and validation.
+
+        Used by the arithmetic operators and the model field, where `amount`
+        is already a finite Decimal and `currency` a Currency instance.
+        """
+        money = _new(cls)
+        _set_amount(money, amount)
+        _set_currency(money, currency)
+        return money
+
+    def __setattr__(self, name, value):
+        raise AttributeError('Money instances are immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError('Money instances are immutable')
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return self.__class__, (self._amount, self._currency)
 
     @property
     def amount(self):
@@ -135,8 +396,8 @@ class Money(object):
         """
         Amount with currency precision
         """
-        decimals = Decimal(10) ** -self._currency.decimals
-        return self._amount.quantize(decimals, rounding=ROUND_HALF_UP)
+        currency = self._currency
+        return self._amount.quantize(currency.exponent, rounding=currency.rounding)
 
     @property
     def currency(self):
@@ -147,7 +408,7 @@ class Money(object):
         s = str(value).strip()
         try:
             amount = Decimal(s)
-            currency = settings.DEFAULT_CURRENCY
+            currency = get_settings().DEFAULT_CURRENCY
         except InvalidOperation:
             try:
                 amount = Decimal(s[:len(s) - 3].strip())
@@ -164,13 +425,94 @@ class Money(object):
         """
         return Money(*cls._from_string(value))
 
+    @classmethod
+    def parse_many(cls, values, default_currency=None, errors='raise', as_array=False):
+        """
+        Parses an iterable of strings formatted as '123.45 EUR' (or '123.45',
+        in `default_currency`) with a single regular expression, resolving
+        each currency code once.
+
+        :param errors: what to do with values that cannot be parsed: 'raise'
+            IncorrectMoneyInputError, 'coerce' them to None or 'skip' them
+        :param as_array: return a MoneyArray instead of a list, requires NumPy
+        :return: Money list, or MoneyArray
+        """
+        if errors not in PARSE_ERRORS:
+            raise ValueError('errors must be one of {}, got {!r}'.format(', '.join(PARSE_ERRORS), errors))
+        if as_array and errors == 'coerce':
+            raise ValueError("A MoneyArray cannot hold coerced values, use errors='skip'")
+
+        default_currency = default_currency or get_settings().DEFAULT_CURRENCY
+        if not isinstance(default_currency, Currency):
+            default_currency = Currency.get_by_code(default_currency)
+
+        match = MONEY_RE.match
+        make = cls._make
+        currencies = {None: default_currency}
+        results = []
+        append = results.append
+        for index, value in enumerate(values):
+            parsed = match(value) if isinstance(value, string_types) else None
+            if parsed is not None:
+                amount, code = parsed.groups()
+                try:
+                    currency = currencies[code]
+                except KeyError:
+                    try:
+                        currency = currencies[code] = CURRENCIES.get_by_code(code)
+                    except CurrencyDoesNotExist:
+                        currency = None
+                if currency is not None:
+                    append(make(Decimal(amount), currency))
+                    continue
+            if errors == 'raise':
+                raise IncorrectMoneyInputError(
+                    'The value {!r} at index {} is not properly formatted as "123.45 XXX"'.format(value, index)
+                )
+            if errors == 'coerce':
+                append(None)
+
+        if as_array:
+            from .array import MoneyArray
+            return MoneyArray.from_moneys(results)
+        return results
+
+    @classmethod
+    def sum(cls, moneys, currency=None):
+        """
+        Adds up an iterable of Money without building intermediate Money
+        instances. All of them must be in `currency`, or in the currency of
+        the first one when it is not given.
+
+        An empty iterable adds up to zero in `currency` or the default currency.
+        """
+        if currency is not None and not isinstance(currency, Currency):
+            currency = Currency.get_by_code(currency)
+
+        total = Decimal(0)
+        for money in moneys:
+            if money._currency is not currency:
+                if currency is None:
+                    currency = money._currency
+                elif money._currency != currency:
+                    raise CurrencyMismatch('Currency mismatch: {} != {}'.format(currency, money._currency))
+            total += money._amount
+
+        return cls._make(total, currency or Currency.get_by_code(get_settings().DEFAULT_CURRENCY))
+
     def _currency_check(self, other):
         """ Compare the currencies matches and raise if not """
-        if self._currency != other.currency:
+        if self._currency is not other.currency and self._currency != other.currency:
             raise CurrencyMismatch('Currency mismatch: {} != {}'.format(self._currency, other.currency))
 
     def __str__(self):
-        return '{} {}'.format(self._amount, self._currency)
+        # Built on first use only, most Money are never printed
+        try:
+            return self._str
+        except AttributeError:
+            text = '{} {}'.format(self._amount, self._currency)
+            _set_str(self, text)
+            return text
 
     def __repr__(self):
         return str(self)
@@ -182,27 +524,27 @@ class Money(object):
         return int(self._amount)
 
     def __pos__(self):
-        return Money(amount=self._amount, currency=self._currency)
+        return Money._make(self._amount, self._currency)
 
     def __neg__(self):
-        return self.__class__(-self._amount, self._currency)
+        return self._make(-self._amount, self._currency)
 
     def __abs__(self):
-        return Money(amount=abs(self._amount), currency=self._currency)
+        return Money._make(abs(self._amount), self._currency)
 
     def __add__(self, other):
         if isinstance(other, Money):
             self._currency_check(other)
-            return Money(amount=self._amount + other.amount, currency=self._currency)
+            return Money._make(self._amount + other._amount, self._currency)
         else:
-            return Money(amount=self._amount + Decimal(str(other)), currency=self._currency)
+            return Money._make(self._amount + Decimal(str(other)), self._currency)
 
     def __sub__(self, other):
         if isinstance(other, Money):
             self._currency_check(other)
-            return Money(amount=self._amount - other.amount, currency=self._currency)
+            return Money._make(self._amount - other._amount, self._currency)
         else:
-            return Money(amount=self._amount - Decimal(str(other)), currency=self._currency)
+            return Money._make(self._amount - Decimal(str(other)), self._currency)
 
     def __rsub__(self, other):
         # In the case where both values are Money, the left hand one will be
@@ -213,7 +555,7 @@ class Money(object):
     def __mul__(self, other):
         if isinstance(other, Money):
             raise InvalidMoneyOperation('Cannot multiply monetary quantities')
-        return Money(amount=self._amount * Decimal(str(other)), currency=self._currency)
+        return Money._make(self._amount * Decimal(str(other)), self._currency)
 
     def __truediv__(self, other):
         """
@@ -222,7 +564,7 @@ class Money(object):
         """
         if isinstance(other, Money):
             raise InvalidMoneyOperation('Cannot divide two monetary quantities')
-        return Money(amount=self._amount / other, currency=self._currency)
+        return Money._make(self._amount / other, self._currency)
 
     __div__ = __truediv__
 
@@ -256,6 +598,12 @@ class Money(object):
     def __ne__(self, other):
         return not self.__eq__(other)
 
+    def __hash__(self):
+        if self._amount == 0:
+            # Consistent with the equality to 0
+            return hash(0)
+        return hash((self._amount, self._currency.code))
+
     def __lt__(self, other):
         if isinstance(other, Money):
             self._currency_check(other)
@@ -277,518 +625,81 @@ class Money(object):
         return self > other or self == other
 
     def round(self, n=None):
-        n = n or self._currency.decimals
-        decimals = Decimal(10) ** -n
-        return self.__class__(self._amount.quantize(decimals, rounding=ROUND_HALF_UP), self._currency)
+        """
+        Rounds to `n` decimals, by default the currency ones, with the
+        currency rounding mode.
+        """
+        currency = self._currency
+        exponent = currency.exponent if n is None else Decimal(10) ** -n
+        return self._make(self._amount.quantize(exponent, rounding=currency.rounding), currency)
 
     def allocate(self, ratios):
         """
-        Allocates a sum of money
-        :param ratios: allocation ratios
+        Allocates a sum of money with the largest remainder method. Shares are
+        rounded to the currency minor units (or to the amount decimals if it
+        has more) and add up exactly to the original amount.
+        :param ratios: allocation ratios (ints, Decimals or Fractions)
         :return: Money list of allocated money
         """
-        total = sum(ratios)
-        remainder = self._amount
-        results = []
-
-        for i in range(0, len(ratios)):
-            results.append(Money(self._amount * ratios[i] / total, self._currency))
-            remainder -= results[i].amount
+        return allocate(self, ratios)
 
-        results[-1] = Money(results[-1].amount + remainder, self._currency)
-
-        return results
-
-    def exchange_to(self, currency=settings.DEFAULT_CURRENCY, rate_date=date.today()):
+    def exchange_to(self, currency=settings.DEFAULT_CURRENCY, rate_date=None, snapshot=None, source=None):
         """
-        Exchange money object to given currency for a date.
+        Exchange money object to given currency for a date, or with the rates
+        of a RateSnapshot. Rates come from `source` if given, see exchange_ratio.
 
         By default exchange money to system currency for today.
         """
         if not isinstance(currency, Currency):
             currency = Currency.get_by_code(currency)
+        rate_date = rate_date or date.today()
 
-        amount = self._amount * exchange_ratio(self._currency, currency, rate_date)
-
-        return self.__class__(amount, currency)
-
-
-# Definitions of ISO 4217 Currencies
-# Source: http://www.xe.com/iso4217.php
-# Symbols: http://www.xe.com/symbols.php
-CURRENCIES = {
-    'AED': Currency(code='AED', numeric='784', decimals=2, symbol='د.إ', name=_('UAE Dirham'),
-                    countries=['UNITED ARAB EMIRATES']),
-    'AFN': Currency(code='AFN', numeric='971', decimals=2, symbol='؋',
-                    name=_('Afghani'),
-                    countries=['AFGHANISTAN']),
-    'ALL': Currency(code='ALL', numeric='008', decimals=2, symbol='Lek', name=_('Lek'),
-                    countries=['ALBANIA']),
-    'AMD': Currency(code='AMD', numeric='051', decimals=2, symbol='֏', name=_('Armenian Dram'),
-                    countries=['ARMENIA']),
-    'ANG': Currency(code='ANG', numeric='532', decimals=2, symbol='ƒ',
-                    name=_('Netherlands Antillean Guilder'),
-                    countries=['CURA\xc7AO', 'SINT MAARTEN (DUTCH PART)']),
-    'AOA': Currency(code='AOA', numeric='973', decimals=2, symbol='', name=_('Kwanza'),
-                    countries=['ANGOLA']),
-    'ARS': Currency(code='ARS', numeric='032', decimals=2, symbol='$', name=_('Argentine Peso'),
-                    countries=['ARGENTINA']),
-    'AUD': Currency(code='AUD', numeric='036', decimals=2, symbol='$',
-                    name=_('Australian Dollar'),
-                    countries=['AUSTRALIA', 'CHRISTMAS ISLAND',
-                               'COCOS (KEELING) ISLANDS',
-                               'HEARD ISLAND AND McDONALD ISLANDS', 'KIRIBATI',
-                               'NAUR', 'NORFOLK ISLAND',
-                               'TUVAL']),
-    'AWG': Currency(code='AWG', numeric='533', decimals=2, symbol='ƒ',
-                    name=_('Aruban Florin'),
-                    countries=['ARUBA']),
-    'AZN': Currency(code='AZN', numeric='944', decimals=2, symbol='ман',
-                    name=_('Azerbaijanian Manat'),
-                    countries=['AZERBAIJAN']),
-    'BAM': Currency(code='BAM', numeric='977', decimals=2, symbol='KM',
-                    name=_('Convertible Mark'),
-                    countries=['BOSNIA AND HERZEGOVINA']),
-    'BBD': Currency(code='BBD', numeric='052', decimals=2, symbol='$',
-                    name=_('Barbados Dollar'),
-                    countries=['BARBADOS']),
-    'BDT': Currency(code='BDT', numeric='050', decimals=2, symbol='৳', name=_('Taka'),
-                    countries=['BANGLADESH']),
-    'BGN': Currency(code='BGN', numeric='975', decimals=2, symbol='лв',
-                    name=_('Bulgarian Lev'),
-                    countries=['BULGARIA']),
-    'BHD': Currency(code='BHD', numeric='048', decimals=3, symbol='',
-                    name=_('Bahraini Dinar'),
-                    countries=['BAHRAIN']),
-    'BIF': Currency(code='BIF', numeric='108', decimals=0, symbol='',
-                    name=_('Burundi Franc'),
-                    countries=['BURUNDI']),
-    'BMD': Currency(code='BMD', numeric='060', decimals=2, symbol='$',
-                    name=_('Bermudian Dollar'),
-                    countries=['BERMUDA']),
-    'BND': Currency(code='BND', numeric='096', decimals=2, symbol='$',
-                    name=_('Brunei Dollar'),
-                    countries=['BRUNEI DARUSSALAM']),
-    'BOB': Currency(code='BOB', numeric='068', decimals=2, symbol='$b',
-                    name=_('Boliviano'),
-                    countries=['BOLIVIA, PLURINATIONAL STATE OF']),
-    'BRL': Currency(code='BRL', numeric='986', decimals=2, symbol='R$',
-                    name=_('Brazilian Real'),
-                    countries=['BRAZIL']), 'BSD': Currency(code='BSD', numeric='044', decimals=2, symbol='$',
-                                                           name=_('Bahamian Dollar'),
-                                                           countries=['BAHAMAS']),
-    'BTN': Currency(code='BTN', numeric='064', decimals=2, symbol='',
-                    name=_('Ngultrum'),
-                    countries=['BHUTAN']),
-    'BWP': Currency(code='BWP', numeric='072', decimals=2, symbol='P', name=_('Pula'),
-                    countries=['BOTSWANA']),
-    'BYR': Currency(code='BYR', numeric='974', decimals=0, symbol='p.',
-                    name=_('Belarussian Ruble'),
-                    countries=['BELARUS']),
-    'BZD': Currency(code='BZD', numeric='084', decimals=2, symbol='BZ$',
-                    name=_('Belize Dollar'),
-                    countries=['BELIZE']),
-    'CAD': Currency(code='CAD', numeric='124', decimals=2, symbol='$',
-                    name=_('Canadian Dollar'),
-                    countries=['CANADA']),
-    'CDF': Currency(code='CDF', numeric='976', decimals=2, symbol='',
-                    name=_('Congolese Franc'),
-                    countries=['CONGO, THE DEMOCRATIC REPUBLIC OF']),
-    'CHF': Currency(code='CHF', numeric='756', decimals=2, symbol='Fr.',
-                    name=_('Swiss Franc'),
-                    countries=['LIECHTENSTEIN', 'SWITZERLAND']),
-    'CLP': Currency(code='CLP', numeric='152', decimals=0, symbol='$',
-                    name=_('Chilean Peso'),
-                    countries=['CHILE']),
-    'CNY': Currency(code='CNY', numeric='156', decimals=2, symbol='¥',
-                    name=_('Yuan Renminbi'),
-                    countries=['CHINA']),
-    'COP': Currency(code='COP', numeric='170', decimals=2, symbol='$',
-                    name=_('Colombian Peso'),
-                    countries=['COLOMBIA']),
-    'CRC': Currency(code='CRC', numeric='188', decimals=2, symbol='₡',
-                    name=_('Costa Rican Colon'),
-                    countries=['COSTA RICA']),
-    'CUC': Currency(code='CUC', numeric='931', decimals=2, symbol='',
-                    name=_('Peso Convertible'),
-                    countries=['CUBA']),
-    'CUP': Currency(code='CUP', numeric='192', decimals=2, symbol='₱',
-                    name=_('Cuban Peso'),
-                    countries=['CUBA']),
-    'CVE': Currency(code='CVE', numeric='132', decimals=2, symbol='',
-                    name=_('Cape Verde Escudo'),
-                    countries=['CAPE VERDE']),
-    'CZK': Currency(code='CZK', numeric='203', decimals=2, symbol='Kč',
-                    name=_('Czech Koruna'),
-                    countries=['CZECH REPUBLIC']),
-    'DJF': Currency(code='DJF', numeric='262', decimals=0, symbol='',
-                    name=_('Djibouti Franc'),
-                    countries=['DJIBOUTI']),
-    'DKK': Currency(code='DKK', numeric='208', decimals=2, symbol='kr',
-                    name=_('Danish Krone'),
-                    countries=['DENMARK', 'FAROE ISLANDS', 'GREENLAND']),
-    'DOP': Currency(code='DOP', numeric='214', decimals=2, symbol='RD$',
-                    name=_('Dominican Peso'),
-                    countries=['DOMINICAN REPUBLIC']),
-    'DZD': Currency(code='DZD', numeric='012', decimals=2, symbol='',
-                    name=_('Algerian Dinar'),
-                    countries=['ALGERIA']),
-    'EGP': Currency(code='EGP', numeric='818', decimals=2, symbol='£',
-                    name=_('Egyptian Pound'),
-                    countries=['EGYPT']),
-    'ERN': Currency(code='ERN', numeric='232', decimals=2, symbol='', name=_('Nakfa'),
-                    countries=['ERITREA']),
-    'ETB': Currency(code='ETB', numeric='230', decimals=2, symbol='',
-                    name=_('Ethiopian Birr'),
-                    countries=['ETHIOPIA']),
-    'EUR': Currency(code='EUR', numeric='978', decimals=2, symbol='€', name=_('Euro'),
-                    countries=['ÅLAND ISLANDS', 'ANDORRA', 'AUSTRIA', 'BELGIUM',
-                               'CYPRUS', 'ESTONIA',
-                               'EUROPEAN UNION ', 'FINLAND', 'FRANCE',
-                               'FRENCH GUIANA',
-                               'FRENCH SOUTHERN TERRITORIES', 'GERMANY', 'GREECE',
-                               'GUADELOUPE',
-                               'HOLY SEE (VATICAN CITY STATE)', 'IRELAND', 'ITALY',
-                               'LATVIA', 'LITHUANIA',
-                               'LUXEMBOURG', 'MALTA', 'MARTINIQUE', 'MAYOTTE',
-                               'MONACO', 'MONTENEGRO',
-                               'NETHERLANDS', 'PORTUGAL', 'R\xc9UNION',
-                               'SAINT BARTH\xc9LEMY',
-                               'SAINT MARTIN (FRENCH PART)',
-                               'SAINT PIERRE AND MIQUELON', 'SAN MARINO',
-                               'SLOVAKIA', 'SLOVENIA', 'SPAIN',
-                               'Vatican City State (HOLY SEE)']),
-    'FJD': Currency(code='FJD', numeric='242', decimals=2, symbol='$',
-                    name=_('Fiji Dollar'),
-                    countries=['FIJI']),
-    'FKP': Currency(code='FKP', numeric='238', decimals=2, symbol='£',
-                    name=_('Falkland Islands Pound'),
-                    countries=['FALKLAND ISLANDS (MALVINAS)']),
-    'GBP': Currency(code='GBP', numeric='826', decimals=2, symbol='£',
-                    name=_('Pound Sterling'),
-                    countries=['GUERNSEY', 'ISLE OF MAN', 'JERSEY', 'UNITED KINGDOM']),
-    'GEL': Currency(code='GEL', numeric='981', decimals=2, symbol='', name=_('Lari'),
-                    countries=['GEORGIA']),
-    'GHS': Currency(code='GHS', numeric='936', decimals=2, symbol='',
-                    name=_('Ghana Cedi'),
-                    countries=['GHANA']),
-    'GIP': Currency(code='GIP', numeric='292', decimals=2, symbol='£',
-                    name=_('Gibraltar Pound'),
-                    countries=['GIBRALTAR']),
-    'GMD': Currency(code='GMD', numeric='270', decimals=2, symbol='', name=_('Dalasi'),
-                    countries=['GAMBIA']),
-    'GNF': Currency(code='GNF', numeric='324', decimals=0, symbol='',
-                    name=_('Guinea Franc'),
-                    countries=['GUINEA']),
-    'GTQ': Currency(code='GTQ', numeric='320', decimals=2, symbol='Q',
-                    name=_('Quetzal'),
-                    countries=['GUATEMALA']),
-    'GYD': Currency(code='GYD', numeric='328', decimals=2, symbol='$',
-                    name=_('Guyana Dollar'),
-                    countries=['GUYANA']),
-    'HKD': Currency(code='HKD', numeric='344', decimals=2, symbol='HK$',
-                    name=_('Hong Kong Dollar'),
-                    countries=['HONG KONG']),
-    'HNL': Currency(code='HNL', numeric='340', decimals=2, symbol='L',
-                    name=_('Lempira'),
-                    countries=['HONDURAS']),
-    'HRK': Currency(code='HRK', numeric='191', decimals=2, symbol='kn',
-                    name=_('Croatian Kuna'),
-                    countries=['CROATIA']),
-    'HTG': Currency(code='HTG', numeric='332', decimals=2, symbol='', name=_('Gourde'),
-                    countries=['HAITI']),
-    'HUF': Currency(code='HUF', numeric='348', decimals=2, symbol='Ft',
-                    name=_('Forint'),
-                    countries=['HUNGARY']),
-    'IDR': Currency(code='IDR', numeric='360', decimals=2, symbol='Rp',
-                    name=_('Rupiah'),
-                    countries=['INDONESIA']),
-    'ILS': Currency(code='ILS', numeric='376', decimals=2, symbol='₪',
-                    name=_('New Israeli Sheqel'),
-                    countries=['ISRAEL']),
-    'INR': Currency(code='INR', numeric='356', decimals=2, symbol='',
-                    name=_('Indian Rupee'),
-                    countries=['BHUTAN', 'INDIA']),
-    'IQD': Currency(code='IQD', numeric='368', decimals=3, symbol='',
-                    name=_('Iraqi Dinar'),
-                    countries=['IRAQ']),
-    'IRR': Currency(code='IRR', numeric='364', decimals=2, symbol='﷼',
-                    name=_('Iranian Rial'),
-                    countries=['IRAN, ISLAMIC REPUBLIC OF']),
-    'ISK': Currency(code='ISK', numeric='352', decimals=0, symbol='kr',
-                    name=_('Iceland Krona'),
-                    countries=['ICELAND']),
-    'JMD': Currency(code='JMD', numeric='388', decimals=2, symbol='J$',
-                    name=_('Jamaican Dollar'),
-                    countries=['JAMAICA']),
-    'JOD': Currency(code='JOD', numeric='400', decimals=3, symbol='',
-                    name=_('Jordanian Dinar'),
-                    countries=['JORDAN']),
-    'JPY': Currency(code='JPY', numeric='392', decimals=0, symbol='¥', name=_('Yen'),
-                    countries=['JAPAN']),
-    'KES': Currency(code='KES', numeric='404', decimals=2, symbol='',
-                    name=_('Kenyan Shilling'),
-                    countries=['KENYA']),
-    'KGS': Currency(code='KGS', numeric='417', decimals=2, symbol='лв', name=_('Som'),
-                    countries=['KYRGYZSTAN']),
-    'KHR': Currency(code='KHR', numeric='116', decimals=2, symbol='៛', name=_('Riel'),
-                    countries=['CAMBODIA']),
-    'KMF': Currency(code='KMF', numeric='174', decimals=0, symbol='',
-                    name=_('Comoro Franc'),
-                    countries=['COMOROS']),
-    'KPW': Currency(code='KPW', numeric='408', decimals=2, symbol='₩',
-                    name=_('North Korean Won'),
-                    countries=['KOREA, DEMOCRATIC PEOPLE\u2019S REPUBLIC OF']),
-    'KRW': Currency(code='KRW', numeric='410', decimals=0, symbol='₩', name=_('Won'),
-                    countries=['KOREA, REPUBLIC OF']),
-    'KWD': Currency(code='KWD', numeric='414', decimals=3, symbol='',
-                    name=_('Kuwaiti Dinar'),
-                    countries=['KUWAIT']),
-    'KYD': Currency(code='KYD', numeric='136', decimals=2, symbol='$',
-                    name=_('Cayman Islands Dollar'),
-                    countries=['CAYMAN ISLANDS']),
-    'KZT': Currency(code='KZT', numeric='398', decimals=2, symbol='лв',
-                    name=_('Tenge'),
-                    countries=['KAZAKHSTAN']),
-    'LAK': Currency(code='LAK', numeric='418', decimals=2, symbol='₭', name=_('Kip'),
-                    countries=['LAO PEOPLE\u2019S DEMOCRATIC REPUBLIC']),
-    'LBP': Currency(code='LBP', numeric='422', decimals=2, symbol='£',
-                    name=_('Lebanese Pound'),
-                    countries=['LEBANON']),
-    'LKR': Currency(code='LKR', numeric='144', decimals=2, symbol='₨',
-                    name=_('Sri Lanka Rupee'),
-                    countries=['SRI LANKA']),
-    'LRD': Currency(code='LRD', numeric='430', decimals=2, symbol='$',
-                    name=_('Liberian Dollar'),
-                    countries=['LIBERIA']),
-    'LSL': Currency(code='LSL', numeric='426', decimals=2, symbol='', name=_('Loti'),
-                    countries=['LESOTHO']),
-    'LYD': Currency(code='LYD', numeric='434', decimals=3, symbol='',
-                    name=_('Libyan Dinar'),
-                    countries=['LIBYA']),
-    'MAD': Currency(code='MAD', numeric='504', decimals=2, symbol='',
-                    name=_('Moroccan Dirham'),
-                    countries=['MOROCCO', 'WESTERN SAHARA']),
-    'MDL': Currency(code='MDL', numeric='498', decimals=2, symbol='',
-                    name=_('Moldovan Le'),
-                    countries=['MOLDOVA, REPUBLIC OF']),
-    'MGA': Currency(code='MGA', numeric='969', decimals=2, symbol='',
-                    name=_('Malagasy Ariary'),
-                    countries=['MADAGASCAR']),
-    'MKD': Currency(code='MKD', numeric='807', decimals=2, symbol='ден',
-                    name=_('Denar'),
-                    countries=['MACEDONIA, THE FORMER YUGOSLAV REPUBLIC OF']),
-    'MMK': Currency(code='MMK', numeric='104', decimals=2, symbol='', name=_('Kyat'),
-                    countries=['MYANMAR']),
-    'MNT': Currency(code='MNT', numeric='496', decimals=2, symbol='₮',
-                    name=_('Tugrik'),
-                    countries=['MONGOLIA']),
-    'MOP': Currency(code='MOP', numeric='446', decimals=2, symbol='', name=_('Pataca'),
-                    countries=['MACAO']),
-    'MRO': Currency(code='MRO', numeric='478', decimals=2, symbol='',
-                    name=_('Ouguiya'),
-                    countries=['MAURITANIA']),
-    'MUR': Currency(code='MUR', numeric='480', decimals=2, symbol='₨',
-                    name=_('Mauritius Rupee'),
-                    countries=['MAURITIUS']),
-    'MVR': Currency(code='MVR', numeric='462', decimals=2, symbol='',
-                    name=_('Rufiyaa'),
-                    countries=['MALDIVES']),
-    'MWK': Currency(code='MWK', numeric='454', decimals=2, symbol='', name=_('Kwacha'),
-                    countries=['MALAWI']),
-    'MXN': Currency(code='MXN', numeric='484', decimals=2, symbol='$',
-                    name=_('Mexican Peso'),
-                    countries=['MEXICO']),
-    'MYR': Currency(code='MYR', numeric='458', decimals=2, symbol='RM',
-                    name=_('Malaysian Ringgit'),
-                    countries=['MALAYSIA']),
-    'MZN': Currency(code='MZN', numeric='943', decimals=2, symbol='MT',
-                    name=_('Mozambique Metical'),
-                    countries=['MOZAMBIQUE']),
-    'NAD': Currency(code='NAD', numeric='516', decimals=2, symbol='$',
-                    name=_('Namibia Dollar'),
-                    countries=['NAMIBIA']),
-    'NGN': Currency(code='NGN', numeric='566', decimals=2, symbol='₦', name=_('Naira'),
-                    countries=['NIGERIA']),
-    'NIO': Currency(code='NIO', numeric='558', decimals=2, symbol='C$',
-                    name=_('Nicaragua Cordoba'),
-                    countries=['NICARAGUA']),
-    'NOK': Currency(code='NOK', numeric='578', decimals=2, symbol='kr',
-                    name=_('Norwegian Krone'),
-                    countries=['BOUVET ISLAND', 'NORWAY', 'SVALBARD AND JAN MAYEN']),
-    'NPR': Currency(code='NPR', numeric='524', decimals=2, symbol='₨',
-                    name=_('Nepalese Rupee'),
-                    countries=['NEPAL']),
-    'NZD': Currency(code='NZD', numeric='554', decimals=2, symbol='$',
-                    name=_('New Zealand Dollar'),
-                    countries=['COOK ISLANDS', 'NEW ZEALAND', 'NIUE',
-                               'PITCAIRN',
-                               'TOKELA']),
-    'OMR': Currency(code='OMR', numeric='512', decimals=3, symbol='﷼',
-                    name=_('Rial Omani'),
-                    countries=['OMAN']), 'PAB': Currency(code='PAB', numeric='590', decimals=2, symbol='B/.',
-                                                         name=_('Balboa'),
-                                                         countries=['PANAMA']),
-    'PEN': Currency(code='PEN', numeric='604', decimals=2, symbol='S/.',
-                    name=_('Nuevo Sol'),
-                    countries=['PER']),
-    'PGK': Currency(code='PGK', numeric='598', decimals=2, symbol='', name=_('Kina'),
-                    countries=['PAPUA NEW GUINEA']),
-    'PHP': Currency(code='PHP', numeric='608', decimals=2, symbol='₱',
-                    name=_('Philippine Peso'),
-                    countries=['PHILIPPINES']),
-    'PKR': Currency(code='PKR', numeric='586', decimals=2, symbol='₨',
-                    name=_('Pakistan Rupee'),
-                    countries=['PAKISTAN']),
-    'PLN': Currency(code='PLN', numeric='985', decimals=2, symbol='zł',
-                    name=_('Zloty'),
-                    countries=['POLAND']),
-    'PYG': Currency(code='PYG', numeric='600', decimals=0, symbol='Gs',
-                    name=_('Guarani'),
-                    countries=['PARAGUAY']),
-    'QAR': Currency(code='QAR', numeric='634', decimals=2, symbol='﷼',
-                    name=_('Qatari Rial'),
-                    countries=['QATAR']),
-    'RON': Currency(code='RON', numeric='946', decimals=2, symbol='lei',
-                    name=_('New Romanian Le'),
-                    countries=['ROMANIA']),
-    'RSD': Currency(code='RSD', numeric='941', decimals=2, symbol='Дин.',
-                    name=_('Serbian Dinar'),
-                    countries=['SERBIA ']),
-    'RUB': Currency(code='RUB', numeric='643', decimals=2, symbol='руб',
-                    name=_('Russian Ruble'),
-                    countries=['RUSSIAN FEDERATION']),
-    'RWF': Currency(code='RWF', numeric='646', decimals=0, symbol='',
-                    name=_('Rwanda Franc'),
-                    countries=['RWANDA']),
-    'SAR': Currency(code='SAR', numeric='682', decimals=2, symbol='﷼',
-                    name=_('Saudi Riyal'),
-                    countries=['SAUDI ARABIA']),
-    'SBD': Currency(code='SBD', numeric='090', decimals=2, symbol='$',
-                    name=_('Solomon Islands Dollar'),
-                    countries=['SOLOMON ISLANDS']),
-    'SCR': Currency(code='SCR', numeric='690', decimals=2, symbol='₨',
-                    name=_('Seychelles Rupee'),
-                    countries=['SEYCHELLES']),
-    'SDG': Currency(code='SDG', numeric='938', decimals=2, symbol='',
-                    name=_('Sudanese Pound'),
-                    countries=['SUDAN']),
-    'SEK': Currency(code='SEK', numeric='752', decimals=2, symbol='kr',
-                    name=_('Swedish Krona'),
-                    countries=['SWEDEN']),
-    'SGD': Currency(code='SGD', numeric='702', decimals=2, symbol='$',
-                    name=_('Singapore Dollar'),
-                    countries=['SINGAPORE']),
-    'SHP': Currency(
-        code='SHP', numeric='654', decimals=2, symbol='£', name=_('Saint Helena Pound'),
-        countries=['SAINT HELENA, ASCENSION AND TRISTAN DA CUNHA']),
-    'SLL': Currency(
-        code='SLL', numeric='694', decimals=2, symbol='', name=_('Leone'), countries=['SIERRA LEONE']
-    ),
-    'SOS': Currency(
-        code='SOS', numeric='706', decimals=2, symbol='S', name=_('Somali Shilling'), countries=['SOMALIA']
-    ),
-    'SRD': Currency(
-        code='SRD', numeric='968', decimals=2, symbol='$', name=_('Surinam Dollar'), countries=['SURINAME']
-    ),
-    'STD': Currency(
-        code='STD', numeric='678', decimals=2, symbol='', name=_('Dobra'), countries=['SAO TOME AND PRINCIPE']
-    ),
-    'SVC': Currency(
-        code='SVC', numeric='222', decimals=2, symbol='$', name=_('El Salvador Colon'), countries=['EL SALVADOR']
-    ),
-    'SYP': Currency(
-        code='SYP', numeric='760', decimals=2, symbol='£', name=_('Syrian Pound'), countries=['SYRIAN ARAB REPUBLIC']
-    ),
-    'SZL': Currency(
-        code='SZL', numeric='748', decimals=2, symbol='', name=_('Lilangeni'), countries=['SWAZILAND']
-    ),
-    'THB': Currency(code='THB', numeric='764', decimals=2, symbol='฿', name=_('Baht'), countries=['THAILAND']),
-    'TJS': Currency(
-        code='TJS', numeric='972', decimals=2, symbol='', name=_('Somoni'), countries=['TAJIKISTAN']
-    ),
-    'TMT': Currency(
-        code='TMT', numeric='934', decimals=2, symbol='', name=_('Turkmenistan New Manat'), countries=['TURKMENISTAN']
-    ),
-    'TND': Currency(
-        code='TND', numeric='788', decimals=3, symbol='', name=_('Tunisian Dinar'), countries=['TUNISIA']
-    ),
-    'TOP': Currency(code='TOP', numeric='776', decimals=2, symbol='', name=_('Pa’anga'), countries=['TONGA']),
-    'TRY': Currency(
-        code='TRY', numeric='949', decimals=2, symbol='TL', name=_('Turkish Lira'), countries=['TURKEY']
-    ),
-    'TTD': Currency(
-        code='TTD', numeric='780', decimals=2, symbol='TT$', name=_('Trinidad and Tobago Dollar'),
-        countries=['TRINIDAD AND TOBAGO']
-    ),
-    'TWD': Currency(
-        code='TWD', numeric='901', decimals=2, symbol='NT$', name=_('New Taiwan Dollar'),
-        countries=['TAIWAN, PROVINCE OF CHINA']
-    ),
-    'TZS': Currency(
-        code='TZS', numeric='834', decimals=2, symbol='', name=_('Tanzanian Shilling'),
-        countries=['TANZANIA, UNITED REPUBLIC OF']
-    ),
-    'UAH': Currency(
-        code='UAH', numeric='980', decimals=2, symbol='₴', name=_('Hryvnia'), countries=['UKRAINE']
-    ),
-    'UGX': Currency(
-        code='UGX', numeric='800', decimals=2, symbol='', name=_('Uganda Shilling'), countries=['UGANDA']
-    ),
-    'USD': Currency(
-        code='USD', numeric='840', decimals=2, symbol='$', name=_('US Dollar'),
-        countries=[
-            'AMERICAN SAMOA', 'BONAIRE, SINT EUSTATIUS AND SABA', 'BRITISH INDIAN OCEAN TERRITORY', 'ECUADOR',
-            'EL SALVADOR', 'GUAM', 'HAITI', 'MARSHALL ISLANDS', 'MICRONESIA, FEDERATED STATES OF',
-            'NORTHERN MARIANA ISLANDS', 'PALA', 'PANAMA', 'PUERTO RICO', 'TIMOR-LESTE', 'TURKS AND CAICOS ISLANDS',
-            'UNITED STATES', 'UNITED STATES MINOR OUTLYING ISLANDS', 'VIRGIN ISLANDS (BRITISH)', 'VIRGIN ISLANDS (US)'
-        ]
-    ),
-    'UY': Currency(
-        code='UY', numeric='858', decimals=2, symbol='$', name=_('Peso Uruguayo'), countries=['URUGUAY']
-    ),
-    'UZS': Currency(
-        code='UZS', numeric='860', decimals=2, symbol='лв', name=_('Uzbekistan Sum'), countries=['UZBEKISTAN']
-    ),
-    'VEF': Currency(
-        code='VEF', numeric='937', decimals=2, symbol='Bs', name=_('Bolivar Fuerte'),
-        countries=['VENEZUELA, BOLIVARIAN REPUBLIC OF']
-    ),
-    'VND': Currency(code='VND', numeric='704', decimals=0, symbol='₫', name=_('Dong'), countries=['VIET NAM']),
-    'VUV': Currency(code='VUV', numeric='548', decimals=0, symbol='', name=_('Vat'), countries=['VANUAT']),
-    'WST': Currency(code='WST', numeric='882', decimals=2, symbol='', name=_('Tala'), countries=['SAMOA']),
-    'XAF': Currency(
-        code='XAF', numeric='950', decimals=0, symbol='', name=_('CFA Franc BEAC'),
-        countries=['CAMEROON', 'CENTRAL AFRICAN REPUBLIC', 'CHAD', 'CONGO', 'EQUATORIAL GUINEA', 'GABON']
-    ),
-    'XCD': Currency(
-        code='XCD', numeric='951', decimals=2, symbol='$', name=_('East Caribbean Dollar'),
-        countries=[
-            'ANGUILLA', 'ANTIGUA AND BARBUDA', 'DOMINICA', 'GRENADA', 'MONTSERRAT', 'SAINT KITTS AND NEVIS',
-            'SAINT LUCIA',
-            'SAINT VINCENT AND THE GRENADINES'
-        ]
-    ),
-    'XDR': Currency(
-        code='XDR', numeric='960', decimals=0, symbol='', name=_('SDR (Special Drawing Right)'),
-        countries=['INTERNATIONAL MONETARY FUND (IMF)']
-    ),
-    'XOF': Currency(
-        code='XOF', numeric='952', decimals=0, symbol='', name=_('CFA Franc BCEAO'),
-        countries=['BENIN', 'BURKINA FASO', 'CÔTE D\'IVOIRE', 'GUINEA-BISSA', 'MALI', 'NIGER', 'SENEGAL', 'TOGO']
-    ),
-    'XPF': Currency(
-        code='XPF', numeric='953', decimals=0, symbol='', name=_('CFP Franc'),
-        countries=['FRENCH POLYNESIA', 'NEW CALEDONIA', 'WALLIS AND FUTUNA']
-    ),
-    'YER': Currency(
-        code='YER', numeric='886', decimals=2, symbol='﷼', name=_('Yemeni Rial'), countries=['YEMEN']
-    ),
-    'ZAR': Currency(
-        code='ZAR', numeric='710', decimals=0, symbol='R', name=_('Rand'),
-        countries=['LESOTHO', 'NAMIBIA', 'SOUTH AFRICA']
-    ),
-    'ZMW': Currency(
-        code='ZMW', numeric='967', decimals=2, symbol='ZK', name=_('Zambian Kwacha'), countries=['ZAMBIA']
-    )
-}
+        amount = self._amount * exchange_ratio(self._currency, currency, rate_date, snapshot, source)
+
+        return self._make(amount, currency)
+
+
+_new = object.__new__
+_set_amount = Money._amount.__set__
+_set_currency = Money._currency.__set__
+_set_str = Money._str.__set__
+
+
+def round_many(values, currency=None):
+    """
+    Rounds a batch of Money, each one to its currency precision, or of
+    Decimals to the precision of `currency`, using the currency rounding plans.
+    :return: list with the rounded Money or Decimals
+    """
+    if currency is not None:
+        if not isinstance(currency, Currency):
+            currency = Currency.get_by_code(currency)
+        exponent, rounding = currency.exponent, currency.rounding
+
+    results = []
+    append = results.append
+    for value in values:
+        if isinstance(value, Money):
+            plan = value._currency
+            append(_make(value._amount.quantize(plan.exponent, rounding=plan.rounding), plan))
+        elif currency is None:
+            raise ValueError('A currency is needed to round {!r}'.format(value))
+        else:
+            append(value.quantize(exponent, rounding=rounding))
+    return results
+
+
+_make = Money._make
+
+
+def reload_rounding(**kwargs):
+    """
+    Updates the rounding plans of registered currencies when TXMONEY
+    settings change.
+    """
+    if kwargs['setting'] == 'TXMONEY' and CURRENCIES.loaded:
+        for currency in CURRENCIES.values():
+            object.__setattr__(currency, 'rounding', get_rounding(currency.code, currency._rounding))
+
+
+setting_changed.connect(reload_rounding)
@@ -1,28 +1,84 @@
 # coding=utf-8
 from __future__ import absolute_import, unicode_literals
 
+import hashlib
+import time
 from abc import ABCMeta, abstractmethod
+from datetime import datetime, timedelta
 from decimal import Decimal
+from itertools import groupby
+from multiprocessing import TimeoutError as PoolTimeoutError
+from multiprocessing.pool import ThreadPool
+from threading import Lock
 
 import requests
+from django.conf import settings as django_settings
+from django.core.cache import caches
 from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
 from django.db import transaction
-from django.utils.six import iteritems, with_metaclass
+from django.utils import timezone
+from django.utils.six import with_metaclass
+from requests.adapters import HTTPAdapter
 
-from ..settings import txmoney_settings as settings
+from ..compat import on_commit
+from ..settings import get_settings
+from .cache import rate_cache
 from .exceptions import TXRateBackendError
-from .models import Rate, RateSource
+from .files import iter_file_rates
+from .mapped import deferred_mapped_rates, write_mapped_rates
+from .models import BackfilledDate, Rate, RateSource
+from .signals import rates_updated
 from .utils import parse_rates_to_base_currency
 
+try:
+    from urllib3.util.retry import Retry
+except ImportError:
+    from requests.packages.urllib3.util.retry import Retry
+
+_session = None
+_session_lock = Lock()
+
+
+def get_session():
+    """
+    Return the requests Session shared by the HTTP backends, which keeps
+    connections alive and retries failed requests with RATES_HTTP_RETRIES
+    and RATES_HTTP_BACKOFF
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            settings = get_settings()
+            retry = Retry(
+                total=settings.RATES_HTTP_RETRIES, backoff_factor=settings.RATES_HTTP_BACKOFF,
+                status_forcelist=(500, 502, 503, 504)
+            )
+            adapter = HTTPAdapter(pool_maxsize=settings.RATES_HTTP_POOL_SIZE, max_retries=retry)
+            session = requests.Session()
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _session = session
+        return _session
+
+
+def reset_session(**kwargs):
+    global _session
+    if kwargs['setting'] == 'TXMONEY':
+        # Made again with the new pool and retry settings
+        with _session_lock:
+            _session = None
+
 
 class BaseRateBackend(with_metaclass(ABCMeta)):
     """
     Abstract base class API for exchange backends
     """
 
-    def __init__(self, source_name, base_currency):
+    def __init__(self, source_name, base_currency, timeout=None):
         self._source_name = source_name
         self._base_currency = base_currency
+        self.timeout = timeout or get_settings().RATES_FETCH_TIMEOUT
 
     @property
     def source_name(self):
@@ -35,30 +91,201 @@ class BaseRateBackend(with_metaclass(ABCMeta)):
     @abstractmethod
     def get_rates_from_source(self):
         """
-        Return a dictionary that maps currency code with its rate value
+        Return a dictionary that maps currency code with its rate value, empty
+        if the source has no new rates since the last update
         """
 
+    def is_outdated(self):
+        """
+        Return whether the source has no rates for today yet
+        """
+        source = RateSource.objects.filter(name=self.source_name, base_currency=self.base_currency).first()
+        return source is None or not source.is_updated
+
+    def get_rates_for_date(self, rate_date):
+        """
+        Return a dictionary that maps currency code with its rate value on a
+        past date, for backends with historical rates
+        """
+        raise NotImplementedError('{} has no historical rates'.format(self.__class__.__name__))
+
     @transaction.atomic
-    def update_rates(self):
+    def update_rates(self, rates=None, force=False):
         """
-        Creates or updates rates for a source
+        Creates or updates today's rates for a source, unless it was already
+        updated today or `force` is set. Unless `rates` are given they are
+        fetched with `get_rates_from_source`. The RATES_MAPPED_FILE is
+        rewritten once new rates are committed.
+        :return: number of rates inserted or updated, unchanged ones are skipped
         """
         try:
             source, created = RateSource.objects.get_or_create(name=self.source_name, base_currency=self.base_currency)
+            if not (created or force or not source.is_updated):
+                return 0
 
-            if created or not source.is_updated:
-                rates = []
-                for currency, value in iteritems(self.get_rates_from_source()):
-                    rates.append(Rate(source=source, currency=currency, value=value))
+            if rates is None:
+                rates = self.get_rates_from_source()
+            written = self._store_rates(source, rates)
+            source.save()  # Force update last_update date on rate source
+            return written
+        except Exception as e:
+            raise TXRateBackendError("Error during '%s' rates update. %s" % (self.source_name, e))
 
-                Rate.objects.bulk_create(rates)
-                source.save()  # Force update last_update date on rate source
+    @transaction.atomic
+    def update_rates_for_date(self, rate_date, rates=None):
+        """
+        Creates or updates the rates for a source on a past date. Unless
+        `rates` are given they are fetched with `get_rates_for_date`.
+        :return: number of rates inserted or updated, unchanged ones are skipped
+        """
+        try:
+            source, created = RateSource.objects.get_or_create(name=self.source_name, base_currency=self.base_currency)
+            if created:
+                # Not updated today, only up to the backfilled date
+                last_update = datetime.combine(rate_date, datetime.min.time())
+                if django_settings.USE_TZ:
+                    last_update = timezone.make_aware(last_update, timezone.utc)
+                RateSource.objects.filter(pk=source.pk).update(last_update=last_update)
+            if rates is None:
+                rates = self.get_rates_for_date(rate_date)
+            # Backfills may write dates in any order, see compact_backfill
+            written = self._store_rates(source, rates, rate_date, changes_only=False)
+            # Compacting may delete all the rates of the date, see stored_dates
+            BackfilledDate.objects.get_or_create(source=source, date=rate_date)
+            return written
         except Exception as e:
-            raise TXRateBackendError("Error during '%s' rates update. %s" % (self.source_name, e.message))
+            raise TXRateBackendError("Error during '%s' rates update for %s. %s" % (self.source_name, rate_date, e))
+
+    def backfill_rates(self, start, end, workers=None, force=False):
+        """
+        Stores the rates for every day from `start` to `end`, fetching several
+        days at the same time with a pool of `workers` threads,
+        RATES_BACKFILL_WORKERS by default.
+
+        Each day is stored in its own transaction as soon as it is fetched, so
+        an interrupted backfill is resumed by running it again: days that
+        were backfilled or have rates are skipped unless `force` is set. With
+        RATES_CHANGES_ONLY the backfilled dates are compacted at the end, and
+        the RATES_MAPPED_FILE is rewritten once, at the end too.
+        :return: dict mapping each date to the number of rates written, or to
+            the TXRateBackendError raised while updating it
+        """
+        days = [start + timedelta(n) for n in range((end - start).days + 1)]
+        results = dict((day, 0) for day in days)
+        if not force:
+            stored = self.stored_dates(start, end)
+            days = [day for day in days if day not in stored]
+        if not days:
+            return results
+
+        def fetch(day):
+            try:
+                return day, self.get_rates_for_date(day)
+            except TXRateBackendError as e:
+                return day, e
+
+        pool = ThreadPool(min(workers or get_settings().RATES_BACKFILL_WORKERS, len(days)))
+        with deferred_mapped_rates():
+            try:
+                # Stored from this thread, as they arrive
+                for day, rates in pool.imap_unordered(fetch, days):
+                    if isinstance(rates, TXRateBackendError):
+                        results[day] = rates
+                        continue
+                    try:
+                        results[day] = self.update_rates_for_date(day, rates)
+                    except TXRateBackendError as e:
+                        results[day] = e
+            finally:
+                pool.terminate()
+            self.compact_backfill(start)
+        return results
+
+    def stored_dates(self, start, end):
+        """
+        Return the set of dates from `start` to `end` with rates of the source
+        or already backfilled
+        """
+        lookup = dict(
+            source__name=self.source_name, source__base_currency=self.base_currency, date__range=(start, end)
+        )
+        dates = set(BackfilledDate.objects.filter(**lookup).values_list('date', flat=True))
+        return dates.union(Rate.objects.filter(**lookup).values_list('date', flat=True).distinct())
+
+    def compact_backfill(self, start):
+        """
+        Deletes redundant rates from `start` on after a backfill, when only
+        rate changes are stored
+        """
+        source = RateSource.objects.filter(name=self.source_name, base_currency=self.base_currency).first()
+        if get_settings().RATES_CHANGES_ONLY and source is not None:
+            Rate.objects.compact(source, start)
+
+    def _store_rates(self, source, rates, rate_date=None, changes_only=None):
+        written = Rate.objects.upsert(source, rates, rate_date, changes_only=changes_only)
+        if written:
+            # Rates are written without signals. Clear now for this thread
+            # and again on commit, in case others cached the old rates meanwhile
+            rate_cache.clear()
+            on_commit(rate_cache.clear)
+            on_commit(lambda: rates_updated.send(sender=self.__class__, source=source))
+        return written
+
+
+def get_backends():
+    """
+    Return an instance of each backend in BACKEND_CLASSES, or of
+    DEFAULT_BACKEND_CLASS if there are none
+    """
+    settings = get_settings()
+    return [backend_class() for backend_class in settings.BACKEND_CLASSES or [settings.DEFAULT_BACKEND_CLASS]]
+
+
+def update_rates_concurrently(backends, force=False):
+    """
+    Updates the rates of several backends, fetching them from their sources
+    at the same time in a thread pool. Each fetch is given up after its
+    backend `timeout`, and the rates of each source are stored in their own
+    transaction.
+    The memory-mapped rates file is rewritten by `update_rates` when rates
+    were written, and here when it doesn't exist yet.
+    :return: dict mapping source names to the number of rates written, or
+        to the TXRateBackendError raised while updating it
+    """
+    results = dict((backend.source_name, 0) for backend in backends)
+    backends = [backend for backend in backends if force or backend.is_outdated()]
+    if not backends:
+        write_mapped_rates(changed=False)
+        return results
+
+    pool = ThreadPool(len(backends))
+    try:
+        started = time.time()
+        fetches = [(backend, pool.apply_async(backend.get_rates_from_source)) for backend in backends]
+        for backend, fetch in fetches:
+            try:
+                rates = fetch.get(max(started + backend.timeout - time.time(), 0))
+                results[backend.source_name] = backend.update_rates(rates, force)
+            except TXRateBackendError as e:
+                results[backend.source_name] = e
+            except PoolTimeoutError:
+                results[backend.source_name] = TXRateBackendError(
+                    "Error retrieving '%s' rates. Timed out" % backend.source_name
+                )
+            except Exception as e:
+                results[backend.source_name] = TXRateBackendError(
+                    "Error retrieving '%s' rates. %s" % (backend.source_name, e)
+                )
+    finally:
+        # Don't wait for fetches that timed out
+        pool.terminate()
+    write_mapped_rates(changed=False)
+    return results
 
 
 class OpenExchangeBackend(BaseRateBackend):
     def __init__(self):
+        settings = get_settings()
         super(OpenExchangeBackend, self).__init__(
             settings.OPENEXCHANGE_NAME, settings.OPENEXCHANGE_BASE_CURRENCY
         )
@@ -70,15 +297,130 @@ class OpenExchangeBackend(BaseRateBackend):
             raise ImproperlyConfigured('OPENEXCHANGE APP_ID setting should not be empty when using OpenExchangeBackend')
 
         self.url = '{}?app_id={}'.format(settings.OPENEXCHANGE_URL, settings.OPENEXCHANGE_APP_ID)
+        self.historical_url = '{}?app_id={}'.format(settings.OPENEXCHANGE_HISTORICAL_URL, settings.OPENEXCHANGE_APP_ID)
+        self._validators = None
+
+    @property
+    def validators_key(self):
+        # The URL has the app id, don't use it as is
+        return 'txmoney:rates:validators:{}'.format(hashlib.md5(self.url.encode('utf-8')).hexdigest())
 
     def get_rates_from_source(self):
+        """
+        Return the rates, or an empty dictionary when the server answers that
+        they didn't change since the last update, using the ETag and
+        Last-Modified headers of its last response
+        """
+        headers = {}
+        validators = caches[get_settings().RATES_HTTP_CACHE].get(self.validators_key) or {}
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+
         try:
-            r = requests.get(self.url)
-            rates = r.json(parse_float=Decimal)['rates']
+            r = get_session().get(self.url, headers=headers, timeout=self.timeout)
+            if r.status_code == 304:
+                return {}
+            r.raise_for_status()
+            rates = self.parse_rates(r)
+        except Exception as e:
+            raise TXRateBackendError("Error retrieving rates from '%s'. %s" % (self.url, e))
+
+        self._validators = {'etag': r.headers.get('ETag'), 'last_modified': r.headers.get('Last-Modified')}
+        return rates
 
-            if settings.SAME_BASE_CURRENCY and settings.DEFAULT_CURRENCY != settings.OPENEXCHANGE_BASE_CURRENCY:
-                rates = parse_rates_to_base_currency(rates, settings.OPENEXCHANGE_BASE_CURRENCY)
+    def get_rates_for_date(self, rate_date):
+        url = self.historical_url.format(date=rate_date.isoformat())
+        try:
+            r = get_session().get(url, timeout=self.timeout)
+            r.raise_for_status()
+            return self.parse_rates(r)
         except Exception as e:
-            raise TXRateBackendError("Error retrieving rates from '%s'. %s" % (self.url, e.message))
+            raise TXRateBackendError("Error retrieving rates from '%s'. %s" % (url, e))
 
+    def parse_rates(self, response):
+        rates = response.json(parse_float=Decimal)['rates']
+        settings = get_settings()
+        if settings.SAME_BASE_CURRENCY and settings.DEFAULT_CURRENCY != settings.OPENEXCHANGE_BASE_CURRENCY:
+            rates = parse_rates_to_base_currency(rates, settings.OPENEXCHANGE_BASE_CURRENCY)
         return rates
+
+    def update_rates(self, rates=None, force=False):
+        written = super(OpenExchangeBackend, self).update_rates(rates, force)
+        # Only once the rates they validate are stored
+        if self._validators:
+            caches[get_settings().RATES_HTTP_CACHE].set(self.validators_key, self._validators, None)
+            self._validators = None
+        return written
+
+
+class FileRateBackend(BaseRateBackend):
+    """
+    Reads rates from a JSON, CSV or ECB XML history file, see
+    txmoney.rates.files for the formats. By default the file is
+    RATES_FILE_PATH, with rates in RATES_FILE_BASE_CURRENCY.
+
+    The file is read as a stream with one date in memory at a time, and
+    `backfill_rates` stores it in a single pass.
+    """
+
+    def __init__(self, path=None, source_name=None, base_currency=None):
+        settings = get_settings()
+        super(FileRateBackend, self).__init__(
+            source_name or settings.RATES_FILE_NAME, base_currency or settings.RATES_FILE_BASE_CURRENCY
+        )
+        self.path = path or settings.RATES_FILE_PATH
+        if not self.path:
+            raise ImproperlyConfigured('RATES_FILE_PATH setting should not be empty when using FileRateBackend')
+
+    def iter_rates(self):
+        """
+        Yields the date and the rates of each date in the file, which must be
+        grouped by date
+        """
+        settings = get_settings()
+        try:
+            for rate_date, rows in groupby(iter_file_rates(self.path), lambda row: row[0]):
+                rates = dict((currency, value) for _, currency, value in rows)
+                if settings.SAME_BASE_CURRENCY and settings.DEFAULT_CURRENCY != self.base_currency:
+                    rates = parse_rates_to_base_currency(rates, self.base_currency)
+                yield rate_date, rates
+        except Exception as e:
+            raise TXRateBackendError("Error reading rates from '%s'. %s" % (self.path, e))
+
+    def get_rates_from_source(self):
+        """
+        Return the rates of the latest date in the file
+        """
+        latest_date, latest = None, {}
+        for rate_date, rates in self.iter_rates():
+            if latest_date is None or rate_date >= latest_date:
+                latest_date, latest = rate_date, rates
+        return latest
+
+    def get_rates_for_date(self, rate_date):
+        for day, rates in self.iter_rates():
+            if day == rate_date:
+                return rates
+        raise TXRateBackendError("No rates for %s in '%s'" % (rate_date, self.path))
+
+    def backfill_rates(self, start, end, workers=None, force=False):
+        """
+        Stores the rates in the file from `start` to `end`, reading it once.
+        `workers` is ignored.
+        """
+        results = dict((start + timedelta(n), 0) for n in range((end - start).days + 1))
+        stored = set() if force else self.stored_dates(start, end)
+        with deferred_mapped_rates():
+            for rate_date, rates in self.iter_rates():
+                if start <= rate_date <= end and rate_date not in stored:
+                    try:
+                        results[rate_date] = self.update_rates_for_date(rate_date, rates)
+                    except TXRateBackendError as e:
+                        results[rate_date] = e
+            self.compact_backfill(start)
+        return results
+
+
+setting_changed.connect(reset_session)
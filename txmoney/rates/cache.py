@@ -0,0 +1,115 @@
+# coding=utf-8
+"""
+Process local cache of rate values, so exchanging many Money between the same
+currencies doesn't query the database every time.
+
+Entries expire after RATES_CACHE_TIMEOUT seconds and at most
+RATES_CACHE_MAX_SIZE of them are kept, dropping the least recently used. The
+whole cache is cleared when rates are written.
+"""
+from __future__ import absolute_import, unicode_literals
+
+import time
+from collections import OrderedDict, namedtuple
+from threading import Event, Lock
+
+from django.core.signals import setting_changed
+from django.db.models.signals import post_delete, post_save
+
+from ..settings import get_settings
+from .models import Rate
+
+_now = getattr(time, 'monotonic', time.time)
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+class RateCache(object):
+    """
+    Thread safe TTL and LRU cache.
+
+    Misses are single flight: while a key is being loaded other threads
+    asking for it wait for that load instead of running their own.
+    A `timeout` of 0 or None disables the cache.
+    """
+
+    def __init__(self, timeout=None, max_size=None):
+        self.timeout = timeout
+        self.max_size = max_size
+        self.hits = self.misses = 0
+        self._entries = OrderedDict()
+        self._loading = {}
+        self._generation = 0
+        self._lock = Lock()
+
+    def get(self, key, loader):
+        """
+        Returns the cached value for `key`, calling `loader` to get it on
+        a miss. Exceptions raised by `loader` are not cached.
+        """
+        if not self.timeout:
+            return loader()
+
+        while True:
+            with self._lock:
+                entry = self._entries.pop(key, None)
+                if entry is not None and entry[1] > _now():
+                    # Re-insert as the most recently used
+                    self._entries[key] = entry
+                    self.hits += 1
+                    return entry[0]
+                event = self._loading.get(key)
+                if event is None:
+                    event = self._loading[key] = Event()
+                    generation = self._generation
+                    self.misses += 1
+                    break
+            # Another thread is loading the key, wait for it and look again
+            event.wait()
+
+        try:
+            value = loader()
+            with self._lock:
+                # Don't keep a value read before the cache was cleared
+                if generation == self._generation:
+                    self._entries[key] = (value, _now() + self.timeout)
+                    while self.max_size and len(self._entries) > self.max_size:
+                        self._entries.popitem(last=False)
+            return value
+        finally:
+            with self._lock:
+                del self._loading[key]
+            event.set()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    def configure(self, timeout, max_size):
+        with self._lock:
+            self.timeout = timeout
+            self.max_size = max_size
+            self._entries.clear()
+            self._generation += 1
+
+    def info(self):
+        return CacheInfo(self.hits, self.misses, self.max_size, len(self._entries))
+
+
+rate_cache = RateCache(get_settings().RATES_CACHE_TIMEOUT, get_settings().RATES_CACHE_MAX_SIZE)
+
+
+def clear_rate_cache(**kwargs):
+    rate_cache.clear()
+
+
+def reload_rate_cache(**kwargs):
+    if kwargs['setting'] == 'TXMONEY':
+        settings = get_settings()
+        rate_cache.configure(settings.RATES_CACHE_TIMEOUT, settings.RATES_CACHE_MAX_SIZE)
+
+
+post_save.connect(clear_rate_cache, sender=Rate)
+post_delete.connect(clear_rate_cache, sender=Rate)
+setting_changed.connect(reload_rate_cache)
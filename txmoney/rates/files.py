@@ -0,0 +1,230 @@
+# coding=utf-8
+"""
+Streaming readers of rate history files in JSON, CSV or ECB XML format.
+
+Readers yield (date, currency, value) tuples as they read the file, so files
+of any size are read in constant memory. Files ending in .gz are
+decompressed on the fly.
+"""
+from __future__ import absolute_import, unicode_literals
+
+import csv
+import gzip
+import io
+import json
+from datetime import datetime
+from decimal import Decimal
+
+from django.utils import six
+from django.utils.six import iteritems
+
+try:
+    from xml.etree import cElementTree as ElementTree
+except ImportError:
+    from xml.etree import ElementTree
+
+READ_SIZE = 64 * 1024
+MISSING_VALUES = ('', 'N/A')
+
+
+def parse_date(value):
+    return datetime.strptime(value.strip(), '%Y-%m-%d').date()
+
+
+def open_rates_file(path, binary=False):
+    """
+    Opens a rates file, as UTF-8 text unless `binary` is set
+    """
+    if path.endswith('.gz'):
+        stream = gzip.open(path, 'rb')
+        return stream if binary else io.TextIOWrapper(stream, encoding='utf-8', newline='')
+    return io.open(path, 'rb') if binary else io.open(path, encoding='utf-8', newline='')
+
+
+def iter_file_rates(path):
+    """
+    Yields (date, currency, value) tuples from a rates file, read with the
+    reader of its extension: .json, .csv or .xml
+    """
+    extension = path[:-3] if path.endswith('.gz') else path
+    extension = extension.rpartition('.')[2].lower()
+    if extension not in READERS:
+        raise ValueError("Unknown rates file format '{}'".format(extension))
+    binary = extension == 'xml'
+    with open_rates_file(path, binary) as stream:
+        for row in READERS[extension](stream):
+            yield row
+
+
+class JSONReader(object):
+    """
+    Decodes a JSON document piece by piece from a text stream, keeping in
+    memory only the piece being decoded
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.decoder = json.JSONDecoder(parse_float=Decimal)
+        self.text = ''
+        self.pos = 0
+
+    def read(self):
+        """
+        Appends the next block of the stream to the text not decoded yet
+        :return: False at the end of the stream
+        """
+        data = self.stream.read(READ_SIZE)
+        if not data:
+            return False
+        self.text = self.text[self.pos:] + data
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """
+        Skips whitespace and returns the next character
+        """
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos].isspace():
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.read():
+                raise ValueError('Unexpected end of JSON rates file')
+
+    def expect(self, chars):
+        char = self.peek()
+        if char not in chars:
+            raise ValueError("Expecting one of '{}' but found '{}' in JSON rates file".format(chars, char))
+        self.pos += 1
+        return char
+
+    def decode(self):
+        """
+        Decodes the next JSON value
+        """
+        while True:
+            self.peek()
+            try:
+                value, end = self.decoder.raw_decode(self.text, self.pos)
+            except ValueError:
+                # It may continue in the next block
+                if not self.read():
+                    raise
+                continue
+            # A number at the end of the text may be cut
+            if end < len(self.text) or not self.read():
+                self.pos = end
+                return value
+
+    def iter_object(self):
+        """
+        Yields the keys of the next JSON object. The caller must decode each
+        value before asking for the next key.
+        """
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            key = self.decode()
+            self.expect(':')
+            yield key
+            if self.expect(',}') == '}':
+                return
+
+
+def iter_json_rates(stream):
+    """
+    Reads an object mapping dates to objects of currency rates, at the top
+    level or in its "rates" key as in OpenExchangeRates time series:
+        {"2017-01-02": {"USD": 1.0465, "GBP": 0.85168}, ...}
+    Only the rates of one date are decoded at a time.
+    """
+    reader = JSONReader(stream)
+    for key in reader.iter_object():
+        if key == 'rates' and reader.peek() == '{':
+            for day in reader.iter_object():
+                for row in _day_rows(parse_date(day), reader.decode()):
+                    yield row
+            continue
+        try:
+            rate_date = parse_date(key)
+        except ValueError:
+            reader.decode()  # Other members are skipped
+            continue
+        for row in _day_rows(rate_date, reader.decode()):
+            yield row
+
+
+def _day_rows(rate_date, rates):
+    for currency, value in iteritems(rates):
+        yield rate_date, currency, value
+
+
+def _csv_rows(stream):
+    if six.PY2:
+        rows = csv.reader(line.encode('utf-8') for line in stream)
+        return ([field.decode('utf-8').strip() for field in row] for row in rows)
+    return ([field.strip() for field in row] for row in csv.reader(stream))
+
+
+def iter_csv_rates(stream):
+    """
+    Reads rates from CSV with date, currency and rate columns:
+        date,currency,rate
+        2017-01-02,USD,1.0465
+    or with a column per currency, as the ECB history file:
+        Date,USD,JPY
+        2017-01-02,1.0465,122.4
+    Empty and N/A rates are skipped.
+    """
+    rows = _csv_rows(stream)
+    header = next(rows, None)
+    if not header:
+        return
+    names = [name.lower() for name in header]
+
+    if 'currency' in names:
+        date_index, currency_index = names.index('date'), names.index('currency')
+        rate_index = names.index('rate') if 'rate' in names else names.index('value')
+        for row in rows:
+            if row and row[rate_index] not in MISSING_VALUES:
+                yield parse_date(row[date_index]), row[currency_index], Decimal(row[rate_index])
+        return
+
+    for row in rows:
+        if not row:
+            continue
+        rate_date = parse_date(row[0])
+        for currency, value in zip(header[1:], row[1:]):
+            if currency and value not in MISSING_VALUES:
+                yield rate_date, currency, Decimal(value)
+
+
+def iter_xml_rates(stream):
+    """
+    Reads rates in the ECB XML format, as its history file:
+        <Cube><Cube time="2017-01-02"><Cube currency="USD" rate="1.0465"/></Cube></Cube>
+    Each date is discarded once read.
+    """
+    rate_date = days = None
+    for event, element in ElementTree.iterparse(stream, events=('start', 'end')):
+        if element.tag.rpartition('}')[2] != 'Cube':
+            continue
+        if event == 'start':
+            if 'time' in element.attrib:
+                rate_date = parse_date(element.get('time'))
+            elif 'currency' not in element.attrib:
+                days = element
+        elif 'currency' in element.attrib:
+            yield rate_date, element.get('currency'), Decimal(element.get('rate'))
+        elif 'time' in element.attrib and days is not None:
+            del days[:]
+
+
+READERS = {
+    'json': iter_json_rates,
+    'csv': iter_csv_rates,
+    'xml': iter_xml_rates,
+}
@@ -0,0 +1,28 @@
+# coding=utf-8
+from __future__ import absolute_import, unicode_literals
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ...models import Rate, RateSource
+from .update_rates import parse_date
+
+
+class Command(BaseCommand):
+    help = "Deletes the rates equal to the previous rate of their source and currency"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--source', dest='source_name', help="Name of the rate source, all of them by default")
+        parser.add_argument('--from', dest='from_date', type=parse_date, help="First day to compact, YYYY-MM-DD")
+
+    def handle(self, *args, **options):
+        sources = RateSource.objects.order_by('name', 'base_currency')
+        if options['source_name']:
+            sources = sources.filter(name=options['source_name'])
+            if not sources:
+                raise CommandError('Unknown rate source "%s"' % options['source_name'])
+
+        for source in sources:
+            deleted = Rate.objects.compact(source, options['from_date'])
+            self.stdout.write('Compacted rates for "%s" in %s, %d deleted' % (
+                source.name, source.base_currency, deleted
+            ))
@@ -1,30 +1,89 @@
 # coding=utf-8
 from __future__ import absolute_import, unicode_literals
 
+from datetime import date, datetime
+
 from django.core.management.base import BaseCommand, CommandError
 
-from ....settings import import_from_string, txmoney_settings
+from ....settings import import_from_string
+from ...backends import get_backends, update_rates_concurrently
+from ...exceptions import TXRateBackendError
+from ...mapped import write_mapped_rates
+
+
+def parse_date(value):
+    return datetime.strptime(value, '%Y-%m-%d').date()
 
 
 class Command(BaseCommand):
-    help = "Gets the day's exchange rates"
+    help = "Gets the day's exchange rates, or the historical ones of a range of days"
 
     def add_arguments(self, parser):
-        parser.add_argument('backend_path', nargs='?', help="Exchange backend class")
+        parser.add_argument('backend_path', nargs='*', help="Exchange backend classes")
+        parser.add_argument(
+            '--force', action='store_true', default=False,
+            help="Update sources already updated today, or days that already have rates, writing only the rates "
+                 "that changed"
+        )
+        parser.add_argument('--from', dest='from_date', type=parse_date, help="First day to backfill, YYYY-MM-DD")
+        parser.add_argument(
+            '--to', dest='to_date', type=parse_date, help="Last day to backfill, YYYY-MM-DD. Today by default"
+        )
+        parser.add_argument('--workers', type=int, help="Days fetched at the same time when backfilling")
 
     def handle(self, *args, **options):
         if options['backend_path']:
-            try:
-                backend_class = import_from_string(options['backend_path'], '')
-            except AttributeError:
-                raise CommandError('Cannot find custom backend "%s". Is it correct' % options['backend_path'])
+            backends = []
+            for backend_path in options['backend_path']:
+                try:
+                    backends.append(import_from_string(backend_path, '')())
+                except ImportError:
+                    raise CommandError('Cannot find custom backend "%s". Is it correct' % backend_path)
         else:
-            backend_class = txmoney_settings.DEFAULT_BACKEND_CLASS
+            backends = get_backends()
 
-        backend = backend_class()
-        try:
-            backend.update_rates()
-        except Exception as e:
-            raise CommandError('%s' % e.message)
+        if options['from_date'] or options['to_date']:
+            errors = self.backfill(backends, options)
+        else:
+            errors = []
+            for source_name, result in sorted(update_rates_concurrently(backends, options['force']).items()):
+                if isinstance(result, TXRateBackendError):
+                    errors.append('%s' % result)
+                else:
+                    self.stdout.write('Successfully updated rates for "%s", %d written' % (source_name, result))
+
+        if errors:
+            raise CommandError('\n'.join(errors))
+
+    def backfill(self, backends, options):
+        start, end = options['from_date'], options['to_date'] or date.today()
+        if start is None:
+            raise CommandError('--from is required to backfill rates')
+        if start > end:
+            raise CommandError('--from cannot be after --to')
+
+        errors, total = [], 0
+        for backend in backends:
+            try:
+                results = backend.backfill_rates(start, end, options['workers'], options['force'])
+            except (NotImplementedError, TXRateBackendError) as e:
+                errors.append('%s' % e)
+                continue
 
-        self.stdout.write('Successfully updated rates for "%s"' % backend.source_name)
+            written = 0
+            for rate_date, result in sorted(results.items()):
+                if isinstance(result, TXRateBackendError):
+                    errors.append('%s' % result)
+                else:
+                    written += result
+                    if options['verbosity'] > 1:
+                        self.stdout.write('Rates for "%s" on %s, %d written' % (
+                            backend.source_name, rate_date, result
+                        ))
+            total += written
+            self.stdout.write('Backfilled rates for "%s" from %s to %s, %d written' % (
+                backend.source_name, start, end, written
+            ))
+        # Backfills rewrite it when they store rates, see deferred_mapped_rates
+        write_mapped_rates(changed=False)
+        return errors
@@ -0,0 +1,342 @@
+# coding=utf-8
+"""
+Rate history in a memory-mapped binary file shared by the processes of a host.
+
+Enabled by setting RATES_MAPPED_FILE to the path of the file, which is
+rewritten whenever changes to the rates are committed, except for
+QuerySet.update of rates, which sends no signals. Every process maps the same
+file, so the operating system keeps a single copy of it in its page cache,
+and rates are looked up with binary searches on the mapped bytes. A new
+file is written next to the old one and renamed over it, so readers always
+see a whole file, and they map the new one at most
+RATES_MAPPED_CHECK_INTERVAL seconds later.
+
+Layout, little endian:
+    header      magic, version, decimal places and number of sources,
+                series and rates
+    sources     id, name length and UTF-8 name of each source
+    series      source id, currency, first rate and number of rates of each
+                source and currency, sorted by source id and currency
+    dates       date ordinal of every rate, sorted by date in each series
+    values      every rate scaled by 10 ** decimal places
+    ids         id of every rate, the order they were written in
+"""
+from __future__ import absolute_import, unicode_literals
+
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
+from datetime import date
+from decimal import Decimal
+from itertools import groupby
+from operator import itemgetter
+
+from django.core.signals import setting_changed
+from django.db.models.signals import post_delete, post_save
+from django.utils.six import string_types
+
+from ..compat import on_commit
+from ..settings import get_settings
+from .models import Rate, RateSource
+
+MAGIC = b'TXRT'
+VERSION = 2
+HEADER = struct.Struct('<4sHHIII')
+SOURCE = struct.Struct('<qH')
+SERIES = struct.Struct('<q3sxQI')
+DATE = struct.Struct('<i')
+VALUE = struct.Struct('<q')
+ID = struct.Struct('<q')
+PACK_SIZE = 4096
+
+_now = getattr(time, 'monotonic', time.time)
+_replace = getattr(os, 'replace', os.rename)
+_local = threading.local()
+
+
+def write_rates_file(path, using=None):
+    """
+    Writes every stored rate to a rates file, replacing the one at `path`
+    :return: number of rates written
+    """
+    places = Rate._meta.get_field('value').decimal_places
+    sources = list(RateSource.objects.using(using).order_by('pk').values_list('pk', 'name'))
+    rates = Rate.objects.using(using).order_by('source_id', 'currency', 'date', 'id').values_list(
+        'source_id', 'currency', 'date', 'value', 'id'
+    )
+
+    series, dates, values, ids = [], [], [], []
+    for (source_id, currency), rows in groupby(rates.iterator(), itemgetter(0, 1)):
+        start = len(dates)
+        for _, _, rate_date, value, pk in rows:
+            value = int(value.scaleb(places).to_integral_value())
+            if len(dates) > start and dates[-1] == rate_date.toordinal():
+                # Of several rates of a date, the last written is kept
+                values[-1] = value
+                ids[-1] = pk
+            else:
+                dates.append(rate_date.toordinal())
+                values.append(value)
+                ids.append(pk)
+        series.append((source_id, currency.encode('ascii'), start, len(dates) - start))
+    series.sort()
+
+    fd, temp_path = tempfile.mkstemp(prefix='.rates-', dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        with os.fdopen(fd, 'wb') as stream:
+            stream.write(HEADER.pack(MAGIC, VERSION, places, len(sources), len(series), len(dates)))
+            for pk, name in sources:
+                name = name.encode('utf-8')
+                stream.write(SOURCE.pack(pk, len(name)) + name)
+            for row in series:
+                stream.write(SERIES.pack(*row))
+            for code, items in (('i', dates), ('q', values), ('q', ids)):
+                for i in range(0, len(items), PACK_SIZE):
+                    chunk = items[i:i + PACK_SIZE]
+                    stream.write(struct.pack('<{}{}'.format(len(chunk), code), *chunk))
+            stream.flush()
+            os.fsync(stream.fileno())
+        os.chmod(temp_path, 0o644)
+        _replace(temp_path, path)
+    except Exception:
+        os.remove(temp_path)
+        raise
+    return len(dates)
+
+
+def write_mapped_rates(changed=True, using=None):
+    """
+    Rewrites the RATES_MAPPED_FILE when enabled, if rates `changed` or it
+    doesn't exist yet
+    :return: number of rates written, or None if the file wasn't written
+    """
+    settings = get_settings()
+    path = settings.RATES_MAPPED_FILE
+    if path and (changed or not os.path.exists(path)):
+        return write_rates_file(path, using)
+
+
+def schedule_mapped_rates(using=None):
+    """
+    Rewrites the RATES_MAPPED_FILE when enabled, once the current
+    transaction of `using` commits, or at the end of the enclosing
+    `deferred_mapped_rates` block
+    """
+    settings = get_settings()
+    if not settings.RATES_MAPPED_FILE:
+        return
+    deferred = getattr(_local, 'deferred', None)
+    if deferred is not None:
+        deferred.add(using)
+    else:
+        on_commit(lambda: write_mapped_rates(using=using), using)
+
+
+@contextmanager
+def deferred_mapped_rates():
+    """
+    Rewrites the RATES_MAPPED_FILE once at the end of the block instead of
+    after every transaction in it that changes rates
+    """
+    if getattr(_local, 'deferred', None) is not None:
+        yield
+        return
+    _local.deferred = set()
+    try:
+        yield
+    finally:
+        usings, _local.deferred = _local.deferred, None
+        for using in usings:
+            schedule_mapped_rates(using)
+
+
+class _Items(object):
+    """
+    Read only sequence of the values packed with `item` from `offset`, to
+    binary search them without unpacking the rest
+    """
+
+    def __init__(self, buffer, offset, length, item):
+        self.buffer = buffer
+        self.offset = offset
+        self.length = length
+        self.item = item
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+        return self.item.unpack_from(self.buffer, self.offset + index * self.item.size)[0]
+
+
+class _SeriesKeys(_Items):
+
+    def __getitem__(self, index):
+        return self.item.unpack_from(self.buffer, self.offset + index * self.item.size)[:2]
+
+
+class RatesFile(object):
+    """
+    A memory-mapped rates file
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as stream:
+            stat = os.fstat(stream.fileno())
+            self._map = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+        self.identity = (stat.st_dev, stat.st_ino, stat.st_mtime)
+
+        magic, version, self.places, sources, series, rates = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("'{}' is not a version {} rates file".format(path, VERSION))
+        self.sources = {}
+        offset = HEADER.size
+        for _ in range(sources):
+            pk, length = SOURCE.unpack_from(self._map, offset)
+            offset += SOURCE.size
+            self.sources[self._map[offset:offset + length].decode('utf-8')] = pk
+            offset += length
+
+        self._series = _SeriesKeys(self._map, offset, series, SERIES)
+        offset += series * SERIES.size
+        self._dates = _Items(self._map, offset, rates, DATE)
+        offset += rates * DATE.size
+        self._values = _Items(self._map, offset, rates, VALUE)
+        self._ids = _Items(self._map, offset + rates * VALUE.size, rates, ID)
+
+    def __len__(self):
+        return len(self._dates)
+
+    def find(self, currency, rate_date, source_id):
+        """
+        Return the index of the rate of a currency and source for a date or
+        first oldest, or None if there isn't one
+        """
+        if source_id is None:
+            return None
+        key = (source_id, currency.encode('ascii'))
+        index = bisect_left(self._series, key)
+        if index == len(self._series) or self._series[index] != key:
+            return None
+        series_offset = self._series.offset + index * SERIES.size
+        start, count = SERIES.unpack_from(self._map, series_offset)[2:]
+        index = bisect_right(self._dates, rate_date.toordinal(), start, start + count) - 1
+        return index if index >= start else None
+
+    def get(self, currency, rate_date, source_id):
+        """
+        Return the date and value of the rate of a currency and source for a
+        date or first oldest, or None if there isn't one
+        """
+        index = self.find(currency, rate_date, source_id)
+        if index is None:
+            return None
+        return date.fromordinal(self._dates[index]), self._value(index)
+
+    def _value(self, index):
+        return Decimal(self._values[index]).scaleb(-self.places)
+
+    def get_value(self, currency, rate_date, source=None, sources=None, fallback=None):
+        """
+        Return the rate value of a currency for a date or first oldest, or
+        None if there isn't one.
+
+        `source` can be a RateSource, its pk or its name. Without it the first
+        of `sources` with the rate is used, as in RateQuerySet.get_for_sources.
+        """
+        if source is not None:
+            source_id = self.sources.get(source) if isinstance(source, string_types) else getattr(source, 'pk', source)
+            rate = self.get(currency, rate_date, source_id)
+            return rate and rate[1]
+
+        settings = get_settings()
+        sources = settings.RATES_SOURCES if sources is None else sources
+        fallback = settings.RATES_SOURCE_FALLBACK if fallback is None else fallback
+
+        for name in sources:
+            rate = self.get(currency, rate_date, self.sources.get(name))
+            if rate:
+                return rate[1]
+        if fallback or not sources:
+            found = [self.find(currency, rate_date, source_id) for source_id in self.sources.values()]
+            found = [index for index in found if index is not None]
+            if found:
+                # The latest date, and between sources the last written rate
+                return self._value(max(found, key=lambda index: (self._dates[index], self._ids[index])))
+        return None
+
+
+class MappedRates(object):
+    """
+    Keeps the RatesFile at `path` mapped, mapping it again when the file is
+    replaced. Looks for a new file at most every `check_interval` seconds.
+    """
+
+    def __init__(self, path=None, check_interval=None):
+        self.path = path
+        self.check_interval = check_interval
+        self._file = None
+        self._next_check = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return bool(self.path)
+
+    def get_file(self):
+        """
+        Return the current RatesFile, or None if there is no file yet
+        """
+        now = _now()
+        with self._lock:
+            if now >= self._next_check:
+                self._next_check = now + (self.check_interval or 0)
+                try:
+                    stat = os.stat(self.path)
+                except OSError:
+                    self._file = None
+                else:
+                    if self._file is None or self._file.identity != (stat.st_dev, stat.st_ino, stat.st_mtime):
+                        # Readers of the previous file keep it mapped until they are done
+                        self._file = RatesFile(self.path)
+            return self._file
+
+    def get_value(self, currency, rate_date, source=None):
+        """
+        Return the rate value of a currency for a date, see
+        RatesFile.get_value, or None if the file or the rate are missing
+        """
+        rates_file = self.get_file()
+        if rates_file is None:
+            return None
+        return rates_file.get_value(currency, rate_date, source)
+
+    def configure(self, path, check_interval):
+        with self._lock:
+            self.path = path
+            self.check_interval = check_interval
+            self._file = None
+            self._next_check = 0
+
+
+mapped_rates = MappedRates(get_settings().RATES_MAPPED_FILE, get_settings().RATES_MAPPED_CHECK_INTERVAL)
+
+
+def reload_mapped_rates(**kwargs):
+    if kwargs['setting'] == 'TXMONEY':
+        settings = get_settings()
+        mapped_rates.configure(settings.RATES_MAPPED_FILE, settings.RATES_MAPPED_CHECK_INTERVAL)
+
+
+def rewrite_mapped_rates(sender, using, **kwargs):
+    schedule_mapped_rates(using)
+
+
+post_save.connect(rewrite_mapped_rates, sender=Rate)
+post_delete.connect(rewrite_mapped_rates, sender=Rate)
+setting_changed.connect(reload_mapped_rates)
@@ -0,0 +1,145 @@
+# coding=utf-8
+"""
+Exchange ratios between every pair of currencies of a date.
+
+Requires NumPy, which is an optional dependency of TXMoney.
+"""
+from __future__ import absolute_import, division, unicode_literals
+
+from decimal import Decimal
+
+import numpy as np
+from django.utils.six import iteritems, string_types
+
+from ..money.models.money import Currency
+from ..settings import get_settings
+from .models import Rate
+
+
+class CrossRateMatrix(object):
+    """
+    A CrossRateMatrix holds the ratio between every pair of N currencies as
+    an N x N NumPy object array of Decimals, where the ratio from currency
+    `i` to currency `j` is at [i, j], and a map of currency codes to indexes.
+
+    The following are supported:
+        CrossRateMatrix.for_date(date(2017, 1, 1))          # from stored rates
+        CrossRateMatrix({'GBP': Decimal('0.8'), ...})       # rates in the default currency
+
+        matrix.ratio('GBP', 'USD')
+        matrix.convert(['10', '20'], ['GBP', 'EUR'], 'USD')
+    """
+
+    def __init__(self, rates, base_currency=None):
+        self._base_currency = base_currency or getattr(rates, 'base_currency', get_settings().DEFAULT_CURRENCY)
+        self._codes = []
+        self._index = {}
+        self._rates = np.empty(0, dtype=object)
+        self._matrix = np.empty((0, 0), dtype=object)
+        rates = dict(rates)
+        rates.setdefault(self._base_currency, Decimal(1))
+        self.update(rates)
+
+    @classmethod
+    def for_date(cls, rate_date=None, source=None):
+        """
+        Builds the matrix from the rates of a date, see RateQuerySet.snapshot
+        """
+        return cls(Rate.objects.snapshot(rate_date, source))
+
+    @property
+    def base_currency(self):
+        return self._base_currency
+
+    @property
+    def currencies(self):
+        return tuple(self._codes)
+
+    @property
+    def matrix(self):
+        return self._matrix
+
+    def __len__(self):
+        return len(self._codes)
+
+    def __contains__(self, currency):
+        return getattr(currency, 'code', currency) in self._index
+
+    def __repr__(self):
+        return '<CrossRateMatrix {} currencies>'.format(len(self._codes))
+
+    def index(self, currency):
+        """
+        Return the matrix index of a currency
+        """
+        code = getattr(currency, 'code', currency)
+        try:
+            return self._index[code]
+        except KeyError:
+            raise Rate.DoesNotExist('No {} rate in the cross rate matrix'.format(code))
+
+    def ratio(self, currency_from, currency_to):
+        """
+        Return exchange ratio between two currencies
+        """
+        return self._matrix[self.index(currency_from), self.index(currency_to)]
+
+    def ratios(self, currencies_from, currency_to):
+        """
+        Return an array with the exchange ratio of each currency in
+        `currencies_from` to `currency_to`
+        """
+        codes, inverse = np.unique(np.asarray(currencies_from, dtype='U3'), return_inverse=True)
+        column = self._matrix[:, self.index(currency_to)]
+        return column[[self.index(code) for code in codes]][inverse]
+
+    def convert(self, amounts, currencies_from, currency_to):
+        """
+        Exchange an array of amounts in `currencies_from`, a currency or an
+        array of currencies, to `currency_to`
+        :return: NumPy object array of Decimals
+        """
+        amounts = np.asarray([a if isinstance(a, Decimal) else Decimal(str(a)) for a in amounts], dtype=object)
+        if isinstance(currencies_from, string_types) or hasattr(currencies_from, 'code'):
+            return amounts * self.ratio(currencies_from, currency_to)
+        return amounts * self.ratios(currencies_from, currency_to)
+
+    def exchange(self, moneys, currency_to):
+        """
+        Exchange a MoneyArray to `currency_to`
+        :return: MoneyArray
+        """
+        code = Currency.get_by_code(getattr(currency_to, 'code', currency_to)).code
+        amounts = moneys.amounts * self.ratios(moneys.currencies, code)
+        return moneys._make(amounts, np.full(len(amounts), code, dtype='U3'))
+
+    def update(self, rates):
+        """
+        Updates the matrix in place with new or changed rates, recomputing only
+        the rows and columns of the currencies that changed
+        :return: set of updated currency codes
+        """
+        rates = dict(rates)
+        changed = set(
+            code for code, value in iteritems(rates)
+            if code not in self._index or self._rates[self._index[code]] != value
+        )
+        new = sorted(code for code in changed if code not in self._index)
+        if new:
+            size, grown = len(self._codes), len(self._codes) + len(new)
+            rates_array = np.empty(grown, dtype=object)
+            rates_array[:size] = self._rates
+            matrix = np.empty((grown, grown), dtype=object)
+            matrix[:size, :size] = self._matrix
+            for code in new:
+                self._index[code] = len(self._codes)
+                self._codes.append(code)
+            self._rates, self._matrix = rates_array, matrix
+
+        for code in changed:
+            self._rates[self._index[code]] = rates[code]
+        for code in changed:
+            i = self._index[code]
+            self._matrix[i, :] = self._rates / self._rates[i]
+            self._matrix[:, i] = self._rates[i] / self._rates
+        return changed
@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+# Covers the "latest rate of a currency on or before a date" lookups of a
+# source, so they are an index seek that doesn't need to read the table.
+# Meta.indexes is not available in all supported Django versions.
+CREATE_INDEX = (
+    'CREATE INDEX txmoney_rate_source_currency_date_idx ON txmoney_rate (source_id, currency, date DESC, value)'
+)
+DROP_INDEX = 'DROP INDEX txmoney_rate_source_currency_date_idx'
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('txmoney', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunSQL([CREATE_INDEX], [DROP_INDEX]),
+    ]
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def fill_latest_rates(apps, schema_editor):
+    Rate = apps.get_model('txmoney', 'Rate')
+    LatestRate = apps.get_model('txmoney', 'LatestRate')
+    rates = Rate.objects.using(schema_editor.connection.alias)
+
+    latest = []
+    for source_id, currency in rates.values_list('source_id', 'currency').distinct():
+        latest.append(rates.filter(source_id=source_id, currency=currency).order_by('-date', '-id')[0])
+    # In the order of the rates, so ties between sources go to the last one
+    LatestRate.objects.using(schema_editor.connection.alias).bulk_create([
+        LatestRate(source_id=rate.source_id, currency=rate.currency, value=rate.value, date=rate.date)
+        for rate in sorted(latest, key=lambda rate: rate.id)
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('txmoney', '0002_rate_latest_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LatestRate',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('currency', models.CharField(max_length=3)),
+                ('value', models.DecimalField(decimal_places=6, max_digits=14)),
+                ('date', models.DateField()),
+                ('source', models.ForeignKey(
+                    on_delete=django.db.models.deletion.CASCADE, related_name='latest_rates',
+                    related_query_name='latest_rate', to='txmoney.RateSource'
+                )),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='latestrate',
+            unique_together=set([('source', 'currency')]),
+        ),
+        migrations.RunPython(fill_latest_rates, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('txmoney', '0003_latestrate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BackfilledDate',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('source', models.ForeignKey(
+                    on_delete=django.db.models.deletion.CASCADE, related_name='backfilled_dates',
+                    related_query_name='backfilled_date', to='txmoney.RateSource'
+                )),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='backfilleddate',
+            unique_together=set([('source', 'date')]),
+        ),
+    ]
@@ -1,20 +1,30 @@
 # coding=utf-8
 from __future__ import absolute_import, unicode_literals
 
-from datetime import date
+from collections import OrderedDict
+from datetime import date, timedelta
+from decimal import Decimal
+from itertools import islice
 
-from django.db import models
+from django.db import connections, models, transaction
+from django.utils import timezone
 from django.utils.encoding import python_2_unicode_compatible
 from django.utils.functional import cached_property
+from django.utils.six import iteritems, string_types
 from django.utils.translation import ugettext_lazy as _
 
-from ..settings import txmoney_settings as settings
+from ..settings import get_settings
+
+try:
+    from collections.abc import Mapping
+except ImportError:  # Python 2
+    from collections import Mapping
 
 
 @python_2_unicode_compatible
 class RateSource(models.Model):
     name = models.CharField(max_length=100)
-    base_currency = models.CharField(max_length=3, default=settings.DEFAULT_CURRENCY, blank=True)
+    base_currency = models.CharField(max_length=3, default=get_settings().DEFAULT_CURRENCY, blank=True)
     last_update = models.DateTimeField(auto_now=True, blank=True)
 
     class Meta:
@@ -25,23 +35,409 @@ class RateSource(models.Model):
 
     @cached_property
     def is_updated(self):
-        return True if self.last_update.date() == date.today() else False
+        # Rates are dated with the local date.today()
+        last_update = self.last_update
+        if timezone.is_aware(last_update):
+            last_update = timezone.localtime(last_update)
+        return last_update.date() == date.today()
+
+
+class SourcesQuerySetMixin(object):
+    """
+    Rate lookups by source priority, for querysets with a `get_for_date`
+    """
+
+    def get_for_sources(self, currency, currency_date=None, sources=None, fallback=None):
+        """
+        Return currency rate for a date or first oldest from the first of
+        `sources` that has one.
+
+        By default `sources` and `fallback` come from the RATES_SOURCES and
+        RATES_SOURCE_FALLBACK settings. With `fallback`, or without sources,
+        any source is used when none of them has a rate.
+        """
+        settings = get_settings()
+        sources = settings.RATES_SOURCES if sources is None else sources
+        fallback = settings.RATES_SOURCE_FALLBACK if fallback is None else fallback
+
+        for source in sources:
+            try:
+                return self.get_for_date(currency, currency_date, source)
+            except Rate.DoesNotExist:
+                pass
+        if fallback or not sources:
+            return self.get_for_date(currency, currency_date)
+        raise Rate.DoesNotExist("No {} rate for {} or older date in sources {}".format(
+            currency, currency_date or date.today(), ', '.join(str(source) for source in sources)
+        ))
 
 
-class RateQuerySet(models.QuerySet):
+class RateQuerySet(SourcesQuerySetMixin, models.QuerySet):
 
-    def get_for_date(self, currency, currency_date=None):
+    def get_for_date(self, currency, currency_date=None, source=None):
         """
         Return currency rate for a date or first oldest.
 
-        If not `currency_date` is given today is used.
+        If not `currency_date` is given today is used. `source` can be a
+        RateSource, its pk or its name.
         """
         currency_date = currency_date or date.today()
+        rates = self.filter(currency=currency, date__lte=currency_date)
+        if isinstance(source, string_types):
+            rates = rates.filter(source__name=source)
+        elif source is not None:
+            rates = rates.filter(source=source)
         try:
-            return self.filter(currency=currency, date__lte=currency_date).order_by('-date')[:1].get()
+            return rates.order_by('-date')[:1].get()
         except Rate.DoesNotExist:
             raise Rate.DoesNotExist("No {} rate for {} or older date".format(currency, currency_date))
 
+    def _source_ids(self, source=None, sources=None, fallback=None):
+        """
+        Return the pks of the sources to take rates from, by priority, and
+        whether to fall back to any other source, as `get_for_sources` does.
+
+        `source`, a RateSource, its pk or its name, is the only one used when
+        given. Otherwise `sources` names and `fallback` default to the
+        RATES_SOURCES and RATES_SOURCE_FALLBACK settings.
+        """
+        if source is not None:
+            sources, fallback = [source], False
+        else:
+            settings = get_settings()
+            sources = settings.RATES_SOURCES if sources is None else sources
+            fallback = settings.RATES_SOURCE_FALLBACK if fallback is None else fallback
+            fallback = bool(fallback or not sources)
+
+        names = [name for name in sources if isinstance(name, string_types)]
+        pks = dict(RateSource.objects.using(self.db).filter(name__in=names).values_list('name', 'pk')) if names else {}
+        source_ids = []
+        for source in sources:
+            source_id = pks.get(source) if isinstance(source, string_types) else getattr(source, 'pk', source)
+            if source_id is not None and source_id not in source_ids:
+                source_ids.append(source_id)
+        return source_ids, fallback
+
+    def _latest_where(self, rate_date, source_id=None, template='{latest}', currencies=None):
+        """
+        Return SQL and params of a condition selecting only the latest rate
+        of each source and currency on or before `rate_date`, of `source_id`
+        and `currencies` when given.
+
+        The latest dates are grouped once in a derived table, which the
+        source, currency and date index serves, rather than looked up for
+        every row, since Subquery expressions are not available in all
+        supported Django versions. `template` can wrap it with other
+        conditions on the columns.
+        """
+        qn = connections[self.db].ops.quote_name
+        names = {
+            'table': qn(Rate._meta.db_table), 'id': qn('id'), 'currency': qn('currency'),
+            'date': qn('date'), 'source': qn('source_id'),
+        }
+        grouped = 'SELECT {source}, {currency}, MAX({date}) AS {date} FROM {table} WHERE {date} <= %s'
+        params = [rate_date]
+        if source_id is not None:
+            grouped += ' AND {source} = %s'
+            params.append(source_id)
+        if currencies is not None:
+            currencies = list(currencies) or ['']
+            grouped += ' AND {currency} IN (' + ', '.join(['%s'] * len(currencies)) + ')'
+            params.extend(currencies)
+        grouped += ' GROUP BY {source}, {currency}'
+        latest = (
+            '{table}.{id} IN (SELECT candidate.{id} FROM {table} candidate INNER JOIN (' + grouped + ') latest '
+            'ON candidate.{source} = latest.{source} AND candidate.{currency} = latest.{currency} '
+            'AND candidate.{date} = latest.{date})'
+        )
+        return template.format(latest=latest).format(**names), params
+
+    def snapshot(self, snapshot_date=None, source=None, sources=None, fallback=None):
+        """
+        Return a RateSnapshot with the rate of every currency for a date or
+        first oldest, loaded in a single query.
+
+        If not `snapshot_date` is given today is used. Rates come from
+        `source`, a RateSource, its pk or its name, when given. Otherwise
+        from `sources` by priority, as `get_for_sources` does. When there are
+        rates from several of the other sources for the same date the last
+        created one is used.
+        """
+        snapshot_date = snapshot_date or date.today()
+        source_ids, fallback = self._source_ids(source, sources, fallback)
+        rates = self.filter(date__lte=snapshot_date)
+        if not fallback:
+            rates = rates.filter(source_id__in=source_ids)
+        single = source_ids[0] if len(source_ids) == 1 and not fallback else None
+        where, params = self._latest_where(snapshot_date, single)
+        rates = rates.extra(where=[where], params=params)
+
+        # The latest rate of each source, by source priority and then date
+        priorities = dict((source_id, priority) for priority, source_id in enumerate(source_ids))
+        latest = {}
+        rows = rates.values_list('source', 'currency', 'value', 'date', 'id')
+        for source_id, currency, value, rate_date, pk in rows:
+            key = (priorities.get(source_id, len(source_ids)), -rate_date.toordinal(), -pk)
+            if currency not in latest or key < latest[currency][0]:
+                latest[currency] = (key, value)
+
+        source_id = source_ids[0] if source is not None and source_ids else None
+        values = dict((currency, value) for currency, (_, value) in iteritems(latest))
+        return RateSnapshot(snapshot_date, values, source_id=source_id)
+
+    def series(self, currencies, start, end, source=None, sources=None, fallback=None):
+        """
+        Return a RateSeries with the rates of `currencies` for every day from
+        `start` to `end`.
+
+        Days without a rate get the one of the first older date, as with
+        `get_for_date`. Rates are chosen by source as in `snapshot`: the rates
+        of each of `sources` are loaded in a query, and the ones of any other
+        source in another.
+        """
+        codes = set(getattr(currency, 'code', currency) for currency in currencies)
+        codes.discard(get_settings().DEFAULT_CURRENCY)
+        source_ids, fallback = self._source_ids(source, sources, fallback)
+
+        layers = [
+            self.filter(source_id=source_id)._series_values(codes, start, end, source_id)
+            for source_id in source_ids
+        ]
+        if fallback:
+            layers.append(self.exclude(source_id__in=source_ids)._series_values(codes, start, end))
+
+        values = {}
+        for code in codes:
+            # Each day gets the value of the first source that has one
+            filled = [None] * ((end - start).days + 1)
+            for layer in reversed(layers):
+                filled = [old if value is None else value for value, old in zip(layer[code], filled)]
+            values[code] = tuple(filled)
+        source_id = source_ids[0] if source is not None and source_ids else None
+        return RateSeries(start, end, values, source_id=source_id)
+
+    def _series_values(self, codes, start, end, source_id=None):
+        """
+        Return a dict mapping `codes` to a list with their rate value for
+        every day from `start` to `end`, loaded in a single query
+        """
+        rates = self.filter(currency__in=codes, date__lte=end)
+        # Rates in the range, plus the one in force on its first day
+        where, params = self._latest_where(start, source_id, '({{table}}.{{date}} >= %s OR {latest})', codes)
+        rates = rates.extra(where=[where], params=[start] + params).order_by('date', 'id')
+
+        days = (end - start).days + 1
+        changes = dict((code, {}) for code in codes)
+        for currency, value, rate_date in rates.values_list('currency', 'value', 'date'):
+            changes[currency][max((rate_date - start).days, 0)] = value
+
+        values = {}
+        for code, changed in iteritems(changes):
+            value, filled = None, []
+            for day in range(days):
+                value = changed.get(day, value)
+                filled.append(value)
+            values[code] = filled
+        return values
+
+    def upsert(self, source, rates, rate_date=None, chunk_size=None, changes_only=None):
+        """
+        Writes the rates of `source` for a date, today by default: missing
+        ones are inserted, the ones whose value changed are updated and the
+        rest are skipped, so it can be run again with the same rates.
+
+        Rates are written in chunks of `chunk_size` rows, RATES_WRITE_CHUNK_SIZE
+        by default, with INSERT ... ON CONFLICT where the database supports it.
+
+        With `changes_only`, RATES_CHANGES_ONLY by default, rates equal to the
+        previous one of their currency are not stored, since lookups of the
+        latest rate on or before a date already return it, with the same
+        exceptions as `compact`. Dates must then be written in order, see
+        `compact` for other cases.
+        :param rates: dict or iterable of (currency, value) pairs
+        :return: number of rows inserted, updated or deleted
+        """
+        settings = get_settings()
+        connection = connections[self.db]
+        chunk_size = chunk_size or settings.RATES_WRITE_CHUNK_SIZE
+        changes_only = settings.RATES_CHANGES_ONLY if changes_only is None else changes_only
+        # Keep within the query parameters limit of the database
+        fields = ('source', 'currency', 'value', 'date')
+        chunk_size = min(chunk_size, connection.ops.bulk_batch_size(fields, range(chunk_size)))
+        write_chunk = self._upsert_on_conflict if _supports_on_conflict(connection) else self._upsert_chunk
+
+        value_field = Rate._meta.get_field('value')
+        exponent = Decimal(1).scaleb(-value_field.decimal_places)
+        rates = iter(iteritems(rates) if isinstance(rates, Mapping) else rates)
+        rate_date = rate_date or date.today()
+        written = 0
+        with transaction.atomic(using=self.db):
+            while True:
+                # Values as stored, so unchanged ones compare equal
+                chunk = OrderedDict(
+                    (currency, value_field.to_python(value).quantize(exponent))
+                    for currency, value in islice(rates, chunk_size)
+                )
+                if not chunk:
+                    if written:
+                        # mapped imports this module
+                        from .mapped import schedule_mapped_rates
+                        schedule_mapped_rates(self.db)
+                    return written
+                currencies = list(chunk)
+                if changes_only:
+                    written += self._discard_unchanged(source, rate_date, chunk)
+                if chunk:
+                    written += write_chunk(source, rate_date, chunk)
+                LatestRate.objects.using(self.db).refresh(source, currencies, rate_date)
+
+    def _discard_unchanged(self, source, rate_date, chunk):
+        """
+        Removes from `chunk` the rates equal to the previous rate of their
+        currency, deleting their rows of `rate_date` if any.
+        :return: number of rows deleted
+        """
+        shared = self._shared_currencies(source, chunk)
+        rates = self.filter(source=source, currency__in=list(chunk), date__lt=rate_date)
+        where, params = self._latest_where(rate_date - timedelta(days=1), source.pk, currencies=chunk)
+        previous = rates.extra(where=[where], params=params).values_list('currency', 'value')
+        unchanged = [currency for currency, value in previous if chunk[currency] == value and currency not in shared]
+        for currency in unchanged:
+            del chunk[currency]
+        if not unchanged:
+            return 0
+        ids = self.filter(source=source, currency__in=unchanged, date=rate_date).values_list('id', flat=True)
+        return self._delete(list(ids))
+
+    def compact(self, source=None, start=None, chunk_size=None):
+        """
+        Deletes the rates equal to the previous rate of their source and
+        currency, from `start` on when given. Lookups of the latest rate on
+        or before a date return the same values afterwards.
+
+        Lookups without a source take the latest rate of any source, so the
+        rates of currencies other sources have rates of too are kept, unless
+        RATES_SOURCES sets a priority without RATES_SOURCE_FALLBACK.
+        :return: number of rows deleted
+        """
+        settings = get_settings()
+        chunk_size = chunk_size or settings.RATES_WRITE_CHUNK_SIZE
+        sources = [source] if source is not None else RateSource.objects.using(self.db).all()
+
+        deleted = 0
+        for source in sources:
+            rates = self.filter(source=source).exclude(currency__in=list(self._shared_currencies(source)))
+            previous = {}
+            if start is not None:
+                where, params = self._latest_where(start - timedelta(days=1), source.pk)
+                before = rates.filter(date__lt=start).extra(where=[where], params=params)
+                previous = dict(before.values_list('currency', 'value'))
+                rates = rates.filter(date__gte=start)
+
+            redundant = []
+            rows = rates.order_by('currency', 'date').values_list('id', 'currency', 'value')
+            for pk, currency, value in rows.iterator():
+                if currency in previous and previous[currency] == value:
+                    redundant.append(pk)
+                    if len(redundant) == chunk_size:
+                        deleted += self._delete(redundant)
+                        redundant = []
+                previous[currency] = value
+            if redundant:
+                deleted += self._delete(redundant)
+            # Values don't change, but dates of the latest rates may
+            LatestRate.objects.using(self.db).refresh(source)
+        if deleted:
+            # mapped imports this module
+            from .mapped import schedule_mapped_rates
+            schedule_mapped_rates(self.db)
+        return deleted
+
+    def _shared_currencies(self, source, currencies=None):
+        """
+        Return the currencies of `currencies`, or of all, that sources other
+        than `source` have rates of, whose unchanged rates `compact` keeps.
+        Empty when RATES_SOURCES sets a priority without fallback, since
+        lookups then never compare rates of different sources.
+        """
+        settings = get_settings()
+        if settings.RATES_SOURCES and not settings.RATES_SOURCE_FALLBACK:
+            return set()
+        others = Rate.objects.using(self.db).exclude(source=source)
+        if currencies is not None:
+            others = others.filter(currency__in=list(currencies))
+        return set(others.values_list('currency', flat=True).distinct())
+
+    def _delete(self, ids):
+        """
+        Deletes rates by id with a single DELETE statement, without the
+        signals of QuerySet.delete. Callers clear cached rates if needed.
+        :return: number of rows deleted
+        """
+        if not ids:
+            return 0
+        connection = connections[self.db]
+        sql = 'DELETE FROM {} WHERE {} IN ({})'.format(
+            connection.ops.quote_name(Rate._meta.db_table), connection.ops.quote_name('id'),
+            ', '.join(['%s'] * len(ids))
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, ids)
+            return cursor.rowcount
+
+    def _insert(self, source, rate_date, rates, on_conflict=''):
+        """
+        Inserts rates with a single INSERT statement. It is used instead of
+        bulk_create, which always sets `date` to today.
+        :return: number of rows written
+        """
+        connection = connections[self.db]
+        qn = connection.ops.quote_name
+        date_field, value_field = Rate._meta.get_field('date'), Rate._meta.get_field('value')
+        sql = 'INSERT INTO {table} ({source}, {currency}, {value}, {date}) VALUES {rows} ' + on_conflict
+        sql = sql.format(
+            table=qn(Rate._meta.db_table), source=qn('source_id'), currency=qn('currency'), value=qn('value'),
+            date=qn('date'), rows=', '.join(['(%s, %s, %s, %s)'] * len(rates))
+        )
+        params = []
+        db_date = date_field.get_db_prep_save(rate_date, connection)
+        for currency, value in rates:
+            params.extend([source.pk, currency, value_field.get_db_prep_save(value, connection), db_date])
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.rowcount
+
+    def _upsert_on_conflict(self, source, rate_date, chunk):
+        return self._insert(source, rate_date, list(iteritems(chunk)), (
+            'ON CONFLICT ({source}, {currency}, {date}) DO UPDATE SET {value} = excluded.{value} '
+            'WHERE {table}.{value} <> excluded.{value}'
+        ))
+
+    def _upsert_chunk(self, source, rate_date, chunk):
+        rates = self.filter(source=source, date=rate_date)
+        stored = dict(rates.filter(currency__in=list(chunk)).values_list('currency', 'value'))
+        new = [(currency, value) for currency, value in iteritems(chunk) if currency not in stored]
+        if new:
+            self._insert(source, rate_date, new)
+        changed = [
+            (currency, value) for currency, value in iteritems(chunk)
+            if currency in stored and stored[currency] != value
+        ]
+        for currency, value in changed:
+            rates.filter(currency=currency).update(value=value)
+        return len(new) + len(changed)
+
+
+def _supports_on_conflict(connection):
+    """
+    Return whether the database supports INSERT ... ON CONFLICT DO UPDATE
+    """
+    if connection.vendor == 'postgresql':
+        return connection.pg_version >= 90500
+    if connection.vendor == 'sqlite':
+        return connection.Database.sqlite_version_info >= (3, 24, 0)
+    return False
+
 
 @python_2_unicode_compatible
 class Rate(models.Model):
@@ -57,3 +453,304 @@ class Rate(models.Model):
 
     def __str__(self):
         return _("%s at %.6f") % (self.currency, self.value)
+
+
+class LatestRateQuerySet(SourcesQuerySetMixin, models.QuerySet):
+
+    def get_for_date(self, currency, currency_date=None, source=None):
+        """
+        Return the latest rate of a currency, which is the one in force today
+        or later, with an index lookup instead of a range scan of rates.
+
+        If not `currency_date` is given today is used. If the latest rate is
+        dated after `currency_date` the Rate in force that date is returned.
+        """
+        currency_date = currency_date or date.today()
+        rates = self.filter(currency=currency)
+        if isinstance(source, string_types):
+            rates = rates.filter(source__name=source)
+        elif source is not None:
+            rates = rates.filter(source=source)
+        latest = rates.order_by('-date', '-id').first()
+        if latest is None:
+            raise Rate.DoesNotExist("No {} rate for {} or older date".format(currency, currency_date))
+        if latest.date > currency_date:
+            return Rate.objects.using(self.db).get_for_date(currency, currency_date, source)
+        return latest
+
+    def refresh(self, source, currencies=None, since=None):
+        """
+        Updates the latest rates of `source` from its stored rates, for
+        `currencies` or all of them. With `since`, only rates written on that
+        date are taken into account, and the ones with a later latest rate
+        are left as they are.
+        """
+        source_id = getattr(source, 'pk', source)
+        stored = self.filter(source_id=source_id)
+        if currencies is not None:
+            currencies = set(currencies)
+            stored = stored.filter(currency__in=list(currencies))
+        stored = dict((currency, (pk, value, rate_date)) for pk, currency, value, rate_date in stored.values_list(
+            'id', 'currency', 'value', 'date'
+        ))
+        if since is not None:
+            currencies = set(
+                currency for currency in (stored if currencies is None else currencies)
+                if currency not in stored or stored[currency][2] <= since
+            )
+            if not currencies:
+                return
+
+        rates = Rate.objects.using(self.db).filter(source_id=source_id)
+        if currencies is not None:
+            rates = rates.filter(currency__in=list(currencies))
+        where, params = rates._latest_where(date.max, source_id, currencies=currencies)
+        latest = dict((currency, (value, rate_date)) for currency, value, rate_date in rates.extra(
+            where=[where], params=params
+        ).values_list('currency', 'value', 'date'))
+
+        # A new date gets a new row, so ties between sources go to the last
+        # one written, as with Rate ids
+        stale = [
+            pk for currency, (pk, value, rate_date) in iteritems(stored)
+            if (currencies is None or currency in currencies) and latest.get(currency, (None, None))[1] != rate_date
+        ]
+        if stale:
+            self.filter(pk__in=stale).delete()
+        self.bulk_create([
+            LatestRate(source_id=source_id, currency=currency, value=value, date=rate_date)
+            for currency, (value, rate_date) in sorted(iteritems(latest))
+            if currency not in stored or stored[currency][2] != rate_date
+        ])
+        for currency, (value, rate_date) in iteritems(latest):
+            if currency in stored and stored[currency][2] == rate_date and stored[currency][1] != value:
+                self.filter(pk=stored[currency][0]).update(value=value)
+
+
+@python_2_unicode_compatible
+class LatestRate(models.Model):
+    """
+    Latest rate of each currency and source, kept up to date from Rate
+    """
+    source = models.ForeignKey(
+        RateSource, on_delete=models.CASCADE, related_name='latest_rates', related_query_name='latest_rate'
+    )
+    currency = models.CharField(max_length=3)
+    value = models.DecimalField(max_digits=14, decimal_places=6)
+    date = models.DateField()
+
+    objects = LatestRateQuerySet.as_manager()
+
+    class Meta:
+        unique_together = ('source', 'currency')
+
+    def __str__(self):
+        return _("%s at %.6f") % (self.currency, self.value)
+
+
+@python_2_unicode_compatible
+class BackfilledDate(models.Model):
+    """
+    Date whose rates were backfilled for a source, kept even when only rate
+    changes are stored and none of its rates remain
+    """
+    source = models.ForeignKey(
+        RateSource, on_delete=models.CASCADE, related_name='backfilled_dates', related_query_name='backfilled_date'
+    )
+    date = models.DateField()
+
+    class Meta:
+        unique_together = ('source', 'date')
+
+    def __str__(self):
+        return _("%s backfilled on %s") % (self.source.name, self.date)
+
+
+def refresh_latest_rate(sender, instance, using, **kwargs):
+    LatestRate.objects.using(using).refresh(instance.source_id, [instance.currency])
+
+
+models.signals.post_save.connect(refresh_latest_rate, sender=Rate)
+models.signals.post_delete.connect(refresh_latest_rate, sender=Rate)
+
+
+class RateSnapshot(Mapping):
+    """
+    Immutable mapping of currency codes to their rate values, frozen as of
+    a date, to exchange many amounts without querying the database.
+
+    Built with `Rate.objects.snapshot(date)`. Snapshots can be pickled, for
+    instance to pass them to Celery tasks.
+    """
+
+    __slots__ = ('_date', '_rates', '_base_currency', '_source_id')
+
+    def __init__(self, snapshot_date, rates, base_currency=None, source_id=None):
+        _setattr = object.__setattr__
+        _setattr(self, '_date', snapshot_date)
+        _setattr(self, '_rates', dict(rates))
+        _setattr(self, '_base_currency', base_currency or get_settings().DEFAULT_CURRENCY)
+        _setattr(self, '_source_id', source_id)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('RateSnapshot instances are immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError('RateSnapshot instances are immutable')
+
+    def __reduce__(self):
+        return self.__class__, (self._date, self._rates, self._base_currency, self._source_id)
+
+    def __repr__(self):
+        return '<RateSnapshot {} {} rates>'.format(self._date, len(self._rates))
+
+    @property
+    def date(self):
+        return self._date
+
+    @property
+    def base_currency(self):
+        return self._base_currency
+
+    @property
+    def source_id(self):
+        return self._source_id
+
+    def __getitem__(self, currency):
+        return self._rates[currency]
+
+    def __iter__(self):
+        return iter(self._rates)
+
+    def __len__(self):
+        return len(self._rates)
+
+    def get_rate(self, currency):
+        """
+        Return the rate value of a currency, 1 for the base currency
+        """
+        code = getattr(currency, 'code', currency)
+        if code == self._base_currency:
+            return Decimal(1)
+        try:
+            return self._rates[code]
+        except KeyError:
+            raise Rate.DoesNotExist("No {} rate for {} or older date".format(code, self._date))
+
+    def ratio(self, currency_from, currency_to):
+        """
+        Return exchange ratio between two currencies
+        """
+        if currency_from == currency_to:
+            return Decimal(1)
+        return self.get_rate(currency_to) / self.get_rate(currency_from)
+
+
+class RateSeries(Mapping):
+    """
+    Immutable mapping of currency codes to a tuple with their rate value for
+    every day from `start` to `end`, None for days before the first rate.
+
+    Built with `Rate.objects.series(currencies, start, end)`. The rates of a
+    date are found by its offset from `start`.
+    """
+
+    __slots__ = ('_start', '_end', '_values', '_base_currency', '_source_id')
+
+    def __init__(self, start, end, values, base_currency=None, source_id=None):
+        _setattr = object.__setattr__
+        _setattr(self, '_start', start)
+        _setattr(self, '_end', end)
+        _setattr(self, '_values', dict(values))
+        _setattr(self, '_base_currency', base_currency or get_settings().DEFAULT_CURRENCY)
+        _setattr(self, '_source_id', source_id)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('RateSeries instances are immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError('RateSeries instances are immutable')
+
+    def __reduce__(self):
+        return self.__class__, (self._start, self._end, self._values, self._base_currency, self._source_id)
+
+    def __repr__(self):
+        return '<RateSeries {} - {} {} currencies>'.format(self._start, self._end, len(self._values))
+
+    @property
+    def start(self):
+        return self._start
+
+    @property
+    def end(self):
+        return self._end
+
+    @property
+    def base_currency(self):
+        return self._base_currency
+
+    @property
+    def source_id(self):
+        return self._source_id
+
+    @property
+    def dates(self):
+        return [self._start + timedelta(day) for day in range((self._end - self._start).days + 1)]
+
+    def __getitem__(self, currency):
+        return self._values[currency]
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __len__(self):
+        return len(self._values)
+
+    def _day(self, rate_date):
+        day = (rate_date - self._start).days
+        if not 0 <= day <= (self._end - self._start).days:
+            raise ValueError('{} is out of the series range {} - {}'.format(rate_date, self._start, self._end))
+        return day
+
+    def _rates(self, currency):
+        code = getattr(currency, 'code', currency)
+        if code == self._base_currency:
+            return (Decimal(1),) * ((self._end - self._start).days + 1)
+        try:
+            return self._values[code]
+        except KeyError:
+            raise Rate.DoesNotExist("No {} rates from {} to {}".format(code, self._start, self._end))
+
+    def get_rate(self, currency, rate_date):
+        """
+        Return the rate value of a currency for a date, 1 for the base currency
+        """
+        value = self._rates(currency)[self._day(rate_date)]
+        if value is None:
+            code = getattr(currency, 'code', currency)
+            raise Rate.DoesNotExist("No {} rate for {} or older date".format(code, rate_date))
+        return value
+
+    def ratio(self, currency_from, currency_to, rate_date):
+        """
+        Return exchange ratio between two currencies for a date
+        """
+        if currency_from == currency_to:
+            return Decimal(1)
+        return self.get_rate(currency_to, rate_date) / self.get_rate(currency_from, rate_date)
+
+    def ratios(self, currency_from, currency_to, start=None, end=None):
+        """
+        Return a list with the exchange ratio between two currencies for every
+        day of the series, or from `start` to `end`
+        """
+        first = self._day(start or self._start)
+        last = self._day(end or self._end) + 1
+        rates_from = self._rates(currency_from)[first:last]
+        rates_to = self._rates(currency_to)[first:last]
+        if None in rates_from or None in rates_to:
+            day = first + min(rates.index(None) for rates in (rates_from, rates_to) if None in rates)
+            raise Rate.DoesNotExist("No {} to {} rate for {} or older date".format(
+                currency_from, currency_to, self._start + timedelta(day)
+            ))
+        return [rate_to / rate_from for rate_from, rate_to in zip(rates_from, rates_to)]
@@ -0,0 +1,7 @@
+# coding=utf-8
+from __future__ import absolute_import, unicode_literals
+
+from django.dispatch import Signal
+
+# Sent by BaseRateBackend.update_rates once new rates of `source` are committed
+rates_updated = Signal(providing_args=['source'])
@@ -0,0 +1,153 @@
+# coding=utf-8
+"""
+Rate snapshots shared between processes through the Django cache framework.
+
+Enabled by setting RATES_STORE_CACHE to the alias of a configured cache.
+Snapshots are stored under keys versioned with a generation counter, which
+is bumped whenever rates change, so every process reloads them at most once
+per generation. Processes read the generation from the cache at most every
+RATES_STORE_CHECK_INTERVAL seconds, so rates changed by another process are
+seen up to that late.
+"""
+from __future__ import absolute_import, unicode_literals
+
+import hashlib
+import time
+
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.db.models.signals import post_delete, post_save
+from django.utils.encoding import force_bytes
+from django.utils.six import integer_types
+
+from ..settings import get_settings
+from .models import Rate
+from .signals import rates_updated
+
+GENERATION_KEY = 'txmoney:rates:generation'
+SNAPSHOT_KEY = 'txmoney:rates:{generation}:{source}:{date}'
+
+_now = getattr(time, 'monotonic', time.time)
+
+
+class RateStore(object):
+    """
+    Keeps RateSnapshots per (source, date) in a Django cache, and the ones
+    of the current generation in process. The generation is looked up in
+    the cache at most every `check_interval` seconds.
+    """
+
+    def __init__(self, cache_alias=None, timeout=None, check_interval=None):
+        self.cache_alias = cache_alias
+        self.timeout = timeout
+        self.check_interval = check_interval
+        self._generation = None
+        self._next_check = 0
+        self._snapshots = {}
+
+    @property
+    def enabled(self):
+        return bool(self.cache_alias)
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def generation(self):
+        """
+        Return the current generation, starting it if the cache has none
+        """
+        cache = self.cache
+        generation = cache.get(GENERATION_KEY)
+        if generation is None:
+            cache.add(GENERATION_KEY, 1, None)
+            generation = cache.get(GENERATION_KEY, 1)
+        return generation
+
+    def bump(self):
+        """
+        Start a new generation, invalidating every stored snapshot
+        """
+        cache = self.cache
+        try:
+            cache.incr(GENERATION_KEY)
+        except ValueError:
+            # Missing key, evicted or never set
+            cache.add(GENERATION_KEY, 1, None)
+        self._generation = None
+        self._next_check = 0
+        self._snapshots = {}
+
+    @staticmethod
+    def source_key(source):
+        """
+        Return the part of the snapshot keys for `source`, a RateSource, its
+        pk or its name, or for the RATES_SOURCES priority when it is None
+        """
+        source = getattr(source, 'pk', source)
+        if isinstance(source, integer_types):
+            return source
+        if source is None:
+            settings = get_settings()
+            source = '{}:{}'.format(','.join(settings.RATES_SOURCES), bool(settings.RATES_SOURCE_FALLBACK))
+        # Names may have characters not valid in cache keys
+        return hashlib.md5(force_bytes(source)).hexdigest()
+
+    def get_snapshot(self, snapshot_date, source=None):
+        """
+        Return the RateSnapshot for a date and source, from this process, the
+        shared cache or the database, in that order. Without `source` rates
+        are chosen by source priority, see RateQuerySet.snapshot.
+        """
+        now = _now()
+        if now >= self._next_check:
+            generation = self.generation()
+            self._next_check = now + (self.check_interval or 0)
+            if generation != self._generation:
+                self._snapshots = {}
+                self._generation = generation
+        generation = self._generation
+
+        source_key = self.source_key(source)
+        snapshot = self._snapshots.get((source_key, snapshot_date))
+        if snapshot is None:
+            cache = self.cache
+            key = SNAPSHOT_KEY.format(generation=generation, source=source_key, date=snapshot_date.isoformat())
+            snapshot = cache.get(key)
+            if snapshot is None:
+                snapshot = Rate.objects.snapshot(snapshot_date, source)
+                cache.set(key, snapshot, self.timeout)
+            self._snapshots[(source_key, snapshot_date)] = snapshot
+        return snapshot
+
+    def configure(self, cache_alias, timeout, check_interval):
+        self.cache_alias = cache_alias
+        self.timeout = timeout
+        self.check_interval = check_interval
+        self._generation = None
+        self._next_check = 0
+        self._snapshots = {}
+
+
+rate_store = RateStore(
+    get_settings().RATES_STORE_CACHE, get_settings().RATES_STORE_TIMEOUT, get_settings().RATES_STORE_CHECK_INTERVAL
+)
+
+
+def bump_rate_store(**kwargs):
+    if rate_store.enabled:
+        rate_store.bump()
+
+
+def reload_rate_store(**kwargs):
+    if kwargs['setting'] == 'TXMONEY':
+        settings = get_settings()
+        rate_store.configure(
+            settings.RATES_STORE_CACHE, settings.RATES_STORE_TIMEOUT, settings.RATES_STORE_CHECK_INTERVAL
+        )
+
+
+rates_updated.connect(bump_rate_store)
+post_save.connect(bump_rate_store, sender=Rate)
+post_delete.connect(bump_rate_store, sender=Rate)
+setting_changed.connect(reload_rate_store)
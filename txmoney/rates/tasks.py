@@ -3,14 +3,16 @@ from __future__ import absolute_import, unicode_literals
 
 from celery import shared_task
 
-from ..settings import txmoney_settings as settings
+from .backends import get_backends, update_rates_concurrently
+from .exceptions import TXRateBackendError
 
 
 @shared_task
 def update_rates():
     """
-    Obtiene los tipos de cambio para el 'backend' configurado
+    Obtiene los tipos de cambio para los 'backends' configurados
     """
-    backend_class = settings.DEFAULT_BACKEND_CLASS
-    backend = backend_class()
-    backend.update_rates()
+    results = update_rates_concurrently(get_backends()).values()
+    errors = [str(result) for result in results if isinstance(result, TXRateBackendError)]
+    if errors:
+        raise TXRateBackendError(' '.join(errors))
@@ -6,26 +6,116 @@ from decimal import Decimal
 
 from django.utils.six import iteritems
 
-from ..settings import txmoney_settings
-from .models import Rate
+from ..settings import get_settings
+from .cache import rate_cache
+from .mapped import mapped_rates
+from .models import LatestRate, Rate, RateSnapshot
+from .store import rate_store
 
 
-def exchange_ratio(currency_from, currency_to, ratio_date=None):
+def get_rate_value(currency, rate_date, source=None):
     """
-    Return exchange ratio between two currencies for a date
+    Return the rate value of a currency for a date, through the rate cache.
+
+    Without `source` the one from RATES_SOURCES with the rate is used. Rates
+    come from the memory-mapped rates file when enabled and it has them, and
+    rates of today or later from the latest rates table.
+    """
+    code = getattr(currency, 'code', currency)
+    if mapped_rates.enabled:
+        value = mapped_rates.get_value(code, rate_date, source)
+        if value is not None:
+            return value
+    rates = LatestRate.objects if rate_date >= date.today() else Rate.objects
+    if source is None:
+        return rate_cache.get((code, rate_date, None), lambda: rates.get_for_sources(code, rate_date).value)
+    source = getattr(source, 'pk', source)
+    return rate_cache.get((code, rate_date, source), lambda: rates.get_for_date(code, rate_date, source).value)
+
+
+def exchange_ratio(currency_from, currency_to, ratio_date=None, snapshot=None, source=None):
+    """
+    Return exchange ratio between two currencies for a date, or with the
+    rates of a RateSnapshot.
+
+    Rates come from `source`, a RateSource, its pk or its name, when given.
+    Otherwise from the RATES_SOURCES settings. When the shared rate store is
+    enabled the rates of the date come from its snapshots.
     """
     ratio_date = ratio_date or date.today()
+    if snapshot is None and rate_store.enabled:
+        snapshot = rate_store.get_snapshot(ratio_date, source)
+    if snapshot is not None:
+        return snapshot.ratio(currency_from, currency_to)
+
     rate_from = rate_to = Decimal(1)
 
     if currency_from != currency_to:
-        if currency_from != txmoney_settings.DEFAULT_CURRENCY:
-            rate_from = Rate.objects.get_for_date(currency_from, ratio_date).value
-        if currency_to != txmoney_settings.DEFAULT_CURRENCY:
-            rate_to = Rate.objects.get_for_date(currency_to, ratio_date).value
+        if currency_from != get_settings().DEFAULT_CURRENCY:
+            rate_from = get_rate_value(currency_from, ratio_date, source)
+        if currency_to != get_settings().DEFAULT_CURRENCY:
+            rate_to = get_rate_value(currency_to, ratio_date, source)
 
     return rate_to / rate_from
 
 
+def exchange_many(moneys, currency_to, rate_date=None, snapshot=None, source=None):
+    """
+    Exchange a list of Money to a currency for a date, or with the rates of
+    a RateSnapshot.
+
+    Rates come from `source`, a RateSource, its pk or its name, when given.
+    Otherwise from the RATES_SOURCES settings, as in exchange_ratio.
+
+    Rates of all the currencies involved are loaded in a single query and
+    each ratio is computed once.
+    :return: list with the exchanged Money, in input order
+    """
+    # Money imports this module
+    from ..money.models.money import Currency
+
+    moneys = list(moneys)
+    if not moneys:
+        return []
+
+    if not isinstance(currency_to, Currency):
+        currency_to = Currency.get_by_code(currency_to)
+
+    codes = set(money.currency.code for money in moneys)
+    if snapshot is None:
+        rate_date = rate_date or date.today()
+        needed = (codes | {currency_to.code}) - {get_settings().DEFAULT_CURRENCY}
+        if rate_store.enabled:
+            snapshot = rate_store.get_snapshot(rate_date, source)
+        elif needed:
+            snapshot = Rate.objects.filter(currency__in=needed).snapshot(rate_date, source)
+        else:
+            snapshot = RateSnapshot(rate_date, {})
+
+    ratios = {code: snapshot.ratio(code, currency_to.code) for code in codes}
+    return [money._make(money.amount * ratios[money.currency.code], currency_to) for money in moneys]
+
+
+def exchange_series(money, currency_to, start, end, source=None, series=None):
+    """
+    Exchange a Money to a currency for every day from `start` to `end`, with
+    rates loaded in a single query or taken from a RateSeries.
+    :return: list of (date, Money) tuples
+    """
+    # Money imports this module
+    from ..money.models.money import Currency
+
+    if not isinstance(currency_to, Currency):
+        currency_to = Currency.get_by_code(currency_to)
+    if series is None:
+        series = Rate.objects.series([money.currency, currency_to], start, end, source)
+
+    amount, make = money.amount, money._make
+    ratios = series.ratios(money.currency, currency_to, start, end)
+    dates = series.dates[(start - series.start).days:]
+    return [(rate_date, make(amount * ratio, currency_to)) for rate_date, ratio in zip(dates, ratios)]
+
+
 def parse_rates_to_base_currency(rates, origin_currency):
     """
     Exchange rates dictionary in some currency to system currency.
@@ -34,11 +124,11 @@ def parse_rates_to_base_currency(rates, origin_currency):
     assert isinstance(rates, dict), "rates is not a dictionary"
 
     try:
-        rate = Decimal(1) / rates[txmoney_settings.DEFAULT_CURRENCY]
+        rate = Decimal(1) / rates[get_settings().DEFAULT_CURRENCY]
     except KeyError:
-        raise KeyError("System currency '%s' not found in rates dictionary", txmoney_settings.DEFAULT_CURRENCY)
+        raise KeyError("System currency '%s' not found in rates dictionary", get_settings().DEFAULT_CURRENCY)
 
-    del rates[txmoney_settings.DEFAULT_CURRENCY]
+    del rates[get_settings().DEFAULT_CURRENCY]
     for currency, value in iteritems(rates):
         rates[currency] = value * rate
     rates[origin_currency] = rate
@@ -8,6 +8,7 @@ For example your project's `settings.py` file might look like this:
 TXMONEY = {
     'DEFAULT_BACKEND_CLASS': 'txmoney.rates.backends.OpenExchangeBackend',
     'BASE_CURRENCY': 'EUR',
+    'CURRENCY_ROUNDING': {'CHF': 'ROUND_HALF_EVEN'},
     'OPENEXCHANGE': {
         'app_id': '<some_app_id>'
     }
@@ -15,7 +16,7 @@ TXMONEY = {
 
 This module provides the `txmoney_settings` object, that is used to access
 TXMoney settings, checking for user settings first, then falling
-back to the defaults.
+back to the defaults, and `get_settings` to get the current one.
 """
 from __future__ import absolute_import, unicode_literals
 
@@ -27,18 +28,74 @@ from django.utils.six import string_types
 
 DEFAULTS = {
     'DEFAULT_BACKEND_CLASS': 'txmoney.rates.backends.OpenExchangeBackend',
+    # Backends updated together by update_rates, DEFAULT_BACKEND_CLASS if empty
+    'BACKEND_CLASSES': [],
     'DEFAULT_CURRENCY': 'USD',
     'SAME_BASE_CURRENCY': True,
 
+    # Rounding mode (one of the `decimal` module ROUND_* constants) used for
+    # every currency, and per currency code overrides.
+    'DEFAULT_ROUNDING': 'ROUND_HALF_UP',
+    'CURRENCY_ROUNDING': {},
+
+    # Process local cache of rate values: seconds they are kept (0 disables
+    # the cache) and maximum number of them.
+    'RATES_CACHE_TIMEOUT': 300,
+    'RATES_CACHE_MAX_SIZE': 1024,
+
+    # Alias of the Django cache used to share rate snapshots between
+    # processes (None disables it), seconds they are kept and seconds between
+    # checks for snapshots invalidated by other processes.
+    'RATES_STORE_CACHE': None,
+    'RATES_STORE_TIMEOUT': 24 * 60 * 60,
+    'RATES_STORE_CHECK_INTERVAL': 1,
+
+    # Path of the memory-mapped rates file shared by the processes of a host
+    # (None disables it) and seconds between checks for a new file.
+    'RATES_MAPPED_FILE': None,
+    'RATES_MAPPED_CHECK_INTERVAL': 1,
+
+    # Names of the rate sources used by exchange_ratio, by priority, and
+    # whether to use any other source when none of them has a rate.
+    'RATES_SOURCES': [],
+    'RATES_SOURCE_FALLBACK': True,
+
+    # Default seconds to wait for a backend to fetch its rates
+    'RATES_FETCH_TIMEOUT': 30,
+
+    # Maximum number of rates written by each query when storing them
+    'RATES_WRITE_CHUNK_SIZE': 500,
+
+    # Store a rate only when it differs from the previous one of its currency
+    'RATES_CHANGES_ONLY': False,
+
+    # Days fetched at the same time when backfilling historical rates
+    'RATES_BACKFILL_WORKERS': 4,
+
+    # HTTP backends connection pool size, retries of failed requests with
+    # their backoff factor, and alias of the cache keeping the ETag and
+    # Last-Modified headers of their last responses.
+    'RATES_HTTP_POOL_SIZE': 10,
+    'RATES_HTTP_RETRIES': 3,
+    'RATES_HTTP_BACKOFF': 0.5,
+    'RATES_HTTP_CACHE': 'default',
+
     'OPENEXCHANGE_NAME': 'openexchangerates.org',
     'OPENEXCHANGE_URL': 'https://openexchangerates.org/api/latest.json',
+    'OPENEXCHANGE_HISTORICAL_URL': 'https://openexchangerates.org/api/historical/{date}.json',
     'OPENEXCHANGE_BASE_CURRENCY': 'USD',
     'OPENEXCHANGE_APP_ID': '',
+
+    # FileRateBackend default source name, file and its base currency
+    'RATES_FILE_NAME': 'file',
+    'RATES_FILE_PATH': '',
+    'RATES_FILE_BASE_CURRENCY': 'EUR',
 }
 
 # List of settings that may be in string import notation.
 IMPORT_STRINGS = (
     'DEFAULT_BACKEND_CLASS',
+    'BACKEND_CLASSES',
 )
 
 
@@ -118,6 +175,15 @@ class TXMoneySettings(object):
 txmoney_settings = TXMoneySettings(None, DEFAULTS, IMPORT_STRINGS)
 
 
+def get_settings():
+    """
+    Return the current TXMoney settings object. It is replaced when the
+    TXMONEY setting changes, so code that runs after import should call
+    this rather than keep a reference to `txmoney_settings`.
+    """
+    return txmoney_settings
+
+
 def reload_api_settings(**kwargs):
     global txmoney_settings
     setting, value = kwargs['setting'], kwargs['value']